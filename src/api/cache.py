@@ -0,0 +1,202 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+from gi.repository import GLib
+
+# Seconds a response stays fresh, per MusicClient method
+TTLS = {
+    "search": 30 * 60,
+    "get_playlist": 15 * 60,
+    "get_playlist_page": 15 * 60,
+    "get_album": 24 * 3600,
+    "get_artist": 6 * 3600,
+    "get_artist_albums": 6 * 3600,
+    "get_explore": 30 * 60,
+    "get_mood_categories": 24 * 3600,
+    "get_category_page": 6 * 3600,
+    "get_library_playlists": 5 * 60,
+    "get_library_subscriptions": 5 * 60,
+}
+DEFAULT_TTL = 15 * 60
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+# Evict down to this fraction of the budget so puts don't evict one by one
+EVICT_TARGET = 0.9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+CREATE TABLE IF NOT EXISTS tags (
+    tag TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (tag, key)
+);
+CREATE INDEX IF NOT EXISTS tags_key ON tags (key);
+"""
+
+
+def get_cache_path():
+    return os.path.join(GLib.get_user_cache_dir(), "mixtapes", "responses.sqlite3")
+
+
+def normalize_params(params):
+    """Drops unset arguments so f(x) and f(x, limit=None) share an entry."""
+    return {k: v for k, v in sorted(params.items()) if v is not None}
+
+
+def make_key(endpoint, params, session):
+    blob = json.dumps([endpoint, normalize_params(params), session], sort_keys=True)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Parsed API responses on disk, keyed by endpoint, normalized parameters
+    and the login session (so accounts never see each other's data).
+
+    Entries expire after a per-endpoint TTL and the least recently used ones
+    are evicted once the cache outgrows its byte budget. Each entry carries
+    tags such as "playlist:<id>" or "video:<id>" that mutating calls use to
+    invalidate everything they affect.
+    """
+
+    def __init__(self, path=None, max_bytes=MAX_CACHE_BYTES, ttls=None):
+        self.path = path or get_cache_path()
+        self.max_bytes = max_bytes
+        self.ttls = dict(TTLS, **(ttls or {}))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _conn(self):
+        """Caller holds the lock. Opens the database on first use."""
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(SCHEMA)
+            self._db = db
+        return self._db
+
+    def get(self, endpoint, params, session, allow_stale=False):
+        """
+        The cached response if it is still fresh, else None. allow_stale
+        returns expired entries too (they are kept until evicted).
+        """
+        key = make_key(endpoint, params, session)
+        ttl = float("inf") if allow_stale else self.ttls.get(endpoint, DEFAULT_TTL)
+        now = time.time()
+        try:
+            with self._lock:
+                db = self._conn()
+                row = db.execute(
+                    "SELECT data, stored FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or now - row[1] > ttl:
+                    self.misses += 1
+                    return None
+                db.execute(
+                    "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+                )
+                db.commit()
+                self.hits += 1
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            print(f"[API-CACHE] Read failed for {endpoint}: {e}")
+            return None
+
+    def put(self, endpoint, params, session, value, tags=()):
+        key = make_key(endpoint, params, session)
+        try:
+            data = json.dumps(value)
+        except (TypeError, ValueError):
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                db = self._conn()
+                db.execute("DELETE FROM tags WHERE key = ?", (key,))
+                db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, endpoint, data, len(data), now, now),
+                )
+                db.executemany(
+                    "INSERT OR IGNORE INTO tags VALUES (?, ?)",
+                    [(tag, key) for tag in set(tags)],
+                )
+                self._evict(db)
+                db.commit()
+        except sqlite3.Error as e:
+            print(f"[API-CACHE] Write failed for {endpoint}: {e}")
+
+    def _evict(self, db):
+        """Caller holds the lock."""
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses")
+        total = total.fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * EVICT_TARGET
+        evicted = []
+        for key, size in db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ).fetchall():
+            if total <= target:
+                break
+            evicted.append((key,))
+            total -= size
+        db.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        db.executemany("DELETE FROM tags WHERE key = ?", evicted)
+        print(f"[API-CACHE] Evicted {len(evicted)} responses")
+
+    def invalidate(self, *tags, endpoint=None):
+        """Drops every entry carrying one of tags, and all of endpoint if given."""
+        try:
+            with self._lock:
+                db = self._conn()
+                keys = set()
+                for tag in tags:
+                    keys.update(
+                        k
+                        for (k,) in db.execute(
+                            "SELECT key FROM tags WHERE tag = ?", (tag,)
+                        )
+                    )
+                if endpoint:
+                    keys.update(
+                        k
+                        for (k,) in db.execute(
+                            "SELECT key FROM responses WHERE endpoint = ?",
+                            (endpoint,),
+                        )
+                    )
+                rows = [(k,) for k in keys]
+                db.executemany("DELETE FROM responses WHERE key = ?", rows)
+                db.executemany("DELETE FROM tags WHERE key = ?", rows)
+                db.commit()
+            if rows:
+                print(f"[API-CACHE] Invalidated {len(rows)} responses")
+        except sqlite3.Error as e:
+            print(f"[API-CACHE] Invalidate failed: {e}")
+
+    def clear(self):
+        try:
+            with self._lock:
+                db = self._conn()
+                db.execute("DELETE FROM responses")
+                db.execute("DELETE FROM tags")
+                db.commit()
+                db.execute("VACUUM")
+        except sqlite3.Error as e:
+            print(f"[API-CACHE] Clear failed: {e}")
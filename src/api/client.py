@@ -1,8 +1,16 @@
 import os
 import json
+import threading
+from contextlib import contextmanager
 from ytmusicapi import YTMusic
 import ytmusicapi.navigation
 from gi.repository import GLib
+from api.cookies import SessionCookieJar
+from api.http import get_session
+from api.cache import ResponseCache, make_key
+from api.paging import TrackPager
+from api.scheduler import get_scheduler
+from api.singleflight import SingleFlight
 
 # Monkeypatch ytmusicapi.navigation.nav to handle UI changes like musicImmersiveHeaderRenderer
 _original_nav = ytmusicapi.navigation.nav
@@ -50,6 +58,39 @@ def robust_nav(root, items, none_if_absent=False):
 
 ytmusicapi.navigation.nav = robust_nav
 
+# How MusicClient._cached treats the response cache on the calling thread
+CACHE_DEFAULT = "default"  # fresh entries, else the network
+CACHE_STALE = "stale"  # entries of any age, never the network
+CACHE_REFRESH = "refresh"  # always the network; the result replaces the entry
+
+
+def playlist_tag(playlist_id):
+    """Cache tag of a playlist; "VL<id>" browse ids and plain ids share it."""
+    if playlist_id.startswith("VL"):
+        playlist_id = playlist_id[2:]
+    return f"playlist:{playlist_id}"
+
+
+def track_tags(result):
+    """
+    video:<id> tags for the tracks in a response: "tracks" of a playlist or
+    album, "results" of an artist page's sections (songs, videos) and flat
+    lists such as search results.
+    """
+    if isinstance(result, list):
+        items = result
+    elif isinstance(result, dict):
+        items = list(result.get("tracks") or [])
+        for section in result.values():
+            if isinstance(section, dict) and isinstance(section.get("results"), list):
+                items.extend(section["results"])
+    else:
+        return []
+    video_ids = dict.fromkeys(
+        t["videoId"] for t in items if isinstance(t, dict) and t.get("videoId")
+    )
+    return [f"video:{video_id}" for video_id in video_ids]
+
 
 class MusicClient:
     _instance = None
@@ -69,6 +110,12 @@ class MusicClient:
         self._user_info = None  # Cache for account info
         self._subscribed_artists = set()  # Set of channel IDs
         self._library_playlists = []  # Cache for editable playlists
+        self.cookie_jar = SessionCookieJar(self)  # Shared by all yt-dlp extractions
+        # Read-only browse responses, persisted across restarts
+        self.response_cache = ResponseCache()
+        # Identical calls already on the wire are joined instead of repeated
+        self._inflight = SingleFlight()
+        self._cache_policy = threading.local()
         self.try_login()
 
     def try_login(self):
@@ -83,7 +130,7 @@ class MusicClient:
                 # Normalize keys for ytmusicapi and remove Bearer tokens
                 headers = self._normalize_headers(headers)
 
-                self.api = YTMusic(auth=headers)
+                self.api = YTMusic(auth=headers, requests_session=get_session())
                 if self.validate_session():
                     print("Authenticated via saved session.")
                     self._is_authed = True
@@ -102,7 +149,7 @@ class MusicClient:
 
         # 3. Fallback
         print("Falling back to unauthenticated mode.")
-        self.api = YTMusic()
+        self.api = YTMusic(requests_session=get_session())
         self._is_authed = False
         return False
 
@@ -244,7 +291,7 @@ class MusicClient:
 
             # Initialize API with dict directly
             print(f"Initializing YTMusic with headers: {list(headers.keys())}")
-            self.api = YTMusic(auth=headers)
+            self.api = YTMusic(auth=headers, requests_session=get_session())
 
             # Validate
             if self.validate_session():
@@ -253,7 +300,7 @@ class MusicClient:
                 return True
             else:
                 print("Login failed: Session invalid after init.")
-                self.api = YTMusic()
+                self.api = YTMusic(requests_session=get_session())
                 self._is_authed = False
                 return False
 
@@ -262,21 +309,71 @@ class MusicClient:
 
             print(f"Login exception: {e}")
             traceback.print_exc()
-            self.api = YTMusic()
+            self.api = YTMusic(requests_session=get_session())
             self._is_authed = False
             return False
 
+    @contextmanager
+    def cache_policy(self, policy):
+        """Applies a CACHE_* policy to cached calls made by this thread."""
+        previous = self.get_cache_policy()
+        self._cache_policy.value = policy
+        try:
+            yield
+        finally:
+            self._cache_policy.value = previous
+
+    def get_cache_policy(self):
+        """The calling thread's policy, for handing on to helper threads."""
+        return getattr(self._cache_policy, "value", CACHE_DEFAULT)
+
+    def _coalesced(self, endpoint, params, fetch):
+        """
+        Calls fetch(), or waits for the identical call (same endpoint,
+        normalized params and session) another thread already has in flight
+        at the same or a more urgent request priority.
+        """
+        key = make_key(endpoint, params, self.cookie_jar.fingerprint())
+        return self._inflight.do(key, fetch, get_scheduler().get_priority())
+
+    def _cached(self, endpoint, params, fetch, tags=()):
+        """
+        Returns the cached response for endpoint/params in this session, or
+        calls fetch() and caches a non-empty result. Track ids in the result
+        are added to tags so rating a song invalidates pages showing it.
+        Concurrent misses for the same response share one fetch.
+        """
+        policy = self.get_cache_policy()
+        session = self.cookie_jar.fingerprint()
+        if policy != CACHE_REFRESH:
+            cached = self.response_cache.get(
+                endpoint, params, session, allow_stale=policy == CACHE_STALE
+            )
+            if cached is not None or policy == CACHE_STALE:
+                return cached
+        result = self._coalesced(endpoint, params, fetch)
+        if result:
+            tags = list(tags) + track_tags(result)
+            self.response_cache.put(endpoint, params, session, result, tags)
+        return result
+
     def search(self, query, *args, **kwargs):
         if not self.api:
             return []
-        return self.api.search(query, *args, **kwargs)
+        params = dict(kwargs, query=" ".join(query.lower().split()), args=list(args))
+        return self._cached(
+            "search", params, lambda: self.api.search(query, *args, **kwargs)
+        )
 
     def get_song(self, video_id):
         if not self.api:
             return None
         try:
-            res = self.api.get_song(video_id)
-            return res
+            return self._coalesced(
+                "get_song",
+                {"video_id": video_id},
+                lambda: self.api.get_song(video_id),
+            )
         except Exception as e:
             print(f"Error getting song details: {e}")
             return None
@@ -284,15 +381,22 @@ class MusicClient:
     def get_library_playlists(self):
         if not self.is_authenticated():
             return []
-        playlists = self.api.get_library_playlists()
-        self._library_playlists = playlists
+        playlists = self._cached(
+            "get_library_playlists", {}, self.api.get_library_playlists
+        )
+        if playlists is not None:
+            self._library_playlists = playlists
         return playlists
 
     def get_library_subscriptions(self, limit=None):
         if not self.is_authenticated():
             return []
         try:
-            subs = self.api.get_library_subscriptions(limit=limit)
+            subs = self._cached(
+                "get_library_subscriptions",
+                {"limit": limit},
+                lambda: self.api.get_library_subscriptions(limit=limit),
+            )
             if subs:
                 for s in subs:
                     bid = s.get("browseId")
@@ -373,7 +477,19 @@ class MusicClient:
     def get_playlist(self, playlist_id, limit=None):
         if not self.api:
             return None
-        return self.api.get_playlist(playlist_id, limit=limit)
+        return self._cached(
+            "get_playlist",
+            {"playlist_id": playlist_id, "limit": limit},
+            lambda: self.api.get_playlist(playlist_id, limit=limit),
+            tags=[playlist_tag(playlist_id)],
+        )
+
+    def get_track_pager(self, playlist_id):
+        """
+        TrackPager over a playlist, "LM" (liked songs) or an album browse id,
+        for loading tracks one continuation page at a time.
+        """
+        return TrackPager(self, playlist_id, tags=[playlist_tag(playlist_id)])
 
     def get_watch_playlist(
         self, video_id=None, playlist_id=None, limit=25, radio=False
@@ -398,14 +514,23 @@ class MusicClient:
     def get_album(self, browse_id):
         if not self.api:
             return None
-        return self.api.get_album(browse_id)
+        return self._cached(
+            "get_album",
+            {"browse_id": browse_id},
+            lambda: self.api.get_album(browse_id),
+            tags=[f"album:{browse_id}"],
+        )
 
     def get_artist(self, channel_id):
         if not self.api:
             return None
         try:
-            res = self.api.get_artist(channel_id)
-            return res
+            return self._cached(
+                "get_artist",
+                {"channel_id": channel_id},
+                lambda: self.api.get_artist(channel_id),
+                tags=[f"artist:{channel_id}"],
+            )
         except Exception as e:
             print(f"Error getting artist details: {e}")
             return None
@@ -414,7 +539,14 @@ class MusicClient:
         if not self.api:
             return []
         try:
-            return self.api.get_artist_albums(channel_id, params=params, limit=limit)
+            return self._cached(
+                "get_artist_albums",
+                {"channel_id": channel_id, "params": params, "limit": limit},
+                lambda: self.api.get_artist_albums(
+                    channel_id, params=params, limit=limit
+                ),
+                tags=[f"artist:{channel_id}"],
+            )
         except Exception as e:
             print(f"Error getting artist albums: {e}")
             return []
@@ -434,7 +566,7 @@ class MusicClient:
     def get_explore(self):
         if not self.api:
             return {}
-        return self.api.get_explore()
+        return self._cached("get_explore", {}, self.api.get_explore)
 
     def get_mood_playlists(self, params):
         if not self.api:
@@ -449,7 +581,7 @@ class MusicClient:
         if not self.api:
             return {}
         try:
-            return self.api.get_mood_categories()
+            return self._cached("get_mood_categories", {}, self.api.get_mood_categories)
         except Exception as e:
             print(f"Error fetching mood categories: {e}")
             return {}
@@ -457,6 +589,13 @@ class MusicClient:
     def get_category_page(self, params):
         if not self.api:
             return []
+        return self._cached(
+            "get_category_page",
+            {"params": params},
+            lambda: self._fetch_category_page(params),
+        )
+
+    def _fetch_category_page(self, params):
         try:
             response = self.api._send_request("browse", {"browseId": "FEmusic_moods_and_genres_category", "params": params})
             
@@ -579,6 +718,8 @@ class MusicClient:
             return False
         try:
             self.api.rate_song(video_id, rating)
+            # Like status is part of every cached page listing the track
+            self.response_cache.invalidate(f"video:{video_id}", playlist_tag("LM"))
             return True
         except Exception as e:
             print(f"Error rating song: {e}")
@@ -611,8 +752,9 @@ class MusicClient:
             except Exception as e:
                 print(f"Could not remove auth file: {e}")
 
-        self.api = YTMusic()
+        self.api = YTMusic(requests_session=get_session())
         self._is_authed = False
+        self.cookie_jar.clear()
         print("Logged out. API reset to unauthenticated mode.")
         return True
 
@@ -629,6 +771,9 @@ class MusicClient:
                 privacyStatus=privacy,
                 moveItem=moveItem,
             )
+            self.response_cache.invalidate(
+                playlist_tag(playlist_id), endpoint="get_library_playlists"
+            )
             return True
         except Exception as e:
             print(f"Error editing playlist: {e}")
@@ -639,6 +784,9 @@ class MusicClient:
             return False
         try:
             self.api.delete_playlist(playlist_id)
+            self.response_cache.invalidate(
+                playlist_tag(playlist_id), endpoint="get_library_playlists"
+            )
             return True
         except Exception as e:
             print(f"Error deleting playlist: {e}")
@@ -649,6 +797,9 @@ class MusicClient:
             return False
         try:
             self.api.add_playlist_items(playlist_id, video_ids, duplicates=duplicates)
+            self.response_cache.invalidate(
+                playlist_tag(playlist_id), endpoint="get_library_playlists"
+            )
             return True
         except Exception as e:
             print(f"Error adding to playlist: {e}")
@@ -659,6 +810,9 @@ class MusicClient:
             return False
         try:
             self.api.remove_playlist_items(playlist_id, videos)
+            self.response_cache.invalidate(
+                playlist_tag(playlist_id), endpoint="get_library_playlists"
+            )
             return True
         except Exception as e:
             print(f"Error removing from playlist: {e}")
@@ -729,6 +883,9 @@ class MusicClient:
         try:
             self.api.subscribe_artists([channel_id])
             self._subscribed_artists.add(channel_id)
+            self.response_cache.invalidate(
+                f"artist:{channel_id}", endpoint="get_library_subscriptions"
+            )
             return True
         except Exception as e:
             print(f"Error subscribing to artist: {e}")
@@ -741,6 +898,9 @@ class MusicClient:
             self.api.unsubscribe_artists([channel_id])
             if channel_id in self._subscribed_artists:
                 self._subscribed_artists.remove(channel_id)
+            self.response_cache.invalidate(
+                f"artist:{channel_id}", endpoint="get_library_subscriptions"
+            )
             return True
         except Exception as e:
             print(f"Error unsubscribing from artist: {e}")
@@ -759,9 +919,11 @@ class MusicClient:
         if not self.is_authenticated():
             return None
         try:
-            return self.api.create_playlist(
+            playlist_id = self.api.create_playlist(
                 title, description, privacy_status=privacy_status, video_ids=video_ids
             )
+            self.response_cache.invalidate(endpoint="get_library_playlists")
+            return playlist_id
         except Exception as e:
             print(f"Error creating playlist: {e}")
             return None
@@ -775,8 +937,6 @@ class MusicClient:
             print("Not authenticated.")
             return False
 
-        import requests
-
         try:
             with open(image_path, "rb") as f:
                 img_data = f.read()
@@ -797,7 +957,7 @@ class MusicClient:
                 }
             )
 
-            init_res = requests.post(
+            init_res = get_session().post(
                 "https://music.youtube.com/playlist_image_upload/playlist_custom_thumbnail",
                 headers=headers_start,
             )
@@ -820,7 +980,7 @@ class MusicClient:
 
             params = {"upload_id": upload_id, "upload_protocol": "resumable"}
 
-            upload_res = requests.post(
+            upload_res = get_session().post(
                 "https://music.youtube.com/playlist_image_upload/playlist_custom_thumbnail",
                 headers=headers_upload,
                 params=params,
@@ -861,6 +1021,9 @@ class MusicClient:
 
             if edit_res.get("status") == "STATUS_SUCCEEDED":
                 print("Thumbnail successfully updated!")
+                self.response_cache.invalidate(
+                    playlist_tag(playlist_id), endpoint="get_library_playlists"
+                )
                 return True
             else:
                 print(f"Failed to bind thumbnail. API Response: {edit_res}")
@@ -0,0 +1,111 @@
+import os
+import time
+import hashlib
+import threading
+
+from gi.repository import GLib
+
+# Headers that identify a login; a change in any of them means a new session
+AUTH_HEADERS = ("Cookie", "User-Agent", "Authorization")
+
+
+def get_cookie_file_path():
+    # The runtime dir is per-user, 0700 and cleared on logout/reboot
+    base = GLib.get_user_runtime_dir() or GLib.get_user_cache_dir()
+    return os.path.join(base, "mixtapes", "cookies.txt")
+
+
+def parse_cookie_header(cookie_str):
+    """Parses "k=v; k2=v2" into an ordered dict."""
+    cookies = {}
+    for part in (cookie_str or "").split(";"):
+        if "=" in part:
+            key, value = part.strip().split("=", 1)
+            cookies[key] = value
+    return cookies
+
+
+class SessionCookieJar:
+    """
+    The login cookies of MusicClient, parsed once per session.
+
+    yt-dlp only takes cookies from a file, so they are also kept in a single
+    private Netscape cookie file that every extraction shares. The file is
+    rewritten only when the auth headers change and removed on logout.
+    """
+
+    def __init__(self, client, path=None):
+        self.client = client
+        self.path = path or get_cookie_file_path()
+        self.cookies = {}
+        self._lock = threading.Lock()
+        self._written_for = None
+
+    def _headers(self):
+        if not (self.client.is_authenticated() and self.client.api):
+            return None
+        return self.client.api.headers
+
+    def fingerprint(self):
+        """Stable id of the current login state, "anonymous" when logged out."""
+        headers = self._headers()
+        if headers is None:
+            return "anonymous"
+        digest = hashlib.sha1()
+        for key in AUTH_HEADERS:
+            digest.update(str(headers.get(key, "")).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def cookie_file(self):
+        """Path of the cookie file for the current login, or None if there are no cookies."""
+        headers = self._headers()
+        fingerprint = self.fingerprint()
+        with self._lock:
+            if fingerprint == self._written_for:
+                return self.path if self.cookies else None
+
+            self.cookies = parse_cookie_header(headers.get("Cookie") if headers else "")
+            if self.cookies:
+                self._write()
+            else:
+                self._remove()
+            self._written_for = fingerprint
+            return self.path if self.cookies else None
+
+    def _write(self):
+        """Caller holds the lock."""
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        expires = int(time.time()) + 3600 * 24 * 365
+        lines = [
+            "# Netscape HTTP Cookie File",
+            "# This file is generated by Mixtapes",
+            "",
+        ]
+        for key, value in self.cookies.items():
+            # domain flag path secure expiration name value
+            lines.append(f".youtube.com\tTRUE\t/\tTRUE\t{expires}\t{key}\t{value}")
+
+        tmp = self.path + ".tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, self.path)
+
+    def _remove(self):
+        """Caller holds the lock."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[COOKIES] Could not remove {self.path}: {e}")
+
+    def clear(self):
+        """Forgets the session and deletes the cookie file (logout)."""
+        with self._lock:
+            self.cookies = {}
+            self._written_for = None
+            self._remove()
@@ -0,0 +1,121 @@
+import threading
+from http.cookiejar import CookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from api.scheduler import get_scheduler
+
+# (connect, read) seconds; requests itself waits forever by default
+DEFAULT_TIMEOUT = (5, 30)
+# Hosts with an idle pool kept around, and keep-alive connections per host
+POOL_HOSTS = 16
+POOL_PER_HOST = 16
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+)
+
+
+def make_retry():
+    """
+    Connection failures are retried for any method since nothing was sent.
+    Read errors and 429/5xx only for GET/HEAD: InnerTube POSTs include
+    mutations that must not be replayed.
+
+    Retry-After is left to the RequestScheduler: urllib3 would sleep it out
+    (minutes, sometimes) while holding the request's slot.
+    """
+    return Retry(
+        total=3,
+        connect=3,
+        read=2,
+        status=2,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+
+
+class _RejectCookies(CookiePolicy):
+    """
+    The session is shared by every login state, so it never stores cookies;
+    callers send theirs per request (ytmusicapi puts them in its headers).
+    """
+
+    netscape = True
+    rfc2965 = False
+    hide_cookie2 = False
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+    def domain_return_ok(self, domain, request):
+        return False
+
+    def path_return_ok(self, path, request):
+        return False
+
+
+class PooledSession(requests.Session):
+    """
+    requests.Session with keep-alive pools, retries and a default timeout.
+    Every request waits for a slot from the RequestScheduler and reports
+    its outcome back, so rate limiting slows everyone down.
+    """
+
+    def __init__(self):
+        super().__init__()
+        adapter = HTTPAdapter(
+            pool_connections=POOL_HOSTS,
+            pool_maxsize=POOL_PER_HOST,
+            max_retries=make_retry(),
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.headers["User-Agent"] = USER_AGENT
+        self.cookies.set_policy(_RejectCookies())
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = DEFAULT_TIMEOUT
+        scheduler = get_scheduler()
+        with scheduler.slot(url):
+            try:
+                resp = super().request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                scheduler.report(url)
+                raise
+            scheduler.report(url, resp.status_code, resp.headers.get("Retry-After"))
+        return resp
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    The process-wide session. Used by MusicClient (through YTMusic), the
+    image loaders and uploads, so repeated requests to the same host reuse
+    a warm TLS connection. Safe to share between threads.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = PooledSession()
+        return _session
+
+
+def fetch_bytes(url, headers=None, timeout=None):
+    """GETs url and returns the body, raising requests.HTTPError on 4xx/5xx."""
+    resp = get_session().get(url, headers=headers, timeout=timeout)
+    resp.raise_for_status()
+    return resp.content
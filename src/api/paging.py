@@ -0,0 +1,149 @@
+import threading
+from contextlib import contextmanager
+
+from ytmusicapi import YTMusic
+from ytmusicapi.continuations import CONTINUATION_ITEMS, get_continuation_token
+from ytmusicapi.navigation import CONTENT, SECTION, TWO_COLUMN_RENDERER, nav
+from ytmusicapi.parsers.playlists import parse_playlist_items
+
+# Where get_playlist finds the first page of tracks in a browse response
+PLAYLIST_SHELF = [
+    *TWO_COLUMN_RENDERER,
+    "secondaryContents",
+    *SECTION,
+    *CONTENT,
+    "musicPlaylistShelfRenderer",
+]
+
+# Record raw InnerTube responses on threads that ask for them, so a parsed
+# get_playlist result can be paired with the continuation token it dropped
+_capture = threading.local()
+_original_send_request = YTMusic._send_request
+
+
+def _recording_send_request(self, endpoint, body, *args, **kwargs):
+    response = _original_send_request(self, endpoint, body, *args, **kwargs)
+    responses = getattr(_capture, "responses", None)
+    if responses is not None:
+        responses.append(response)
+    return response
+
+
+YTMusic._send_request = _recording_send_request
+
+
+@contextmanager
+def capture_responses():
+    """Collects the raw responses of requests made by this thread."""
+    previous = getattr(_capture, "responses", None)
+    _capture.responses = []
+    try:
+        yield _capture.responses
+    finally:
+        _capture.responses = previous
+
+
+class TrackPager:
+    """
+    Cursor over the tracks of a playlist, liked songs ("LM") or an album,
+    one InnerTube page (about 100 tracks) per next_page() call.
+
+    The first page is ytmusicapi's own get_playlist(limit=0), which also
+    parses the header into .playlist. The continuation token of every page is
+    kept, so each later page is a single continuation request instead of a
+    refetch from the first track. Albums are not paginated and come whole.
+    Pages go through MusicClient's response cache like any other browse call.
+    """
+
+    def __init__(self, client, playlist_id, tags=()):
+        self.client = client
+        self.playlist_id = playlist_id
+        self.tags = list(tags)
+        self.playlist = None  # Header fields and first-page tracks
+        self.pages = 0
+        self.count = 0
+        self._continuation = None
+        self._lock = threading.Lock()
+
+    @property
+    def exhausted(self):
+        return self.pages > 0 and self._continuation is None
+
+    def next_page(self):
+        """Tracks of the next page; [] once the end has been reached."""
+        with self._lock:
+            if self.exhausted:
+                return []
+            if self.pages == 0:
+                page = self._first_page()
+            else:
+                page = self._continuation_page(self._continuation)
+            tracks = page.get("tracks") or []
+            # An empty page would hand back the same token forever
+            self._continuation = page.get("continuation") if tracks else None
+            self.pages += 1
+            self.count += len(tracks)
+            return tracks
+
+    def __iter__(self):
+        while not self.exhausted:
+            tracks = self.next_page()
+            if tracks:
+                yield tracks
+
+    def _first_page(self):
+        api = self.client.api
+        needs_login = self.playlist_id == "LM"
+        if not api or (needs_login and not self.client.is_authenticated()):
+            self.playlist = {"tracks": []}
+            return {}
+
+        if self.playlist_id.startswith("MPRE"):
+            album = self.client.get_album(self.playlist_id) or {}
+            self.playlist = album
+            return {"tracks": album.get("tracks", [])}
+
+        page = self.client._cached(
+            "get_playlist_page",
+            {"playlist_id": self.playlist_id, "continuation": None},
+            self._fetch_first_page,
+            tags=self.tags,
+        )
+        page = page or {}
+        tracks = page.get("tracks", [])
+        self.playlist = dict(page.get("playlist") or {}, tracks=tracks)
+        return page
+
+    def _fetch_first_page(self):
+        with capture_responses() as responses:
+            playlist = self.client.api.get_playlist(self.playlist_id, limit=0)
+        tracks = playlist.pop("tracks", [])
+        shelf = nav(responses[0], PLAYLIST_SHELF, True) if responses else None
+        contents = (shelf or {}).get("contents")
+        return {
+            "playlist": playlist,
+            "tracks": tracks,
+            "continuation": get_continuation_token(contents) if contents else None,
+        }
+
+    def _continuation_page(self, token):
+        return (
+            self.client._cached(
+                "get_playlist_page",
+                {"playlist_id": self.playlist_id, "continuation": token},
+                lambda: self._fetch_continuation_page(token),
+                tags=self.tags,
+            )
+            or {}
+        )
+
+    def _fetch_continuation_page(self, token):
+        response = self.client.api._send_request("browse", {"continuation": token})
+        items = nav(response, CONTINUATION_ITEMS, True) or []
+        if not items:
+            return {"tracks": [], "continuation": None}
+        is_collaborative = "collaborators" in (self.playlist or {})
+        return {
+            "tracks": parse_playlist_items(items, is_collaborative=is_collaborative),
+            "continuation": get_continuation_token(items),
+        }
@@ -0,0 +1,244 @@
+import time
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+# Priority classes, most urgent first
+INTERACTIVE = 0  # Something the user just asked for and is waiting on
+VISIBLE = 1  # On screen already: thumbnails, refreshing stale pages
+PREFETCH = 2  # Likely needed soon: upcoming queue entries
+BACKGROUND = 3  # Bulk work nobody is waiting on: whole-playlist fetches
+PRIORITY_NAMES = ("interactive", "visible", "prefetch", "background")
+
+# Fraction of a host's connections each class may hold at once; the rest
+# stays free so an interactive request never queues behind bulk work
+CLASS_SHARE = (1.0, 1.0, 0.5, 0.25)
+
+# Backoff after 429/5xx doubles from BACKOFF_BASE up to BACKOFF_MAX seconds
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+
+class HostLimits:
+    def __init__(self, concurrency, rate, burst):
+        self.concurrency = concurrency  # Requests in flight
+        self.rate = rate  # Token bucket refill, requests per second
+        self.burst = burst  # Token bucket size
+
+
+DEFAULT_LIMITS = HostLimits(concurrency=6, rate=10.0, burst=20)
+HOST_LIMITS = {
+    # InnerTube; rate limits here end in captchas, so stay polite
+    "music.youtube.com": HostLimits(concurrency=4, rate=5.0, burst=15),
+    # Thumbnail CDNs serve a whole grid at once
+    "i.ytimg.com": HostLimits(concurrency=8, rate=40.0, burst=60),
+    "lh3.googleusercontent.com": HostLimits(concurrency=8, rate=40.0, burst=60),
+    "yt3.ggpht.com": HostLimits(concurrency=8, rate=40.0, burst=60),
+    "yt3.googleusercontent.com": HostLimits(concurrency=8, rate=40.0, burst=60),
+}
+
+
+class _Host:
+    def __init__(self, name, limits):
+        self.name = name
+        self.limits = limits
+        self.active = 0
+        self.active_by_class = [0] * len(PRIORITY_NAMES)
+        self.tokens = float(limits.burst)
+        self.refilled = time.monotonic()
+        self.failures = 0
+        self.backoff_until = 0.0
+
+    def refill(self, now):
+        elapsed = now - self.refilled
+        self.refilled = now
+        self.tokens = min(
+            float(self.limits.burst), self.tokens + elapsed * self.limits.rate
+        )
+
+    def class_cap(self, priority):
+        return max(1, int(self.limits.concurrency * CLASS_SHARE[priority]))
+
+    def has_slot(self, priority):
+        return (
+            self.active < self.limits.concurrency
+            and self.active_by_class[priority] < self.class_cap(priority)
+        )
+
+
+class RequestScheduler:
+    """
+    Admission control for outgoing HTTP requests.
+
+    Every request on the shared session takes a slot first. Slots are per
+    host and handed out in priority order (then arrival order): each host
+    has a concurrency limit, each priority class a share of it, and a token
+    bucket spaces requests out. A 429 or 5xx puts the host into exponential
+    backoff (or Retry-After, if longer). While it lasts only a single
+    interactive request goes through, and it probes whether the host has
+    recovered.
+
+    The priority comes from the calling thread, set with priority().
+    """
+
+    def __init__(self, host_limits=None, default_limits=DEFAULT_LIMITS):
+        self.host_limits = dict(HOST_LIMITS, **(host_limits or {}))
+        self.default_limits = default_limits
+        self._cond = threading.Condition()
+        self._hosts = {}
+        self._waiting = []  # [priority, seq, host]
+        self._seq = 0
+        self._local = threading.local()
+        self.stats = {
+            "granted": [0] * len(PRIORITY_NAMES),
+            "waited_ms": [0.0] * len(PRIORITY_NAMES),
+            "backoffs": 0,
+        }
+
+    @contextmanager
+    def priority(self, priority):
+        """Applies a priority class to requests made by this thread."""
+        previous = self.get_priority()
+        self._local.priority = priority
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    def get_priority(self):
+        """The calling thread's priority, for handing on to helper threads."""
+        return getattr(self._local, "priority", INTERACTIVE)
+
+    def _host(self, name):
+        """Caller holds the lock."""
+        host = self._hosts.get(name)
+        if host is None:
+            limits = self.host_limits.get(name, self.default_limits)
+            host = self._hosts[name] = _Host(name, limits)
+        return host
+
+    @contextmanager
+    def slot(self, url):
+        """Holds a request slot for url's host for the duration of the block."""
+        name = urlparse(url).hostname or ""
+        priority = self.get_priority()
+        self._acquire(name, priority)
+        try:
+            yield
+        finally:
+            with self._cond:
+                host = self._hosts[name]
+                host.active -= 1
+                host.active_by_class[priority] -= 1
+                self._cond.notify_all()
+
+    def _acquire(self, name, priority):
+        start = time.monotonic()
+        with self._cond:
+            self._seq += 1
+            entry = [priority, self._seq, name]
+            self._waiting.append(entry)
+            self._waiting.sort()
+            try:
+                while True:
+                    wait = self._wait_time(entry)
+                    if wait == 0:
+                        break
+                    self._cond.wait(timeout=wait)
+            finally:
+                self._waiting.remove(entry)
+
+            host = self._hosts[name]
+            host.tokens -= 1
+            host.active += 1
+            host.active_by_class[priority] += 1
+            self.stats["granted"][priority] += 1
+            self.stats["waited_ms"][priority] += (time.monotonic() - start) * 1000
+            # Entries behind this one may be eligible now
+            self._cond.notify_all()
+
+    def _wait_time(self, entry):
+        """
+        0 if entry may go now, else seconds until something it is waiting on
+        changes by itself (None: until a slot is released). Caller holds the
+        lock.
+        """
+        priority, _, name = entry
+        host = self._host(name)
+        now = time.monotonic()
+        host.refill(now)
+
+        if now < host.backoff_until:
+            probing = priority == INTERACTIVE and host.active == 0
+            if not probing:
+                return host.backoff_until - now
+        if not host.has_slot(priority):
+            return None
+        # Earlier waiters for this host go first, unless their class is full
+        for other in self._waiting:
+            if other is entry:
+                break
+            if other[2] == name and host.has_slot(other[0]):
+                return None
+        if host.tokens < 1:
+            return (1 - host.tokens) / host.limits.rate
+        return 0
+
+    def report(self, url, status=None, retry_after=None):
+        """
+        Feeds a request's outcome back. status None means the request failed
+        without a response. 429, 5xx and failures back the host off.
+        """
+        name = urlparse(url).hostname or ""
+        with self._cond:
+            host = self._host(name)
+            if status is not None and status < 500 and status != 429:
+                if host.failures:
+                    print(f"[SCHEDULER] {name} recovered")
+                host.failures = 0
+                host.backoff_until = 0.0
+                return
+
+            host.failures += 1
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (host.failures - 1))
+            try:
+                delay = max(delay, min(BACKOFF_MAX, float(retry_after)))
+            except (TypeError, ValueError):
+                pass
+            host.backoff_until = max(host.backoff_until, time.monotonic() + delay)
+            self.stats["backoffs"] += 1
+            print(
+                f"[SCHEDULER] {name} returned {status or 'no response'}, "
+                f"backing off {delay:.1f}s"
+            )
+            self._cond.notify_all()
+
+    def snapshot(self):
+        """Per-host state and per-class totals, for diagnostics."""
+        with self._cond:
+            now = time.monotonic()
+            return {
+                "hosts": {
+                    h.name: {
+                        "active": h.active,
+                        "tokens": round(h.tokens, 1),
+                        "backoff_s": max(0.0, round(h.backoff_until - now, 1)),
+                    }
+                    for h in self._hosts.values()
+                },
+                "waiting": len(self._waiting),
+                "granted": dict(zip(PRIORITY_NAMES, self.stats["granted"])),
+                "backoffs": self.stats["backoffs"],
+            }
+
+
+_scheduler = RequestScheduler()
+
+
+def get_scheduler():
+    return _scheduler
+
+
+def request_priority(priority):
+    """Shorthand for get_scheduler().priority(priority)."""
+    return _scheduler.priority(priority)
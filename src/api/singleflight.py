@@ -0,0 +1,63 @@
+import copy
+import threading
+
+
+class _Call:
+    def __init__(self, priority):
+        self.priority = priority
+        self.done = threading.Event()
+        self.waiters = 0
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical calls into one.
+
+    The first caller of a key runs the call; callers arriving with the same
+    key while it is in flight wait for it and get its exception or a deep
+    copy of its result, so nobody sees another caller's edits. Nothing is
+    remembered once the call returns; that is the response cache's job.
+
+    A caller only joins a call of the same or a more urgent priority (lower
+    number). A more urgent one runs its own call instead of queueing behind
+    a background request, and later callers of the key join that one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.coalesced = 0
+
+    def do(self, key, fn, priority=0):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None or call.priority > priority
+            if leader:
+                call = self._calls[key] = _Call(priority)
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                waiters = call.waiters
+            if waiters and call.error is None:
+                # Pristine copy, since the leader is free to mutate its result
+                call.result = copy.deepcopy(result)
+            call.done.set()
+        return result
@@ -0,0 +1,348 @@
+import os
+import json
+import time
+import threading
+from urllib.parse import urlparse, parse_qs
+
+from gi.repository import GLib
+
+DEFAULT_BUDGET_MB = 1024
+# Don't bother caching partial/odd responses bigger than this
+MAX_FILE_SIZE = 200 * 1024 * 1024
+# Flush the index to disk at most this often when only play stats changed
+INDEX_SAVE_INTERVAL = 30
+# A .part file nobody has written to for this long was abandoned (seek-away,
+# skip) and is deleted
+PARTIAL_MAX_IDLE = 10 * 60
+PART_SUFFIX = ".part"
+
+
+def get_audio_cache_dir():
+    return os.path.join(GLib.get_user_cache_dir(), "mixtapes", "audio")
+
+
+def _merge_range(ranges, start, end):
+    """Adds [start, end) to a sorted list of disjoint ranges, merging neighbours."""
+    merged = []
+    placed = False
+    for s, e in ranges:
+        if e < start:
+            merged.append((s, e))
+        elif end < s:
+            if not placed:
+                merged.append((start, end))
+                placed = True
+            merged.append((s, e))
+        else:
+            start, end = min(s, start), max(e, end)
+    if not placed:
+        merged.append((start, end))
+    return sorted(merged)
+
+
+class _PartialFile:
+    """A stream being written through; chunks may arrive out of order (seeks)."""
+
+    def __init__(self, path, total_size, mime_type):
+        self.path = path
+        self.total_size = total_size
+        self.mime_type = mime_type
+        self.ranges = []
+        self.updated = time.monotonic()
+        self.closed = False
+        self.lock = threading.Lock()
+
+    @property
+    def written(self):
+        return sum(e - s for s, e in self.ranges)
+
+    def write(self, start, data):
+        with self.lock:
+            if self.closed:
+                return False
+            self.updated = time.monotonic()
+            mode = "r+b" if os.path.exists(self.path) else "wb"
+            with open(self.path, mode) as f:
+                f.seek(start)
+                f.write(data)
+            self.ranges = _merge_range(self.ranges, start, start + len(data))
+            return self.ranges == [(0, self.total_size)]
+
+    def discard(self):
+        with self.lock:
+            self.closed = True
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+class AudioCache:
+    """
+    Byte-budgeted on-disk cache of complete audio streams.
+
+    Entries are keyed by (videoId, format) and filled by write-through from
+    the StreamProxy: it is registered as a proxy listener and assembles the
+    chunks it sees into a .part file, which becomes a cache entry once every
+    byte has been seen. Parts of streams the proxy has dropped, or that sat
+    idle for PARTIAL_MAX_IDLE, are deleted; live ones count toward the
+    budget. When over budget, entries with the lowest (plays / age) score
+    are evicted first, so heavy rotation survives a burst of one-off
+    listens.
+    """
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_MB * 1024 * 1024, cache_dir=None):
+        self.cache_dir = cache_dir or get_audio_cache_dir()
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+        self.budget_bytes = budget_bytes
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._partials = {}  # proxy stream token -> _PartialFile
+        self._metadata = {}  # key -> dict, applied when an entry completes
+        self._last_save = 0.0
+        self._load_index()
+
+    @staticmethod
+    def _key(video_id, fmt):
+        return f"{video_id}|{fmt}"
+
+    @staticmethod
+    def _file_name(video_id, fmt):
+        safe_fmt = "".join(c if c.isalnum() else "_" for c in str(fmt))
+        return f"{video_id}.{safe_fmt}.audio"
+
+    @property
+    def enabled(self):
+        return self.budget_bytes > 0
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+
+        # Drop entries whose file has gone missing
+        self._entries = {
+            k: v
+            for k, v in entries.items()
+            if os.path.exists(os.path.join(self.cache_dir, v.get("file", "")))
+        }
+        # Nothing is streaming yet, so any part file is left from a past run
+        self._remove_part_files()
+
+    def _remove_part_files(self):
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith(PART_SUFFIX):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    def _save_index(self, force=True):
+        """Caller holds the lock."""
+        now = time.time()
+        if not force and now - self._last_save < INDEX_SAVE_INTERVAL:
+            return
+        self._last_save = now
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp, self.index_path)
+        except OSError as e:
+            print(f"[AUDIO-CACHE] Failed to save index: {e}")
+
+    def lookup(self, video_id, fmt, record_play=True):
+        """
+        Returns the cached entry (with "uri" and stored metadata) or None.
+        record_play bumps the play count/recency used for eviction.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            key = self._find(video_id, fmt)
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            path = os.path.join(self.cache_dir, entry["file"])
+            if not os.path.exists(path):
+                del self._entries[key]
+                return None
+            if record_play:
+                self._bump(entry)
+            result = dict(entry)
+        result["uri"] = f"file://{path}"
+        return result
+
+    def record_play(self, video_id, fmt):
+        """Counts a play of the entry lookup() returned, once it is audible."""
+        with self._lock:
+            entry = self._entries.get(self._find(video_id, fmt))
+            if entry:
+                self._bump(entry)
+
+    def _find(self, video_id, fmt):
+        """Caller holds the lock."""
+        key = self._key(video_id, fmt)
+        if key in self._entries:
+            return key
+        # A copy in another quality still beats going to the network
+        return next(
+            (k for k, e in self._entries.items() if e["video_id"] == video_id),
+            None,
+        )
+
+    def _bump(self, entry):
+        """Caller holds the lock."""
+        entry["play_count"] = entry.get("play_count", 0) + 1
+        entry["last_access"] = time.time()
+        self._save_index(force=False)
+
+    def remember_metadata(self, video_id, fmt, **metadata):
+        """Metadata to store with the entry once its stream completes."""
+        with self._lock:
+            self._metadata[self._key(video_id, fmt)] = metadata
+
+    # StreamProxy listener
+    def on_chunk(self, stream, start, data):
+        if not self.enabled or not isinstance(stream.key, tuple):
+            return
+        total = stream.total_size
+        if not total or total > MAX_FILE_SIZE:
+            return
+
+        video_id, fmt = stream.key
+        key = self._key(video_id, fmt)
+        with self._lock:
+            if key in self._entries:
+                return
+            partial = self._partials.get(stream.token)
+            if partial is None:
+                self._expire_partials()
+                os.makedirs(self.cache_dir, exist_ok=True)
+                part_path = os.path.join(
+                    self.cache_dir, self._file_name(video_id, fmt) + PART_SUFFIX
+                )
+                # A previous attempt for the same track is superseded
+                for token, other in list(self._partials.items()):
+                    if other.path == part_path:
+                        del self._partials[token]
+                        other.discard()
+                partial = _PartialFile(part_path, total, stream.content_type)
+                self._partials[stream.token] = partial
+                self._evict()
+
+        try:
+            complete = partial.write(start, data)
+        except OSError as e:
+            print(f"[AUDIO-CACHE] Write failed: {e}")
+            with self._lock:
+                self._partials.pop(stream.token, None)
+            partial.discard()
+            return
+
+        if complete:
+            self._finalize(stream, partial)
+
+    def on_stream_closed(self, stream):
+        """StreamProxy listener: an unfinished part of stream can't complete now."""
+        with self._lock:
+            partial = self._partials.pop(stream.token, None)
+        if partial is not None:
+            partial.discard()
+
+    def _expire_partials(self):
+        """Caller holds the lock."""
+        now = time.monotonic()
+        for token, partial in list(self._partials.items()):
+            if now - partial.updated > PARTIAL_MAX_IDLE:
+                del self._partials[token]
+                partial.discard()
+                name = os.path.basename(partial.path)
+                print(f"[AUDIO-CACHE] Dropped abandoned {name}")
+
+    def _finalize(self, stream, partial):
+        video_id, fmt = stream.key
+        key = self._key(video_id, fmt)
+        file_name = self._file_name(video_id, fmt)
+        final_path = os.path.join(self.cache_dir, file_name)
+        try:
+            os.replace(partial.path, final_path)
+        except OSError as e:
+            print(f"[AUDIO-CACHE] Finalize failed: {e}")
+            return
+
+        query = parse_qs(urlparse(stream.url).query)
+        with self._lock:
+            self._partials.pop(stream.token, None)
+            entry = {
+                "video_id": video_id,
+                "format": fmt,
+                "itag": (query.get("itag") or [None])[0],
+                "mime_type": partial.mime_type,
+                "file": file_name,
+                "size": partial.total_size,
+                "play_count": 1,
+                "last_access": time.time(),
+            }
+            entry.update(self._metadata.pop(key, {}))
+            self._entries[key] = entry
+            self._evict()
+            self._save_index()
+        print(f"[AUDIO-CACHE] Stored {video_id} ({partial.total_size // 1024} KiB)")
+
+    def _score(self, entry, now):
+        hours = max(0.0, now - entry.get("last_access", 0)) / 3600
+        return (1 + entry.get("play_count", 0)) / (1 + hours)
+
+    def _evict(self):
+        """Caller holds the lock. Live part files use up budget too."""
+        total = sum(e.get("size", 0) for e in self._entries.values())
+        # Reserve the full size: a live part is headed there
+        total += sum(p.total_size for p in self._partials.values())
+        if total <= self.budget_bytes:
+            return
+        now = time.time()
+        for key, entry in sorted(
+            self._entries.items(), key=lambda kv: self._score(kv[1], now)
+        ):
+            if total <= self.budget_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, entry["file"]))
+            except OSError:
+                pass
+            total -= entry.get("size", 0)
+            del self._entries[key]
+            print(f"[AUDIO-CACHE] Evicted {entry.get('video_id')}")
+
+    def set_budget(self, budget_bytes):
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            self._evict()
+            self._save_index()
+
+    def total_size(self):
+        with self._lock:
+            total = sum(e.get("size", 0) for e in self._entries.values())
+            return total + sum(p.written for p in self._partials.values())
+
+    def clear(self):
+        with self._lock:
+            for entry in self._entries.values():
+                try:
+                    os.remove(os.path.join(self.cache_dir, entry["file"]))
+                except OSError:
+                    pass
+            self._entries = {}
+            for partial in self._partials.values():
+                partial.discard()
+            self._partials = {}
+            self._remove_part_files()
+            self._save_index()
@@ -0,0 +1,237 @@
+from abc import ABC, abstractmethod
+
+import gi
+
+gi.require_version("Gst", "1.0")
+from gi.repository import Gst
+
+# GST_PLAY_FLAG_VIDEO is 1 << 0 for both playbin and playbin3
+GST_PLAY_FLAG_VIDEO = 1 << 0
+
+DEFAULT_ENGINE = "playbin"
+
+
+class PlaybackBackend(ABC):
+    """
+    What Player needs from a playback engine.
+
+    `element` is the top-level GStreamer pipeline: Player watches its bus
+    and compares message sources against it. Positions and durations are
+    in seconds; position() and duration() return None when unknown. An
+    engine missing one of the abstract methods fails when it is created.
+    """
+
+    name = None
+    # load() can replace a running stream in place, without a NULL teardown
+    supports_instant_switch = False
+
+    def __init__(self):
+        self.element = None
+
+    @abstractmethod
+    def connect_about_to_finish(self, callback):
+        """callback(backend) runs on a streaming thread before the stream drains."""
+
+    @abstractmethod
+    def load(self, uri):
+        """Replaces the current stream with uri; play() starts it."""
+
+    @abstractmethod
+    def preload_next(self, uri):
+        """Queues uri to follow the current stream without a gap (from about-to-finish)."""
+
+    @abstractmethod
+    def play(self):
+        ...
+
+    @abstractmethod
+    def pause(self):
+        ...
+
+    @abstractmethod
+    def stop(self):
+        ...
+
+    def prepare_switch(self):
+        """
+        Silences the current stream ahead of load(). Engines that switch in
+        place only pause, so load() can take the fast path; the rest stop.
+        """
+        if self.supports_instant_switch:
+            return self.pause()
+        return self.stop()
+
+    @abstractmethod
+    def get_state(self):
+        """(state change return, current state, pending state) without blocking."""
+
+    def state(self):
+        return self.get_state()[1]
+
+    @abstractmethod
+    def seek(self, position, accurate=True, flush=True, snap=False):
+        ...
+
+    @abstractmethod
+    def position(self):
+        ...
+
+    @abstractmethod
+    def duration(self):
+        ...
+
+    @abstractmethod
+    def get_volume(self):
+        ...
+
+    @abstractmethod
+    def set_volume(self, volume):
+        ...
+
+    @abstractmethod
+    def get_mute(self):
+        ...
+
+    @abstractmethod
+    def set_mute(self, muted):
+        ...
+
+    def buffering(self):
+        """Buffer level and rates ("percent", "avg_in", ...) or None if unknown."""
+        return None
+
+    def get_bus(self):
+        return self.element.get_bus()
+
+
+class PlaybinBackend(PlaybackBackend):
+    """The classic playbin: switching streams means going back through NULL."""
+
+    name = "playbin"
+    factory = "playbin"
+
+    def __init__(self):
+        super().__init__()
+        self.element = Gst.ElementFactory.make(self.factory, None)
+        if self.element is None:
+            raise RuntimeError(f"GStreamer element {self.factory} is not available")
+
+        # Audio only
+        flags = self.element.get_property("flags")
+        self.element.set_property("flags", flags & ~GST_PLAY_FLAG_VIDEO)
+
+    def connect_about_to_finish(self, callback):
+        self.element.connect("about-to-finish", lambda element: callback(self))
+
+    def load(self, uri):
+        self.element.set_state(Gst.State.NULL)
+        self.element.set_property("uri", uri)
+
+    def preload_next(self, uri):
+        self.element.set_property("uri", uri)
+
+    def play(self):
+        return self.element.set_state(Gst.State.PLAYING)
+
+    def pause(self):
+        return self.element.set_state(Gst.State.PAUSED)
+
+    def stop(self):
+        return self.element.set_state(Gst.State.NULL)
+
+    def get_state(self):
+        return self.element.get_state(0)
+
+    def seek(self, position, accurate=True, flush=True, snap=False):
+        flags = Gst.SeekFlags.ACCURATE if accurate else Gst.SeekFlags.KEY_UNIT
+        if snap:
+            flags |= Gst.SeekFlags.SNAP_NEAREST
+        if flush:
+            flags |= Gst.SeekFlags.FLUSH
+        return self.element.seek_simple(
+            Gst.Format.TIME, flags, int(max(0.0, position) * Gst.SECOND)
+        )
+
+    def position(self):
+        ok, pos = self.element.query_position(Gst.Format.TIME)
+        return pos / Gst.SECOND if ok else None
+
+    def duration(self):
+        ok, dur = self.element.query_duration(Gst.Format.TIME)
+        return dur / Gst.SECOND if ok else None
+
+    def buffering(self):
+        query = Gst.Query.new_buffering(Gst.Format.PERCENT)
+        if not self.element.query(query):
+            return None
+        busy, percent = query.parse_buffering_percent()
+        mode, avg_in, avg_out, left = query.parse_buffering_stats()
+        return {
+            "percent": percent,
+            "avg_in": avg_in,  # bytes/s into the buffer, -1 if unknown
+            "avg_out": avg_out,
+            "left_ms": left,
+        }
+
+    def get_volume(self):
+        return self.element.get_property("volume")
+
+    def set_volume(self, volume):
+        self.element.set_property("volume", float(volume))
+
+    def get_mute(self):
+        return self.element.get_property("mute")
+
+    def set_mute(self, muted):
+        self.element.set_property("mute", bool(muted))
+
+
+class Playbin3Backend(PlaybinBackend):
+    """
+    playbin3 (uridecodebin3 + decodebin3). Streams are switched with
+    instant-uri where available (GStreamer 1.22+), which swaps the source
+    without tearing the pipeline down to NULL.
+    """
+
+    name = "playbin3"
+    factory = "playbin3"
+
+    def __init__(self):
+        super().__init__()
+        self._instant_uri = self.element.find_property("instant-uri") is not None
+
+    @property
+    def supports_instant_switch(self):
+        return self._instant_uri
+
+    def load(self, uri):
+        running = self.state() in (Gst.State.PLAYING, Gst.State.PAUSED)
+        if self._instant_uri and running:
+            self.element.set_property("instant-uri", True)
+            self.element.set_property("uri", uri)
+            return
+        if self._instant_uri:
+            self.element.set_property("instant-uri", False)
+        super().load(uri)
+
+    def preload_next(self, uri):
+        # A queued gapless switch must wait for the current stream's end
+        if self._instant_uri:
+            self.element.set_property("instant-uri", False)
+        self.element.set_property("uri", uri)
+
+
+ENGINES = {
+    PlaybinBackend.name: PlaybinBackend,
+    Playbin3Backend.name: Playbin3Backend,
+}
+
+
+def create_backend(name=None):
+    """Builds the named engine, falling back to playbin if it can't be created."""
+    engine = ENGINES.get(name or DEFAULT_ENGINE, PlaybinBackend)
+    try:
+        return engine()
+    except RuntimeError as e:
+        print(f"[BACKEND] {e}, falling back to {DEFAULT_ENGINE}")
+        return ENGINES[DEFAULT_ENGINE]()
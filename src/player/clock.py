@@ -0,0 +1,97 @@
+import time
+
+from gi.repository import GLib
+
+# Pipeline position queries while playing; everything in between is
+# extrapolated from the last anchor
+POLL_INTERVAL_MS = 1000
+
+
+class PositionClock:
+    """
+    Playback position without polling the pipeline ten times a second.
+
+    The Player anchors the clock with a real position on state changes,
+    seeks and a low-rate poll while playing; now() extrapolates from the
+    anchor. The poll timer only exists while playing, so a paused or
+    stopped player causes no wakeups. Alarms fire callbacks at a playback
+    position, e.g. to start a crossfade on time.
+    """
+
+    def __init__(self, poll, interval_ms=POLL_INTERVAL_MS):
+        self.poll = poll  # runs on the main loop; expected to call anchor()
+        self.interval_ms = interval_ms
+        self._source = None
+        self._running = False
+        self._anchor_pos = 0.0
+        self._anchor_time = time.monotonic()
+        self._alarms = {}  # name -> [position, callback, source id]
+
+    @property
+    def running(self):
+        return self._running
+
+    def now(self):
+        if not self._running:
+            return self._anchor_pos
+        return self._anchor_pos + (time.monotonic() - self._anchor_time)
+
+    def anchor(self, position, running=None):
+        """Pins the clock to a known position; running says whether it advances."""
+        self._anchor_pos = position
+        self._anchor_time = time.monotonic()
+        if running is not None:
+            self._running = running
+        self._rearm_alarms()
+
+    def start(self):
+        """Playback is running: poll at the low rate."""
+        self._running = True
+        if self._source is None:
+            self._source = GLib.timeout_add(self.interval_ms, self._on_poll)
+        self._rearm_alarms()
+
+    def stop(self):
+        """Playback paused or stopped: freeze the position and go idle."""
+        self._anchor_pos = self.now()
+        self._anchor_time = time.monotonic()
+        self._running = False
+        if self._source is not None:
+            GLib.source_remove(self._source)
+            self._source = None
+        self._rearm_alarms()
+
+    def _on_poll(self):
+        self.poll()
+        return True
+
+    def set_alarm(self, name, position, callback):
+        """Runs callback() once playback reaches position; replaces an alarm of the same name."""
+        self.clear_alarm(name)
+        self._alarms[name] = [position, callback, None]
+        self._arm(name)
+
+    def clear_alarm(self, name):
+        alarm = self._alarms.pop(name, None)
+        if alarm and alarm[2] is not None:
+            GLib.source_remove(alarm[2])
+
+    def _arm(self, name):
+        alarm = self._alarms[name]
+        if alarm[2] is not None:
+            GLib.source_remove(alarm[2])
+            alarm[2] = None
+        if not self._running:
+            return
+        delay_ms = max(0, int((alarm[0] - self.now()) * 1000))
+        alarm[2] = GLib.timeout_add(delay_ms, self._fire, name)
+
+    def _rearm_alarms(self):
+        for name in list(self._alarms):
+            self._arm(name)
+
+    def _fire(self, name):
+        alarm = self._alarms.pop(name, None)
+        if alarm:
+            alarm[1]()
+        return False
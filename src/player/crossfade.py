@@ -0,0 +1,145 @@
+import math
+import time
+
+from gi.repository import Gst, GLib
+
+# Open and preroll the incoming track this long before the fade starts
+PREROLL_LEAD = 8.0
+RAMP_INTERVAL_MS = 50
+MAX_CROSSFADE_SECONDS = 12
+
+
+class CrossfadeEngine:
+    """
+    Overlaps the end of the current track with the start of the next.
+
+    The incoming track gets its own playback backend, created only once a
+    fade is pending: it is opened from the pre-resolved URL and prerolled in
+    PAUSED a few seconds early so it can start instantly. When the fade
+    begins the Player adopts the incoming backend and the engine keeps
+    the outgoing one just long enough to ramp it down. Gains follow an
+    equal-power curve, so loudness stays even through the overlap; the two
+    branches are summed by the sound server.
+
+    States: "idle", "prerolling" (incoming allocated, not audible yet) and
+    "fading" (both audible).
+    """
+
+    def __init__(self, make_backend, get_volume):
+        self.make_backend = make_backend
+        self.get_volume = get_volume  # user volume, 0.0 - 1.0
+        self.state = "idle"
+        self.pending = None  # opaque transition info owned by the Player
+        self.incoming = None
+        self.outgoing = None
+        self._bus_handler = None
+        self._ramp_source = None
+        self._fade_started = 0.0
+        self._fade_duration = 0.0
+
+    @property
+    def active(self):
+        return self.state != "idle"
+
+    def prepare(self, uri, pending):
+        """Allocates the incoming branch and prerolls uri at zero volume."""
+        self.cancel()
+        backend = self.make_backend()
+        backend.load(uri)
+        backend.set_volume(0.0)
+
+        # Until it is adopted, only errors on this branch matter to us
+        bus = backend.get_bus()
+        bus.add_signal_watch()
+        self._bus_handler = bus.connect("message::error", self._on_preroll_error)
+
+        backend.pause()
+        self.incoming = backend
+        self.pending = pending
+        self.state = "prerolling"
+        print(f"[CROSSFADE] Prerolling {pending.get('video_id')}")
+
+    def is_ready(self):
+        if self.state != "prerolling" or self.incoming is None:
+            return False
+        ret, state, _ = self.incoming.get_state()
+        return ret == Gst.StateChangeReturn.SUCCESS and state == Gst.State.PAUSED
+
+    def _on_preroll_error(self, bus, message):
+        err, debug = message.parse_error()
+        print(f"[CROSSFADE] Incoming track failed to preroll: {err}")
+        self.cancel()
+
+    def _release_incoming_bus(self):
+        if self.incoming is not None and self._bus_handler is not None:
+            bus = self.incoming.get_bus()
+            bus.disconnect(self._bus_handler)
+            bus.remove_signal_watch()
+        self._bus_handler = None
+
+    def start(self, outgoing, duration):
+        """
+        Starts the fade and returns the incoming backend, which the caller
+        adopts as its main one. outgoing is ramped down over duration
+        seconds and then released.
+        """
+        incoming = self.incoming
+        self._release_incoming_bus()
+        incoming.set_mute(outgoing.get_mute())
+        incoming.play()
+
+        self.outgoing = outgoing
+        self.incoming = incoming
+        self.state = "fading"
+        self._fade_started = time.monotonic()
+        self._fade_duration = max(0.1, duration)
+        self._ramp_source = GLib.timeout_add(RAMP_INTERVAL_MS, self._ramp)
+        print(f"[CROSSFADE] Fading over {duration:.1f}s")
+        return incoming
+
+    def _ramp(self):
+        if self.state != "fading":
+            self._ramp_source = None
+            return False
+
+        progress = (time.monotonic() - self._fade_started) / self._fade_duration
+        if progress >= 1.0:
+            self._ramp_source = None
+            self.finish()
+            return False
+
+        volume = self.get_volume()
+        angle = progress * math.pi / 2
+        self.incoming.set_volume(volume * math.sin(angle))
+        self.outgoing.set_volume(volume * math.cos(angle))
+        self.outgoing.set_mute(self.incoming.get_mute())
+        return True
+
+    def finish(self):
+        """Ends a running fade now: the outgoing track stops, the incoming one is at full volume."""
+        if self.state != "fading":
+            return
+        if self._ramp_source is not None:
+            GLib.source_remove(self._ramp_source)
+            self._ramp_source = None
+        if self.outgoing is not None:
+            self.outgoing.stop()
+        if self.incoming is not None:
+            self.incoming.set_volume(self.get_volume())
+        self._reset()
+
+    def cancel(self):
+        """Drops a prerolled branch, or finishes a fade that is already audible."""
+        if self.state == "fading":
+            self.finish()
+        elif self.state == "prerolling":
+            self._release_incoming_bus()
+            if self.incoming is not None:
+                self.incoming.stop()
+            self._reset()
+
+    def _reset(self):
+        self.state = "idle"
+        self.pending = None
+        self.incoming = None
+        self.outgoing = None
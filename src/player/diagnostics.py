@@ -0,0 +1,145 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+from urllib.parse import urlparse, parse_qs
+
+from gi.repository import GLib
+
+# Reports of finished tracks kept for export
+HISTORY_SIZE = 50
+# Rebuffer events kept per track
+MAX_REBUFFERS = 50
+
+# GStreamer tag -> (report key, TagList getter)
+STREAM_TAGS = (
+    ("audio-codec", "codec", "get_string"),
+    ("container-format", "container", "get_string"),
+    ("bitrate", "bitrate", "get_uint"),
+    ("nominal-bitrate", "nominal_bitrate", "get_uint"),
+)
+
+
+def describe_stream_url(url):
+    """CDN host, itag and mime type of a googlevideo URL; empty for local files."""
+    if not url or not url.startswith("http"):
+        return {}
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query)
+    return {
+        "host": parsed.hostname,
+        "itag": (query.get("itag") or [None])[0],
+        "mime_type": (query.get("mime") or [None])[0],
+    }
+
+
+class PlaybackDiagnostics:
+    """
+    Stats-for-nerds record of the track that is playing.
+
+    Player fills it from the play path (resolved format, URL, timings) and
+    its bus handler (stream tags, buffer level, rebuffers); get_diagnostics()
+    adds the live pipeline and network state on top. Reports of earlier
+    tracks are kept so an export covers the whole session.
+    """
+
+    def __init__(self, history_size=HISTORY_SIZE):
+        self._lock = threading.Lock()
+        self._track = None
+        self._rebuffer_started = None
+        self.history = deque(maxlen=history_size)
+
+    def begin_track(self, video_id):
+        with self._lock:
+            self._close_rebuffer()
+            if self._track is not None:
+                self.history.append(self._track)
+            self._track = {
+                "video_id": video_id,
+                "started": time.time(),
+                "tags": {},
+                "buffer_percent": None,
+                "rebuffers": [],
+                "timings": None,
+            }
+
+    def set_stream(self, url=None, **info):
+        """Records what was resolved for the current track; url adds host/itag/mime."""
+        with self._lock:
+            if self._track is None:
+                return
+            details = describe_stream_url(url)
+            # The resolver knows better than the URL when it has an answer
+            details.update({k: v for k, v in info.items() if v is not None})
+            self._track.update(details)
+
+    def set_timings(self, trace):
+        with self._lock:
+            if self._track is not None and trace is not None:
+                self._track["timings"] = trace.to_dict()
+
+    def on_tags(self, taglist):
+        with self._lock:
+            if self._track is None:
+                return
+            tags = self._track["tags"]
+            for name, key, getter in STREAM_TAGS:
+                ok, value = getattr(taglist, getter)(name)
+                if ok:
+                    tags[key] = value
+
+    def on_buffering(self, percent):
+        with self._lock:
+            if self._track is None:
+                return
+            self._track["buffer_percent"] = percent
+            if percent >= 100:
+                self._close_rebuffer()
+
+    def rebuffer_started(self, position):
+        """Playback stalled at position (seconds) waiting for data."""
+        with self._lock:
+            if self._track is None or self._rebuffer_started is not None:
+                return
+            self._rebuffer_started = time.monotonic()
+            events = self._track["rebuffers"]
+            events.append({"time": time.time(), "position": position, "ms": None})
+            del events[:-MAX_REBUFFERS]
+
+    def _close_rebuffer(self):
+        """Caller holds the lock."""
+        if self._rebuffer_started is None:
+            return
+        elapsed = (time.monotonic() - self._rebuffer_started) * 1000
+        self._rebuffer_started = None
+        if self._track and self._track["rebuffers"]:
+            self._track["rebuffers"][-1]["ms"] = elapsed
+
+    def current(self):
+        """Copy of the current track's report, or None before the first load."""
+        with self._lock:
+            if self._track is None:
+                return None
+            return json.loads(json.dumps(self._track))
+
+    def export(self, current=None, path=None):
+        """Writes current (Player.get_diagnostics()) and the history as JSON."""
+        if path is None:
+            export_dir = os.path.join(GLib.get_user_cache_dir(), "mixtapes")
+            os.makedirs(export_dir, exist_ok=True)
+            path = os.path.join(
+                export_dir, time.strftime("diagnostics-%Y%m%d-%H%M%S.json")
+            )
+
+        with self._lock:
+            history = list(self.history)
+        data = {
+            "exported_at": time.time(),
+            "current": current if current is not None else self.current(),
+            "history": history,
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2, default=str)
+        print(f"[DIAGNOSTICS] Exported {len(history) + 1} tracks to {path}")
+        return path
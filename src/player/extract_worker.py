@@ -0,0 +1,110 @@
+"""
+Stream extraction worker process.
+
+Runs yt-dlp outside the GTK process so its CPU-heavy Python (regex, JSON,
+signature handling) never competes with the main loop for the GIL.
+
+Protocol: one JSON object per line on stdin, one JSON reply per line on stdout.
+
+    -> {"id": 1, "op": "resolve", "video_id": "...", "auth_key": "...", "opts": {...}}
+    <- {"id": 1, "ok": true, "url": "...", "title": "...", "artist": "...",
+        "thumb": "...", "elapsed_ms": 812.4, "build_ms": 0.0}
+    <- {"id": 1, "ok": false, "error": "..."}
+
+"op": "warm" builds the extractor for opts without resolving anything.
+The worker exits when stdin is closed, i.e. when the app goes away.
+This module must not import gi; it is started as a plain script.
+"""
+
+import os
+import sys
+import json
+import time
+
+
+class Extractors:
+    """One YoutubeDL per format for the current auth state."""
+
+    def __init__(self):
+        self.auth_key = None
+        self.by_format = {}
+
+    def get(self, auth_key, opts):
+        from yt_dlp import YoutubeDL
+
+        if auth_key != self.auth_key:
+            # New login state: old cookies/headers are baked into the instances
+            self.by_format = {}
+            self.auth_key = auth_key
+
+        fmt = opts.get("format")
+        ydl = self.by_format.get(fmt)
+        build_ms = 0.0
+        if ydl is None:
+            start = time.monotonic()
+            cachedir = opts.get("cachedir")
+            if cachedir:
+                os.makedirs(cachedir, exist_ok=True)
+            ydl = YoutubeDL(opts)
+            # Instantiates the YouTube extractor up front
+            ydl.get_info_extractor("Youtube")
+            self.by_format[fmt] = ydl
+            build_ms = (time.monotonic() - start) * 1000
+        return ydl, build_ms
+
+
+def handle(extractors, request):
+    op = request.get("op")
+    ydl, build_ms = extractors.get(request.get("auth_key"), request.get("opts", {}))
+    if op == "warm":
+        return {"ok": True, "build_ms": build_ms}
+
+    if op != "resolve":
+        return {"ok": False, "error": f"unknown op {op!r}"}
+
+    url = f"https://www.youtube.com/watch?v={request['video_id']}"
+    start = time.monotonic()
+    info = ydl.extract_info(url, download=False)
+    elapsed_ms = (time.monotonic() - start) * 1000
+
+    # Only the handful of fields the UI process uses cross the pipe
+    return {
+        "ok": True,
+        "url": info["url"],
+        "title": info.get("title", "Unknown"),
+        "artist": info.get("uploader", "Unknown"),
+        "thumb": info.get("thumbnail"),
+        "itag": info.get("format_id"),
+        "codec": info.get("acodec"),
+        "ext": info.get("ext"),
+        "abr": info.get("abr"),
+        "elapsed_ms": elapsed_ms,
+        "build_ms": build_ms,
+    }
+
+
+def main():
+    # Keep the real stdout for the protocol; anything yt-dlp prints goes to stderr
+    out = os.fdopen(os.dup(sys.stdout.fileno()), "w", buffering=1)
+    sys.stdout = sys.stderr
+
+    extractors = Extractors()
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            reply = handle(extractors, request)
+        except Exception as e:
+            reply = {"ok": False, "error": str(e)}
+
+        reply["id"] = request_id
+        out.write(json.dumps(reply) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,49 @@ import gi
 import threading
 import random
 import os
+import re
+import time
 
 gi.require_version("Gst", "1.0")
 from gi.repository import Gst, GObject, GLib, GdkPixbuf
-import urllib.request
-from yt_dlp import YoutubeDL
 from mprisify.server import Server
 from ui.utils import get_high_res_url, get_ytimg_fallbacks
 from player.mpris import MuseMprisAdapter, MuseEventAdapter
+from player.resolver import StreamResolver
+from player.resolver_pool import ResolverPool, PRIORITY_CURRENT, PRIORITY_PREFETCH
+from player.stream_cache import parse_stream_expiry
+from player.stream_proxy import StreamProxy
+from player.audio_cache import AudioCache
+from player.quality import QualityEngine
+from player.timing import PlayTimer
+from player.diagnostics import PlaybackDiagnostics
+from player.crossfade import CrossfadeEngine, PREROLL_LEAD
+from player.backends import create_backend
+from player.clock import PositionClock
+from player.prefetch import QueuePrefetcher
 from api.client import MusicClient
+from api.http import fetch_bytes
+from api.scheduler import VISIBLE, request_priority
+import settings
+
+# Expired/forbidden stream recovery
+RECOVERY_MAX_ATTEMPTS = 3
+RECOVERY_BASE_DELAY = 1.0  # seconds, doubled per attempt
+# Playing this long past the resume point counts as a successful recovery
+RECOVERY_STABLE_SECONDS = 30
+# Status in souphttpsrc's error message, e.g. "Forbidden (403), URL: ..."
+EXPIRED_STATUS_RE = re.compile(
+    r"\b(?:forbidden|gone)\s*\((403|410)\)"
+    r"|\bhttp(?:/[\d.]+)?\s*(?:error\s*)?(403|410)\b",
+    re.IGNORECASE,
+)
+# Resource errors souphttpsrc raises for HTTP failures
+EXPIRED_ERROR_CODES = ("NOT_AUTHORIZED", "NOT_FOUND", "READ", "OPEN_READ")
+
+# Scrubbing: at most one fast seek per interval while a drag moves, and one
+# accurate seek once it has been still for the settle time
+SCRUB_SEEK_INTERVAL = 0.2  # seconds
+SCRUB_SETTLE_MS = 300
 
 
 class Player(GObject.Object):
@@ -41,12 +75,15 @@ class Player(GObject.Object):
         super().__init__()
         Gst.init(None)
         self.client = MusicClient()
-        self.player = Gst.ElementFactory.make("playbin", "player")
-
-        # Disable video output using playbin flags (unsetting GST_PLAY_FLAG_VIDEO)
-        # GST_PLAY_FLAG_VIDEO is 1 << 0
-        flags = self.player.get_property("flags")
-        self.player.set_property("flags", flags & ~(1 << 0))
+        # self.player is the backend's GStreamer element, kept for bus
+        # message matching and MPRIS queries
+        self.backend = None
+        self.player = None
+        self.bus = None
+        self._bus_handler = None
+        self._attach_backend(self._make_backend())
+        # User volume; the backend's own volume is ramped during crossfades
+        self._volume = self.backend.get_volume()
 
         self.ydl_opts = {
             "format": "bestaudio/best",
@@ -56,10 +93,34 @@ class Player(GObject.Object):
             "js_runtimes": {"node": {}},
             "remote_components": ["ejs:github"],
         }
-
-        self.bus = self.player.get_bus()
-        self.bus.add_signal_watch()
-        self.bus.connect("message", self.on_message)
+        self.stream_proxy = StreamProxy()
+        # Picks the format selector per track; ydl_opts["format"] is only the default
+        self.quality = QualityEngine(
+            self.stream_proxy.metrics, mode=settings.get_setting("audio_quality")
+        )
+        self.current_format = self.quality.format_selector()
+        self.resolver = StreamResolver(self.client, self.ydl_opts)
+        self.stream_cache = self.resolver.cache
+        self.resolver_pool = ResolverPool(
+            self.resolver, warm_format=self.current_format
+        )
+        self.prefetcher = QueuePrefetcher(self._submit_prefetch)
+        # Time-to-first-audio per stage, keyed by load_generation
+        self.timing = PlayTimer()
+        self.audio_cache = AudioCache(
+            settings.get_setting("audio_cache_mb") * 1024 * 1024
+        )
+        # Write-through: everything streamed via the proxy fills the disk cache
+        self.stream_proxy.add_listener(self.audio_cache)
+        # Stats-for-nerds: what the current track is actually playing at
+        self.diagnostics = PlaybackDiagnostics()
+
+        self._gapless_pending = None
+        self._disk_play_pending = None  # (video_id, fmt) to count on PLAYING
+        # Second backend, allocated only around a track change
+        self.crossfade = CrossfadeEngine(self._make_backend, self.get_volume)
+        # load_generation whose crossfade was abandoned; left to EOS/gapless
+        self._crossfade_skipped = None
 
         self.current_video_id = None
 
@@ -68,10 +129,23 @@ class Player(GObject.Object):
         self.current_queue_index = -1
         self.shuffle_mode = False
         self.original_queue = []  # Backup for un-shuffle
+        # Bumped whenever the queue is replaced, so feeders of the old one stop
+        self.queue_generation = 0
         self.load_generation = 0  # To handle race conditions in loading
         self.mpris_art_url = None
         self.current_url = None
+        self.current_url_expires = None
+        self._last_position = 0.0
+        self._pending_resume = None
+        self._recovery_attempts = 0
+        self._recovery_position = 0.0
+        self._buffering = False
         self.last_seek_time = 0.0
+        self._scrubbing = False
+        self._scrub_target = 0.0
+        self._last_scrub_seek = 0.0
+        self._scrub_seek_source = None
+        self._scrub_settle_source = None
         self.duration = -1
         self._is_loading = False
         self._current_logical_state = "stopped"
@@ -82,8 +156,9 @@ class Player(GObject.Object):
         self.queue_is_infinite = False
         self._is_fetching_infinite = False
 
-        # Timer for progress
-        GObject.timeout_add(100, self.update_position)
+        # Position is queried on state changes, seeks and at a low rate while
+        # playing; the UI interpolates in between via get_position()
+        self.clock = PositionClock(self.update_position)
 
         # MPRIS Setup
         self.mpris_adapter = MuseMprisAdapter(self)
@@ -100,6 +175,23 @@ class Player(GObject.Object):
         self.connect("progression", self._on_mpris_progression)
         self.connect("volume-changed", self._on_mpris_volume_changed)
 
+    def _make_backend(self):
+        backend = create_backend(settings.get_setting("playback_engine"))
+        # Gapless: queue the next URI before the current one drains
+        backend.connect_about_to_finish(self._on_about_to_finish)
+        return backend
+
+    def _attach_backend(self, backend):
+        """Makes backend the one whose bus drives the player state."""
+        if self.bus is not None:
+            self.bus.disconnect(self._bus_handler)
+            self.bus.remove_signal_watch()
+        self.backend = backend
+        self.player = backend.element
+        self.bus = backend.get_bus()
+        self.bus.add_signal_watch()
+        self._bus_handler = self.bus.connect("message", self.on_message)
+
     def _on_mpris_state_changed(self, obj, state):
         print(f"DEBUG-MPRIS-STATE-START: state={state}")
         if hasattr(self, "mpris_events"):
@@ -151,7 +243,9 @@ class Player(GObject.Object):
         Sets the global queue and plays the track at start_index.
         tracks: list of dicts with videoId, title, artist, thumb
         """
-        self.stop()
+        self.timing.request()
+        self.stop(switching=True)
+        self.queue_generation += 1
         self.queue = list(tracks)  # Copy for playing
         self.original_queue = list(tracks)  # Backup for un-shuffle
         self.shuffle_mode = shuffle  # Set mode based on request
@@ -203,6 +297,8 @@ class Player(GObject.Object):
         if self.current_queue_index == -1:
             self.current_queue_index = 0
             self._play_current_index()
+        else:
+            self._schedule_prefetch()
 
     def remove_from_queue(self, index):
         if 0 <= index < len(self.queue):
@@ -222,6 +318,8 @@ class Player(GObject.Object):
             if pop in self.original_queue:
                 self.original_queue.remove(pop)
 
+            self._schedule_prefetch()
+
     def move_queue_item(self, old_index, new_index):
         if 0 <= old_index < len(self.queue) and 0 <= new_index < len(self.queue):
             # Adjust index when moving down to insert before target, accounting for the list shift from popping.
@@ -243,6 +341,8 @@ class Player(GObject.Object):
             elif insert_index <= self.current_queue_index < old_index:
                 self.current_queue_index += 1
 
+            self._schedule_prefetch()
+
             # Notify UI
             self.emit("state-changed", "queue-updated")
             return True
@@ -250,6 +350,8 @@ class Player(GObject.Object):
 
     def clear_queue(self):
         self.stop()
+        self.prefetcher.cancel()
+        self.queue_generation += 1
         self.queue = []
         self.original_queue = []
         self.current_queue_index = -1
@@ -259,21 +361,13 @@ class Player(GObject.Object):
 
     def play_queue_index(self, index):
         if 0 <= index < len(self.queue):
-            self.stop()
+            self.timing.request()
+            self.stop(switching=True)
             self.current_queue_index = index
             self._play_current_index()
 
             # Check for infinite auto-append on manual skip
-            if self.queue_is_infinite and self.queue_source_id and self.client:
-                if (
-                    not self._is_fetching_infinite
-                    and self.current_queue_index >= len(self.queue) // 2
-                ):
-                    self._start_infinite_fetch()
-                else:
-                    print(
-                        f"\033[91m[DEBUG-INFINITE] Conditions NOT met (is_fetching={self._is_fetching_infinite}, index={self.current_queue_index}, halfway={len(self.queue) // 2})\033[0m"
-                    )
+            self._check_infinite_fetch()
 
             self.emit("state-changed", "queue-updated")
 
@@ -283,16 +377,7 @@ class Player(GObject.Object):
             self._play_current_index()
 
             # Check for infinite auto-append
-            if self.queue_is_infinite and self.queue_source_id and self.client:
-                if (
-                    not self._is_fetching_infinite
-                    and self.current_queue_index >= len(self.queue) // 2
-                ):
-                    self._start_infinite_fetch()
-                else:
-                    print(
-                        f"\033[91m[DEBUG-INFINITE] Conditions NOT met (is_fetching={self._is_fetching_infinite}, index={self.current_queue_index}, halfway={len(self.queue) // 2})\033[0m"
-                    )
+            self._check_infinite_fetch()
         else:
             if self.repeat_mode == "all" and self.queue:
                 self.current_queue_index = 0
@@ -303,14 +388,26 @@ class Player(GObject.Object):
 
         self.emit("state-changed", "queue-updated")
 
+    def _check_infinite_fetch(self):
+        if self.queue_is_infinite and self.queue_source_id and self.client:
+            if (
+                not self._is_fetching_infinite
+                and self.current_queue_index >= len(self.queue) // 2
+            ):
+                self._start_infinite_fetch()
+            else:
+                print(
+                    f"\033[91m[DEBUG-INFINITE] Conditions NOT met (is_fetching={self._is_fetching_infinite}, index={self.current_queue_index}, halfway={len(self.queue) // 2})\033[0m"
+                )
+
     def previous(self):
+        # Finish a running fade so "back" acts on the track now playing
+        self.crossfade.cancel()
         # If > 5 seconds in, restart song
         try:
-            pos = self.player.query_position(Gst.Format.TIME)[1]
-            if pos > 5 * Gst.SECOND:
-                self.player.seek_simple(
-                    Gst.Format.TIME, Gst.SeekFlags.FLUSH | Gst.SeekFlags.KEY_UNIT, 0
-                )
+            pos = self.backend.position()
+            if pos and pos > 5:
+                self.backend.seek(0, accurate=False)
                 return
         except:
             pass
@@ -320,9 +417,7 @@ class Player(GObject.Object):
             self._play_current_index()
         else:
             # Restart current if at 0
-            self.player.seek_simple(
-                Gst.Format.TIME, Gst.SeekFlags.FLUSH | Gst.SeekFlags.KEY_UNIT, 0
-            )
+            self.backend.seek(0, accurate=False)
 
     def shuffle_queue(self):
         if not self.shuffle_mode:
@@ -364,12 +459,15 @@ class Player(GObject.Object):
             else:
                 self.queue = list(self.original_queue)
 
+        self._schedule_prefetch()
+
         # Emit signal to update UI
         self.emit("state-changed", "queue-updated")
 
     def set_repeat_mode(self, mode):
         if mode in ["none", "track", "all"]:
             self.repeat_mode = mode
+            self._schedule_prefetch()
             self.emit("state-changed", "repeat-updated")
             if hasattr(self, "mpris_events"):
                 self.mpris_events.on_options()
@@ -377,44 +475,246 @@ class Player(GObject.Object):
     def _play_current_index(self):
         if 0 <= self.current_queue_index < len(self.queue):
             track = self.queue[self.current_queue_index]
-            video_id = str(track.get("videoId") or "")
-            title = str(track.get("title") or "Unknown")
-            artist = track.get("artist", "")
-            thumb = track.get("thumb")
-            like_status = str(track.get("likeStatus") or "INDIFFERENT")
 
             print(
-                f"DEBUG-PLAY: index={self.current_queue_index} video_id={video_id}",
+                f"DEBUG-PLAY: index={self.current_queue_index} video_id={track.get('videoId')}",
                 flush=True,
             )
 
-            # Metadata Normalization & Persistence
-            # Handle raw ytmusicapi data and ensure persistent strings in the queue
-            if not artist and track.get("artists"):
-                artist = ", ".join(
-                    [str(a.get("name", "")) for a in track.get("artists") if a]
-                )
+            video_id, title, artist, thumb, like_status = self._normalize_track(track)
+            self._load_internal(video_id, title, artist, thumb, like_status)
 
-            if isinstance(artist, list):
-                artist = ", ".join([str(a.get("name", "")) for a in artist])
+    def _normalize_track(self, track):
+        """Returns (video_id, title, artist, thumb, like_status) as plain strings."""
+        video_id = str(track.get("videoId") or "")
+        title = str(track.get("title") or "Unknown")
+        artist = track.get("artist", "")
+        thumb = track.get("thumb")
+        like_status = str(track.get("likeStatus") or "INDIFFERENT")
+
+        # Metadata Normalization & Persistence
+        # Handle raw ytmusicapi data and ensure persistent strings in the queue
+        if not artist and track.get("artists"):
+            artist = ", ".join(
+                [str(a.get("name", "")) for a in track.get("artists") if a]
+            )
 
-            artist = str(artist or "Unknown")
+        if isinstance(artist, list):
+            artist = ", ".join([str(a.get("name", "")) for a in artist])
 
-            if not thumb and track.get("thumbnails"):
-                thumbs = track.get("thumbnails")
-                if thumbs:
-                    thumb = thumbs[-1]["url"]
+        artist = str(artist or "Unknown")
 
-            thumb = str(thumb or "")
-            if "ytimg.com" in thumb:
-                thumb = get_high_res_url(thumb)
+        if not thumb and track.get("thumbnails"):
+            thumbs = track.get("thumbnails")
+            if thumbs:
+                thumb = thumbs[-1]["url"]
 
-            # SAVE BACK TO QUEUE to ensure UI refreshes (like fallbacks) use normalized strings
-            track["artist"] = artist
-            track["title"] = title
-            track["thumb"] = thumb
+        thumb = str(thumb or "")
+        if "ytimg.com" in thumb:
+            thumb = get_high_res_url(thumb)
 
-            self._load_internal(video_id, title, artist, thumb, like_status)
+        # SAVE BACK TO QUEUE to ensure UI refreshes (like fallbacks) use normalized strings
+        track["artist"] = artist
+        track["title"] = title
+        track["thumb"] = thumb
+
+        return video_id, title, artist, thumb, like_status
+
+    def _next_queue_index(self):
+        """Index that plays after the current one under the repeat mode, or -1."""
+        if not (0 <= self.current_queue_index < len(self.queue)):
+            return -1
+        if self.repeat_mode == "track":
+            return self.current_queue_index
+        if self.current_queue_index + 1 < len(self.queue):
+            return self.current_queue_index + 1
+        if self.repeat_mode == "all":
+            return 0
+        return -1
+
+    def _on_about_to_finish(self, backend):
+        """
+        Called from a GStreamer streaming thread shortly before the current
+        stream drains. If the next track is already resolved, hand its URI to
+        the backend so it switches streams without leaving PLAYING. Otherwise do
+        nothing and let the EOS path load it the normal way.
+        """
+        if not settings.get_setting("gapless_playback"):
+            return
+        # A crossfade owns this transition; a fading-out backend has no next track
+        if self.crossfade.active or backend is not self.backend:
+            return
+
+        pending = self._next_transition()
+        if not pending:
+            print("[GAPLESS] Next track not resolved yet, falling back to EOS")
+            return
+
+        print(f"[GAPLESS] Queued {pending['video_id']} for seamless switch")
+        self._gapless_pending = pending
+        backend.preload_next(
+            self._playback_uri(
+                pending["entry"]["url"], pending["video_id"], pending["format"]
+            )
+        )
+
+    def _next_transition(self):
+        """
+        Describes a switch to the next queue entry if its stream is already
+        available (disk or stream cache), else None. Safe to call from
+        streaming threads.
+        """
+        generation = self.load_generation
+        index = self._next_queue_index()
+        if index < 0:
+            return None
+
+        try:
+            track = self.queue[index]
+        except IndexError:
+            return None
+        video_id = track.get("videoId")
+        if not video_id:
+            return None
+
+        fmt = self.quality.format_selector()
+        # Counted in _commit_gapless_transition if this transition happens
+        cached = self.audio_cache.lookup(video_id, fmt, record_play=False)
+        if cached:
+            entry = dict(cached, url=cached["uri"])
+        else:
+            entry = self.stream_cache.get(video_id, fmt)
+        if not entry:
+            return None
+
+        return {
+            "generation": generation,
+            "index": index,
+            "video_id": video_id,
+            "entry": entry,
+            "format": fmt,
+        }
+
+    def _check_crossfade(self, position):
+        """
+        Drives the crossfade from the position clock: the poll prerolls the
+        next track PREROLL_LEAD seconds before the fade, and an alarm starts
+        the fade so it ends with the current track.
+        """
+        seconds = settings.get_setting("crossfade_seconds") or 0
+        if seconds <= 0 or self.duration <= 0 or self.duration < seconds * 2:
+            return
+        remaining = self.duration - position
+
+        if self.crossfade.state == "idle":
+            if self._crossfade_skipped == self.load_generation:
+                return
+            if remaining <= seconds + PREROLL_LEAD:
+                pending = self._next_transition()
+                if pending:
+                    self.crossfade.prepare(
+                        self._playback_uri(
+                            pending["entry"]["url"],
+                            pending["video_id"],
+                            pending["format"],
+                        ),
+                        pending,
+                    )
+                    # The low-rate poll is too coarse to start the fade on time
+                    self.clock.set_alarm(
+                        "crossfade",
+                        self.duration - seconds,
+                        lambda: self._check_crossfade(self.clock.now()),
+                    )
+            return
+
+        # Small tolerance so the alarm firing a hair early still counts
+        if self.crossfade.state != "prerolling" or remaining > seconds + 0.1:
+            return
+
+        pending = self.crossfade.pending
+        # Queue edits or a new load since prerolling make it the wrong track
+        index = self._next_queue_index()
+        if (
+            pending["generation"] != self.load_generation
+            or index < 0
+            or self.queue[index].get("videoId") != pending["video_id"]
+        ):
+            self.crossfade.cancel()
+            return
+        if not self.crossfade.is_ready():
+            if remaining < seconds:
+                # Too late for a full fade; give up on it for this track so
+                # about-to-finish (or EOS) loads the next one the normal way
+                print("[CROSSFADE] Next track not prerolled in time, skipping")
+                self.crossfade.cancel()
+                self.clock.clear_alarm("crossfade")
+                self._crossfade_skipped = self.load_generation
+            return
+
+        incoming = self.crossfade.start(self.backend, remaining)
+        self._attach_backend(incoming)
+        self._commit_gapless_transition(pending)
+        self._update_logical_state()
+
+    def _commit_gapless_transition(self, pending):
+        """
+        Runs on the main thread once playbin actually starts the queued stream
+        (STREAM_START), so queue index, MPRIS and metadata-changed move at the
+        audible boundary rather than when the URI was handed over.
+        """
+        video_id = pending["video_id"]
+        index = pending["index"]
+
+        # The queue may have been edited since the URI was queued
+        if not (
+            0 <= index < len(self.queue)
+            and self.queue[index].get("videoId") == video_id
+        ):
+            index = next(
+                (i for i, t in enumerate(self.queue) if t.get("videoId") == video_id),
+                -1,
+            )
+            if index < 0:
+                return
+
+        self.current_queue_index = index
+        track = self.queue[index]
+        video_id, title, artist, thumb, like_status = self._normalize_track(track)
+
+        entry = pending["entry"]
+        if self._needs_enrichment(title, artist):
+            title = entry.get("title") or title
+            artist = entry.get("artist") or artist
+        if not thumb and entry.get("thumb"):
+            thumb = get_high_res_url(entry["thumb"])
+
+        # Any in-flight load for the previous track is now stale
+        self.load_generation += 1
+        self.current_video_id = video_id
+        self.current_url = entry["url"]
+        self.current_url_expires = entry.get("expires_at")
+        self.current_format = pending["format"]
+        self.diagnostics.begin_track(video_id)
+        source = "disk" if "uri" in entry else "cache"
+        self._record_stream(entry["url"], pending["format"], source, entry)
+        if source == "disk":
+            self.audio_cache.record_play(video_id, pending["format"])
+        self._recovery_attempts = 0
+        self._last_position = 0.0
+        self.duration = -1
+        self.emit("progression", 0.0, 0.0)
+        self.clock.anchor(0.0)
+        if hasattr(self, "mpris_adapter"):
+            self.mpris_adapter._last_pos = 0
+
+        self.emit("metadata-changed", title, artist, thumb, video_id, like_status)
+        if thumb:
+            self._sync_mpris_art(thumb, video_id)
+
+        self._check_infinite_fetch()
+        self.emit("state-changed", "queue-updated")
+        self.prefetcher.schedule(self._upcoming_tracks())
 
     def _load_internal(
         self, video_id, title, artist, thumbnail_url, like_status="INDIFFERENT"
@@ -422,17 +722,36 @@ class Player(GObject.Object):
         self.current_video_id = video_id
 
         self._is_loading = True
+        self.crossfade.cancel()
+        self._reset_scrub()
+        # Stop polling now; no state change is posted if the pipeline
+        # is torn down or already paused
+        self.clock.stop()
         try:
-            self.player.set_state(Gst.State.NULL)
+            # Keeps a playbin3 pipeline up so the next load() switches in place
+            self.backend.prepare_switch()
         except Exception as e:
             print(f"set_state ERROR: {e}")
 
         self.current_video_id = video_id
         self.duration = -1
         self.emit("progression", 0.0, 0.0)
+        self.clock.anchor(0.0, running=False)
+        self.clock.clear_alarm("crossfade")
 
         self.load_generation += 1
         current_gen = self.load_generation
+        self.timing.begin(current_gen, video_id)
+        self.diagnostics.begin_track(video_id)
+        self._gapless_pending = None
+        self._pending_resume = None
+        self._disk_play_pending = None
+        self._recovery_attempts = 0
+        self._last_position = 0.0
+
+        # Don't let look-ahead work compete with the track the user asked for
+        self.prefetcher.cancel()
+        self.resolver_pool.cancel_prefetch()
 
         GLib.idle_add(
             self.emit,
@@ -456,12 +775,58 @@ class Player(GObject.Object):
             except Exception as e:
                 print(f"mpris ERROR: {e}")
 
-        thread = threading.Thread(
-            target=self._fetch_and_play,
-            args=(video_id, title, artist, thumbnail_url, like_status, current_gen),
+        fmt = self.quality.format_selector()
+        self.current_format = fmt
+        self.quality.begin_load()
+
+        # Fully cached tracks play from disk without resolving anything
+        cached = self.audio_cache.lookup(video_id, fmt, record_play=False)
+        if cached:
+            print(f"[AUDIO-CACHE] Playing {video_id} from disk")
+            # Counted once the pipeline reaches PLAYING
+            self._disk_play_pending = (video_id, fmt)
+            self.timing.lap(current_gen, "load_internal")
+            resolved = {
+                "url": cached["uri"],
+                "format": fmt,
+                "title": cached.get("title"),
+                "artist": cached.get("artist"),
+                "thumb": cached.get("thumb"),
+                "itag": cached.get("itag"),
+                "mime_type": cached.get("mime_type"),
+                "enriched": True,
+                "timings": {"source": "disk"},
+            }
+            self._on_stream_resolved(
+                resolved,
+                None,
+                video_id,
+                title,
+                artist,
+                thumbnail_url,
+                like_status,
+                current_gen,
+            )
+            return
+
+        # Superseded generations are dropped by the pool before extraction starts
+        self.resolver_pool.submit(
+            video_id,
+            fmt,
+            PRIORITY_CURRENT,
+            lambda resolved, error: self._on_stream_resolved(
+                resolved,
+                error,
+                video_id,
+                title,
+                artist,
+                thumbnail_url,
+                like_status,
+                current_gen,
+            ),
+            is_stale=lambda: current_gen != self.load_generation,
         )
-        thread.daemon = True
-        thread.start()
+        self.timing.lap(current_gen, "load_internal")
 
     def extend_queue(self, tracks):
         """Appends new tracks to the queue (and original_queue)."""
@@ -504,6 +869,7 @@ class Player(GObject.Object):
         else:
             self.queue.extend(tracks)
 
+        self._schedule_prefetch()
         self.emit("state-changed", "queue-updated")
 
     def update_track_thumbnail(self, video_id, working_url):
@@ -590,35 +956,10 @@ class Player(GObject.Object):
         self.extend_queue(new_tracks)
         self._is_fetching_infinite = False
 
-    def _create_cookie_file(self, headers):
-        """Creates a temporary Netscape format cookie file from headers."""
-        import tempfile
-        import time
-
-        cookie_str = headers.get("Cookie", "")
-        if not cookie_str:
-            return None
-
-        fd, path = tempfile.mkstemp(suffix=".txt", text=True)
-        with os.fdopen(fd, "w") as f:
-            f.write("# Netscape HTTP Cookie File\n")
-            f.write("# This file is generated by Mixtapes\n\n")
-
-            now = int(time.time()) + 3600 * 24 * 365  # 1 year validity
-
-            # Simple parsing of "key=value; key2=value2"
-            parts = cookie_str.split(";")
-            for part in parts:
-                if "=" in part:
-                    key, value = part.strip().split("=", 1)
-                    # domain flag path secure expiration name value
-                    f.write(f".youtube.com\tTRUE\t/\tTRUE\t{now}\t{key}\t{value}\n")
-                    f.write(f".google.com\tTRUE\t/\tTRUE\t{now}\t{key}\t{value}\n")
-
-        return path
-
-    def _fetch_and_play(
+    def _on_stream_resolved(
         self,
+        resolved,
+        error,
         video_id,
         title_hint,
         artist_hint,
@@ -631,144 +972,350 @@ class Player(GObject.Object):
                 f"Stale load generation {generation} (current {self.load_generation}). Aborting."
             )
             return
-        import os
+        if error is not None:
+            print(f"Error fetching URL: {error}")
+            return
 
-        url = f"https://www.youtube.com/watch?v={video_id}"
+        self.timing.lap(generation, "resolve")
+        timings = resolved.get("timings") or {}
+        for stage, ms in timings.items():
+            if stage != "source":
+                self.timing.add(generation, stage, ms)
+        if timings.get("source"):
+            self.timing.set_source(generation, timings["source"])
+        self._record_stream(
+            resolved["url"], resolved.get("format"), timings.get("source"), resolved
+        )
 
-        # Use a local copy of options to prevent race conditions
-        opts = self.ydl_opts.copy()
-        cookie_file = None
         try:
-            # Inject headers/cookies if authenticated
-            if self.client.is_authenticated() and self.client.api:
-                # Create Netscape cookie file
-                cookie_file = self._create_cookie_file(self.client.api.headers)
-                if cookie_file:
-                    opts["cookiefile"] = cookie_file
-
-                # Still pass User-Agent and Authorization if available
-                http_headers = {}
-                if "User-Agent" in self.client.api.headers:
-                    http_headers["User-Agent"] = self.client.api.headers["User-Agent"]
-                if "Authorization" in self.client.api.headers:
-                    http_headers["Authorization"] = self.client.api.headers[
-                        "Authorization"
-                    ]
-
-                if http_headers:
-                    opts["http_headers"] = http_headers
-            else:
-                pass
+            stream_url = resolved["url"]
+            fetched_title = resolved.get("title") or "Unknown"
+            fetched_artist = resolved.get("artist") or "Unknown"
+            fetched_thumb = resolved.get("thumb")
+
+            # If hints are placeholders, try to get better metadata from ytmusicapi
+            if self._needs_enrichment(title_hint, artist_hint):
+                fetched_title, fetched_artist, fetched_thumb = self._enrich_metadata(
+                    video_id, resolved, thumb_hint
+                )
+            self.timing.lap(generation, "enrichment")
 
-            with YoutubeDL(opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                stream_url = info["url"]
+            final_title = (
+                title_hint
+                if title_hint and title_hint != "Loading..."
+                else fetched_title
+            )
+            final_artist = (
+                artist_hint
+                if artist_hint and artist_hint != "Unknown"
+                else fetched_artist
+            )
 
-                # Extract only what we need, then drop the large info dict
-                fetched_title = info.get("title", "Unknown")
-                fetched_artist = info.get("uploader", "Unknown")
-                fetched_thumb = info.get("thumbnail")
-                del info  # Free 100KB+ of format/subtitle data
+            print(f"Playing: {final_title} by {final_artist}")
+
+            final_thumb = thumb_hint or fetched_thumb or ""
+            if "ytimg.com" in final_thumb:
+                final_thumb = get_high_res_url(final_thumb)
+
+            # Update the queue track if possible so subsequent refreshes find it
+            if 0 <= self.current_queue_index < len(self.queue):
+                track = self.queue[self.current_queue_index]
+                if track.get("videoId") == video_id:
+                    track["title"] = final_title
+                    track["artist"] = final_artist
+                    track["thumb"] = final_thumb
+
+            self.audio_cache.remember_metadata(
+                video_id,
+                resolved.get("format"),
+                title=final_title,
+                artist=final_artist,
+                thumb=final_thumb,
+            )
 
-                # If hints are placeholders, try to get better metadata from ytmusicapi
-                if (not title_hint or title_hint == "Loading...") or (
-                    not artist_hint or artist_hint == "Unknown"
-                ):
-                    try:
-                        song_details = self.client.get_song(video_id)
-                        if song_details:
-                            v_details = song_details.get("videoDetails", {})
-                            if "title" in v_details:
-                                fetched_title = v_details["title"]
-                            if "author" in v_details:
-                                fetched_artist = v_details["author"]
-
-                            # Use high-res thumbnail from get_song if available
-                            if (
-                                not thumb_hint
-                                and "thumbnail" in v_details
-                                and "thumbnails" in v_details["thumbnail"]
-                            ):
-                                thumbs = v_details["thumbnail"]["thumbnails"]
-                                if thumbs:
-                                    fetched_thumb = thumbs[-1]["url"]
-
-                    except Exception as e:
-                        print(f"Error fetching metadata from ytmusicapi: {e}")
-
-                final_title = (
-                    title_hint
-                    if title_hint and title_hint != "Loading..."
-                    else fetched_title
-                )
-                final_artist = (
-                    artist_hint
-                    if artist_hint and artist_hint != "Unknown"
-                    else fetched_artist
+            # Check generation again before playing
+            if generation != self.load_generation:
+                print(
+                    f"Stale load generation {generation} before playbin set. Aborting."
                 )
+                return
 
-                print(f"Playing: {final_title} by {final_artist}")
+            GObject.idle_add(self._start_playback, stream_url)
 
-                final_thumb = thumb_hint or fetched_thumb or ""
-                if "ytimg.com" in final_thumb:
-                    final_thumb = get_high_res_url(final_thumb)
+            GObject.idle_add(
+                self.emit,
+                "metadata-changed",
+                final_title,
+                final_artist,
+                final_thumb,
+                video_id,
+                like_status_hint,
+            )
+        except Exception as e:
+            print(f"Error fetching URL: {e}")
 
-                # Update the queue track if possible so subsequent refreshes find it
-                if 0 <= self.current_queue_index < len(self.queue):
-                    track = self.queue[self.current_queue_index]
-                    if track.get("videoId") == video_id:
-                        track["title"] = final_title
-                        track["artist"] = final_artist
-                        track["thumb"] = final_thumb
+    def _record_stream(self, url, fmt, source, info):
+        """Notes the stream picked for the current track in the diagnostics."""
+        self.diagnostics.set_stream(
+            url=url,
+            format=fmt,
+            source=source,
+            itag=info.get("itag"),
+            mime_type=info.get("mime_type"),
+            bitrate_kbps=info.get("bitrate_kbps"),
+            url_expires_at=parse_stream_expiry(url),
+        )
 
-                # Check generation again before playing
-                if generation != self.load_generation:
-                    print(
-                        f"Stale load generation {generation} before playbin set. Aborting."
-                    )
-                    if cookie_file and os.path.exists(cookie_file):
-                        os.remove(cookie_file)
-                    return
+    def _needs_enrichment(self, title_hint, artist_hint):
+        return (not title_hint or title_hint == "Loading...") or (
+            not artist_hint or artist_hint == "Unknown"
+        )
 
-                GObject.idle_add(self._start_playback, stream_url)
+    def _enrich_metadata(self, video_id, resolved, thumb_hint=None):
+        """
+        Returns (title, artist, thumb) for a resolved stream, preferring ytmusicapi
+        metadata over yt-dlp's. The result is stored on the cache entry so later
+        plays (and prefetched tracks) don't repeat the get_song call.
+        """
+        title = resolved.get("title") or "Unknown"
+        artist = resolved.get("artist") or "Unknown"
+        thumb = resolved.get("thumb")
+        if resolved.get("enriched"):
+            return title, artist, thumb
 
-                GObject.idle_add(
-                    self.emit,
-                    "metadata-changed",
-                    final_title,
-                    final_artist,
-                    final_thumb,
+        try:
+            song_details = self.client.get_song(video_id)
+            if song_details:
+                v_details = song_details.get("videoDetails", {})
+                if "title" in v_details:
+                    title = v_details["title"]
+                if "author" in v_details:
+                    artist = v_details["author"]
+
+                # Use high-res thumbnail from get_song if available
+                if (
+                    not thumb_hint
+                    and "thumbnail" in v_details
+                    and "thumbnails" in v_details["thumbnail"]
+                ):
+                    thumbs = v_details["thumbnail"]["thumbnails"]
+                    if thumbs:
+                        thumb = thumbs[-1]["url"]
+
+                self.stream_cache.update(
                     video_id,
-                    like_status_hint,
+                    resolved.get("format"),
+                    title=title,
+                    artist=artist,
+                    thumb=thumb,
+                    enriched=True,
                 )
+
         except Exception as e:
-            print(f"Error fetching URL: {e}")
-        finally:
-            if cookie_file and os.path.exists(cookie_file):
-                try:
-                    os.remove(cookie_file)
-                except:
-                    pass
+            print(f"Error fetching metadata from ytmusicapi: {e}")
 
-    def _start_playback(self, uri, cookie_file=None):
-        self.player.set_state(Gst.State.NULL)
-        self.player.set_property("uri", uri)
-        self.player.set_state(Gst.State.PLAYING)
+        return title, artist, thumb
 
-        # Direct URLs typically work without explicit cookies. Stale URLs are handled in _load_internal.
+    def _upcoming_tracks(self):
+        """
+        Returns hint dicts for the tracks that will play after the current one,
+        in play order. The queue is already in shuffled order when shuffle is on,
+        so only the repeat mode changes what comes next.
+        """
+        if not self.queue or not (0 <= self.current_queue_index < len(self.queue)):
+            return []
+
+        if self.repeat_mode == "track":
+            indices = [self.current_queue_index]
+        else:
+            indices = []
+            n = len(self.queue)
+            for step in range(1, n):
+                idx = self.current_queue_index + step
+                if idx >= n:
+                    if self.repeat_mode != "all":
+                        break
+                    idx %= n
+                indices.append(idx)
+                if len(indices) >= self.prefetcher.depth:
+                    break
+
+        upcoming = []
+        for idx in indices:
+            track = self.queue[idx]
+            video_id = track.get("videoId")
+            if not video_id:
+                continue
+            upcoming.append(
+                {
+                    "videoId": video_id,
+                    "title": track.get("title"),
+                    "artist": track.get("artist"),
+                    "thumb": track.get("thumb"),
+                }
+            )
+        return upcoming
+
+    def _schedule_prefetch(self):
+        """Re-plans look-ahead resolution after queue order changes."""
+        # While a track is still loading, _start_playback will plan once it's done
+        if self._is_loading:
+            return
+        self.prefetcher.schedule(self._upcoming_tracks())
+
+    def _submit_prefetch(self, hints, is_stale):
+        """Queues a low-priority resolution that warms the cache for one queue entry."""
+        fmt = self.quality.format_selector()
+        if self.audio_cache.lookup(hints["videoId"], fmt, record_play=False):
+            return
+        self.resolver_pool.submit(
+            hints["videoId"],
+            fmt,
+            PRIORITY_PREFETCH,
+            lambda resolved, error: self._on_prefetch_resolved(hints, resolved, error),
+            is_stale=is_stale,
+        )
+
+    def _on_prefetch_resolved(self, hints, resolved, error):
+        """Runs on a resolver thread once a look-ahead track has a URL."""
+        if error is not None:
+            print(f"[PREFETCH] Failed to resolve {hints['videoId']}: {error}")
+            return
+        if self._needs_enrichment(hints.get("title"), hints.get("artist")):
+            self._enrich_metadata(hints["videoId"], resolved, hints.get("thumb"))
+
+    def _playback_uri(self, url, video_id=None, fmt=None):
+        """Maps a resolved stream URL to what playbin should open."""
+        if not url.startswith("http"):
+            return url
+        # The audio cache is filled by the proxy, so it implies proxying
+        if settings.get_setting("stream_proxy") or self.audio_cache.enabled:
+            return self.stream_proxy.register(
+                url, key=(video_id, fmt or self.current_format)
+            )
+        return url
+
+    def _start_playback(self, uri, resume_at=None):
+        # Includes the wait for the main loop to run this idle callback
+        self.timing.lap(self.load_generation, "start_playback")
+        self.current_url = uri
+        self.current_url_expires = parse_stream_expiry(uri)
+        self.backend.load(self._playback_uri(uri, self.current_video_id))
+        # Applied on ASYNC_DONE, once the new stream is seekable
+        self._pending_resume = resume_at
+        self.backend.play()
+        self.timing.lap(self.load_generation, "set_state")
+
+        # Current track is on its way; warm up what comes next
+        self.prefetcher.schedule(self._upcoming_tracks())
+
+        # Direct URLs typically work without explicit cookies. Expired ones are re-resolved by _recover_stream.
+        return False
+
+    def _is_stream_expired_error(self, err, debug):
+        """
+        True for the HTTP 403/410 errors souphttpsrc posts for dead googlevideo
+        URLs. Only resource errors count, and only a status in the message
+        itself; the debug text is file names, line numbers and free text.
+        """
+        if err is None:
+            return False
+        domain = Gst.ResourceError.quark()
+        if not any(
+            err.matches(domain, getattr(Gst.ResourceError, code))
+            for code in EXPIRED_ERROR_CODES
+        ):
+            return False
+        return EXPIRED_STATUS_RE.search(err.message or "") is not None
+
+    def _recover_stream(self, resume_at, teardown=True):
+        """
+        Re-resolves the current track bypassing the stream cache and resumes at
+        resume_at. Retries are bounded and backed off exponentially. teardown
+        is for pipelines in an error state; a healthy one is switched in place.
+        """
+        video_id = self.current_video_id
+        if not video_id or self._recovery_attempts >= RECOVERY_MAX_ATTEMPTS:
+            print(f"[RECOVERY] Giving up on {video_id}")
+            self._is_loading = False
+            self._update_logical_state()
+            return False
+
+        self._recovery_attempts += 1
+        self._recovery_position = resume_at
+        delay = RECOVERY_BASE_DELAY * (2 ** (self._recovery_attempts - 1))
+        print(
+            f"[RECOVERY] Stream for {video_id} expired, re-resolving in {delay:.0f}s (attempt {self._recovery_attempts}, resume at {resume_at:.1f}s)"
+        )
+
+        self.stream_cache.invalidate(video_id)
+        if teardown:
+            self.backend.stop()
+        else:
+            self.backend.prepare_switch()
+        self._is_loading = True
+        self._gapless_pending = None
+        self.load_generation += 1
+        generation = self.load_generation
+
+        def submit():
+            if generation != self.load_generation:
+                return False
+            self.resolver_pool.submit(
+                video_id,
+                self.current_format,
+                PRIORITY_CURRENT,
+                lambda resolved, error: GLib.idle_add(
+                    self._on_recovery_resolved, resolved, error, generation, resume_at
+                ),
+                is_stale=lambda: generation != self.load_generation,
+                bypass_cache=True,
+            )
+            return False
+
+        GLib.timeout_add(int(delay * 1000), submit)
+        return False
+
+    def _on_recovery_resolved(self, resolved, error, generation, resume_at):
+        if generation != self.load_generation:
+            return False
+        if error is not None:
+            print(f"[RECOVERY] Re-resolve failed: {error}")
+            self._recover_stream(resume_at)
+            return False
+
+        print(f"[RECOVERY] Resuming {self.current_video_id} at {resume_at:.1f}s")
+        self._start_playback(resolved["url"], resume_at=resume_at)
         return False
 
     def play(self):
-        self.player.set_state(Gst.State.PLAYING)
+        # After a long pause the URL may have expired; swap it before resuming
+        if (
+            self.current_url_expires
+            and self.backend.state() == Gst.State.PAUSED
+            and time.time() >= self.current_url_expires - 30
+        ):
+            self._recovery_attempts = 0
+            self._recover_stream(self._last_position, teardown=False)
+            return
+        self.backend.play()
         self._update_logical_state()
 
     def pause(self):
-        self.player.set_state(Gst.State.PAUSED)
+        self.backend.pause()
         self._update_logical_state()
 
-    def stop(self):
-        self.player.set_state(Gst.State.NULL)
+    def stop(self, switching=False):
+        """switching: another track loads right after, so keep the pipeline up."""
+        self.crossfade.cancel()
+        self.clock.stop()
+        if switching:
+            self.backend.prepare_switch()
+        else:
+            self.backend.stop()
         self._is_loading = False
+        self.quality.cancel_load()
+        self._gapless_pending = None
         # Force stopped state immediately
         if self._current_logical_state != "stopped":
             self._current_logical_state = "stopped"
@@ -776,8 +1323,8 @@ class Player(GObject.Object):
 
     def _update_logical_state(self):
         new_state = "stopped"
-        if self.player:
-            state = self.player.get_state(0)[1]
+        if self.backend:
+            state = self.backend.state()
             if state == Gst.State.PLAYING:
                 new_state = "playing"
             elif state == Gst.State.PAUSED:
@@ -799,14 +1346,30 @@ class Player(GObject.Object):
                 GObject.idle_add(self._play_current_index)
             else:
                 GObject.idle_add(self.next)
+        elif t == Gst.MessageType.STREAM_START:
+            # Either the first stream of a fresh load or a gapless switch
+            pending = self._gapless_pending
+            self._gapless_pending = None
+            if pending and pending["generation"] == self.load_generation:
+                self._commit_gapless_transition(pending)
         elif t == Gst.MessageType.ASYNC_DONE:
             # The stream is actually loaded and ready
+            if self._pending_resume:
+                resume_at = self._pending_resume
+                self._pending_resume = None
+                self.seek(resume_at)
+            else:
+                # Settled after a load or seek: re-anchor the position clock
+                self.update_position(force=True)
             if hasattr(self, "mpris_events"):
                 self.mpris_events.on_player_all()  # Refresh duration and status
         elif t == Gst.MessageType.ERROR:
             err, debug = message.parse_error()
             print(f"Error: {err}, {debug}")
-            self.player.set_state(Gst.State.NULL)
+            if self.current_video_id and self._is_stream_expired_error(err, debug):
+                self._recover_stream(self._last_position)
+                return
+            self.backend.stop()
             self._is_loading = False
             self._update_logical_state()
         elif t == Gst.MessageType.STATE_CHANGED:
@@ -814,10 +1377,35 @@ class Player(GObject.Object):
                 old, new, pending = message.parse_state_changed()
                 if new == Gst.State.PLAYING:
                     self._is_loading = False
+                    self._buffering = False
+                    self.quality.record_playing()
+                    self.diagnostics.set_timings(
+                        self.timing.finish(self.load_generation)
+                    )
+                    disk_play = self._disk_play_pending
+                    if disk_play and disk_play[0] == self.current_video_id:
+                        self.audio_cache.record_play(*disk_play)
+                    self._disk_play_pending = None
+                    self.clock.start()
+                else:
+                    self.clock.stop()
+                self.update_position(force=True)
                 self._update_logical_state()
-        # BUFFERING messages are intentionally ignored — playbin manages
-        # stream buffering internally and briefly pauses the pipeline,
-        # which would cause the spinner to flash unnecessarily.
+        elif t == Gst.MessageType.BUFFERING:
+            # Not reflected in the UI state — playbin pauses briefly on its
+            # own and the spinner would flash. Only counted as a rebuffer
+            # for quality selection when it interrupts actual playback.
+            percent = message.parse_buffering()
+            self.diagnostics.on_buffering(percent)
+            if percent < 100 and not self._buffering and not self._is_loading:
+                if self._current_logical_state == "playing":
+                    self._buffering = True
+                    self.quality.record_rebuffer()
+                    self.diagnostics.rebuffer_started(self.get_position())
+            elif percent >= 100:
+                self._buffering = False
+        elif t == Gst.MessageType.TAG:
+            self.diagnostics.on_tags(message.parse_tag())
 
     def get_state_string(self):
         """Returns the current logical player state."""
@@ -843,12 +1431,8 @@ class Player(GObject.Object):
                 else:
                     fetch_url = current_url
 
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                }
-                req = urllib.request.Request(fetch_url, headers=headers)
-                with urllib.request.urlopen(req, timeout=10) as resp:
-                    data = resp.read()
+                with request_priority(VISIBLE):
+                    data = fetch_bytes(fetch_url, timeout=10)
 
                 # 2. Load and Crop
                 loader = GdkPixbuf.PixbufLoader()
@@ -887,22 +1471,27 @@ class Player(GObject.Object):
         thread = threading.Thread(target=job, args=(url,), daemon=True)
         thread.start()
 
-    def update_position(self):
-        import time
-
+    def update_position(self, force=False):
+        """
+        Queries the pipeline, re-anchors the position clock and emits
+        progression. Called by the clock's low-rate poll while playing and
+        directly on state changes; force skips the post-seek grace period.
+        """
         now = time.time()
 
         # 1. Protection during seek/load
         # If we are loading or just sought, don't trust GStreamer yet
-        if self._is_loading or (now - self.last_seek_time < 0.8):
+        if self._is_loading or (not force and now - self.last_seek_time < 0.8):
+            return True
+        # The UI follows the scrub target until the final seek lands
+        if self._scrubbing:
             return True
 
-        ret, state, pending = self.player.get_state(0)
+        ret, state, pending = self.backend.get_state()
         if state in [Gst.State.PLAYING, Gst.State.PAUSED]:
             # 2. Update Duration if it changed (vital for MPRIS progress bar scale)
-            success_dur, dur_nanos = self.player.query_duration(Gst.Format.TIME)
-            if success_dur:
-                new_dur = dur_nanos / Gst.SECOND
+            new_dur = self.backend.duration()
+            if new_dur is not None:
                 if (
                     abs(new_dur - self.duration) > 0.1
                 ):  # Threshold to avoid float jitter
@@ -911,57 +1500,170 @@ class Player(GObject.Object):
                         self.mpris_events.on_title()  # Syncs 'mpris:length'
 
             # 3. Update Position
-            success_pos, pos_nanos = self.player.query_position(Gst.Format.TIME)
-            if success_pos:
-                current_time = pos_nanos / Gst.SECOND
+            current_time = self.backend.position()
+            if current_time is not None:
+                self._last_position = current_time
+                self.clock.anchor(current_time, running=state == Gst.State.PLAYING)
+
+                # Recovered stream has been stable for a while
+                if (
+                    self._recovery_attempts
+                    and current_time
+                    > self._recovery_position + RECOVERY_STABLE_SECONDS
+                ):
+                    self._recovery_attempts = 0
 
                 # Update the Adapter's cache immediately
                 if hasattr(self, "mpris_adapter"):
-                    self.mpris_adapter._last_pos = pos_nanos // 1000
+                    self.mpris_adapter._last_pos = int(current_time * 1_000_000)
 
                 # 4. Emit progression for local UI
                 # We use float(d) to ensure the UI progress bar has a max value
                 d = self.duration if self.duration > 0 else 0
                 self.emit("progression", float(current_time), float(d))
 
+                if state == Gst.State.PLAYING:
+                    self._check_crossfade(current_time)
+
         return True
 
     def seek(self, position, flush=True):
         """Seek to position in seconds"""
-        if self.player.get_state(0)[1] == Gst.State.NULL:
+        if self.backend.state() == Gst.State.NULL:
             return
-
-        import time
+        # Seeking away from the end makes a prerolled fade pointless;
+        # during a fade, the seek applies to the incoming track
+        self.crossfade.cancel()
+        self._crossfade_skipped = None
 
         self.last_seek_time = time.time()
+        self.backend.seek(position, accurate=True, flush=flush)
+        self.clock.anchor(position)
+        if self.duration > 0:
+            self.emit("progression", float(position), float(self.duration))
+
+        if hasattr(self, "mpris_events"):
+            self.mpris_events.on_seek(int(position * 1_000_000))
 
-        flags = Gst.SeekFlags.ACCURATE
-        if flush:
-            flags |= Gst.SeekFlags.FLUSH
+    def get_position(self):
+        """Current position in seconds, interpolated between pipeline queries."""
+        return self.clock.now()
 
-        self.player.seek_simple(
-            Gst.Format.TIME,
-            flags,
-            int(position * Gst.SECOND),
+    def get_diagnostics(self):
+        """
+        Stats-for-nerds report: the current track's stream, tags, rebuffers
+        and timings plus live buffer, network and quality state. JSON-safe.
+        """
+        report = self.diagnostics.current() or {}
+        buffering = self.backend.buffering()
+        quality = self.quality.stats()
+
+        # The quality engine's smoothed sample; the pipeline's own input rate
+        # when nothing goes through the proxy
+        download_kbps = quality.get("throughput_kbps")
+        if not download_kbps and buffering and buffering["avg_in"] > 0:
+            download_kbps = buffering["avg_in"] * 8 / 1000
+
+        expires = report.get("url_expires_at")
+        report.update(
+            state=self._current_logical_state,
+            engine=self.backend.name,
+            position=self.get_position(),
+            duration=self.duration,
+            download_kbps=download_kbps,
+            buffer=buffering,
+            url_expires_in=expires - time.time() if expires else None,
+            quality=quality,
+            proxy=self.stream_proxy.metrics.snapshot(),
         )
+        if buffering:
+            report["buffer_percent"] = buffering["percent"]
+        return report
 
-        if hasattr(self, "mpris_events"):
-            self.mpris_events.on_seek(int(position * 1_000_000))
+    def export_diagnostics(self, path=None):
+        """Writes get_diagnostics() and the reports of earlier tracks as JSON."""
+        return self.diagnostics.export(self.get_diagnostics(), path)
+
+    def scrub_to(self, position, held=False):
+        """
+        Seek for progress-scale drags. Positions are coalesced into fast
+        KEY_UNIT seeks at most every SCRUB_SEEK_INTERVAL, progression follows
+        the pointer immediately, and one accurate seek is issued on
+        end_scrub(). held: the pointer is still down and the caller calls
+        end_scrub() on release; otherwise (keys, clicks without a release
+        hook) the accurate seek follows once it has been still for
+        SCRUB_SETTLE_MS.
+        """
+        if self.backend.state() == Gst.State.NULL or self.duration <= 0:
+            return
+        position = max(0.0, min(position, self.duration))
+        if not self._scrubbing:
+            self._scrubbing = True
+            self.crossfade.cancel()
+        self._scrub_target = position
+        self._last_position = position
+        self.clock.anchor(position)
+        self.emit("progression", float(position), float(self.duration))
+
+        if self._scrub_seek_source is None:
+            wait = SCRUB_SEEK_INTERVAL - (time.monotonic() - self._last_scrub_seek)
+            if wait <= 0:
+                self._scrub_fast_seek()
+            else:
+                self._scrub_seek_source = GLib.timeout_add(
+                    int(wait * 1000), self._scrub_fast_seek
+                )
+
+        if self._scrub_settle_source is not None:
+            GLib.source_remove(self._scrub_settle_source)
+            self._scrub_settle_source = None
+        if not held:
+            self._scrub_settle_source = GLib.timeout_add(
+                SCRUB_SETTLE_MS, self.end_scrub
+            )
+
+    def _scrub_fast_seek(self):
+        self._scrub_seek_source = None
+        if self._scrubbing:
+            self._last_scrub_seek = time.monotonic()
+            self.last_seek_time = time.time()
+            self.backend.seek(self._scrub_target, accurate=False, snap=True)
+        return False
+
+    def end_scrub(self):
+        """Finishes a scrub with one accurate seek to the last target."""
+        if not self._scrubbing:
+            return False
+        target = self._scrub_target
+        self._reset_scrub()
+        self.seek(target)
+        return False
+
+    def _reset_scrub(self):
+        for source in (self._scrub_seek_source, self._scrub_settle_source):
+            if source is not None:
+                GLib.source_remove(source)
+        self._scrub_seek_source = None
+        self._scrub_settle_source = None
+        self._scrubbing = False
 
     def get_volume(self):
-        return self.player.get_property("volume")
+        return self._volume
 
     def set_volume(self, value):
         # value 0.0 to 1.0
-        self.player.set_property("volume", float(value))
+        self._volume = float(value)
+        # Mid-fade the next ramp step picks the new volume up
+        if self.crossfade.state != "fading":
+            self.backend.set_volume(value)
         if value > 0 and self.get_mute():
             self.set_mute(False)
         else:
             GLib.idle_add(self.emit, "volume-changed", float(value), self.get_mute())
 
     def get_mute(self):
-        return self.player.get_property("mute")
+        return self.backend.get_mute()
 
     def set_mute(self, is_muted):
-        self.player.set_property("mute", is_muted)
+        self.backend.set_mute(is_muted)
         GLib.idle_add(self.emit, "volume-changed", self.get_volume(), is_muted)
@@ -0,0 +1,61 @@
+import threading
+
+# How many upcoming queue entries to keep warm
+PREFETCH_DEPTH = 2
+# Give the current track a head start before competing for bandwidth/CPU
+PREFETCH_DELAY = 3.0
+
+
+class QueuePrefetcher:
+    """
+    Keeps the stream URLs (and metadata) of the next few queue entries warm.
+
+    The plan is a snapshot taken on the main thread; every call to schedule()
+    replaces it. After a short settle period the plan is handed to submit_func
+    as low-priority resolver jobs whose is_stale() check turns true as soon as
+    the plan is replaced, so queue edits drop outdated work before it starts.
+    """
+
+    def __init__(self, submit_func, depth=PREFETCH_DEPTH):
+        self.submit_func = submit_func
+        self.depth = depth
+        self._plan = []
+        self._delay = PREFETCH_DELAY
+        self._generation = 0
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def schedule(self, tracks, delay=PREFETCH_DELAY):
+        """Replaces the current plan with tracks (list of hint dicts)."""
+        with self._cond:
+            self._generation += 1
+            self._plan = list(tracks[: self.depth])
+            self._delay = delay
+            self._cond.notify()
+
+    def cancel(self):
+        self.schedule([])
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._plan:
+                    self._cond.wait()
+                generation = self._generation
+                plan = self._plan
+                self._plan = []
+                delay = self._delay
+
+                # Settle period: a re-plan during it restarts the wait
+                if delay > 0:
+                    self._cond.wait(timeout=delay)
+                    if generation != self._generation:
+                        continue
+
+            is_stale = lambda gen=generation: gen != self._generation
+            for track in plan:
+                try:
+                    self.submit_func(track, is_stale)
+                except Exception as e:
+                    print(f"[PREFETCH] Failed to queue {track.get('videoId')}: {e}")
@@ -0,0 +1,165 @@
+import re
+import time
+import threading
+from collections import deque
+
+# Pinnable tiers -> yt-dlp format selectors. Every selector falls back to
+# something playable so a cap never makes a track unresolvable.
+TIERS = {
+    "high": "bestaudio/best",
+    "medium": "bestaudio[abr<=160]/bestaudio/best",
+    "low": "bestaudio[abr<=70]/worstaudio/best",
+}
+TIER_ORDER = ["low", "medium", "high"]
+DEFAULT_TIER = "high"
+
+# Measured throughput (kbit/s) needed to pick a tier in auto mode. Well above
+# the stream bitrates so chunk fetches keep ahead of playback with margin.
+TIER_MIN_KBPS = {"high": 1500, "medium": 500, "low": 0}
+# Weight of the newest throughput sample
+THROUGHPUT_ALPHA = 0.3
+# Rebuffers/slow starts within this window push auto mode down a tier
+STALL_WINDOW = 600  # seconds
+SLOW_START_SECONDS = 5.0
+RECENT_STARTS = 20
+
+_ABR_CAP_RE = re.compile(r"abr<=(\d+)")
+
+
+def format_bitrate_cap(fmt):
+    """Returns the abr<=N cap (kbit/s) of a format selector, or None."""
+    match = _ABR_CAP_RE.search(fmt or "")
+    return int(match.group(1)) if match else None
+
+
+class QualityEngine:
+    """
+    Chooses the audio format selector for each new track.
+
+    A pinned tier (the audio_quality setting) is used as-is. In "auto" the
+    tier follows measured conditions: an EWMA of proxy chunk throughput,
+    rebuffers reported by playbin while playing and how long recent tracks
+    took to start. The choice is made once per load, so a track never
+    switches format mid-stream.
+    """
+
+    def __init__(self, metrics=None, mode="auto"):
+        self.metrics = metrics  # ProxyMetrics, optional
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._throughput = None  # bytes/s EWMA
+        self._last_snapshot = None
+        self._stalls = deque()  # monotonic timestamps of rebuffers/slow starts
+        self._start_times = deque(maxlen=RECENT_STARTS)
+        self._load_started = None
+        self.current_tier = DEFAULT_TIER
+        self.rebuffers = 0
+
+    def set_mode(self, mode):
+        if mode != "auto" and mode not in TIERS:
+            mode = "auto"
+        self.mode = mode
+
+    def _sample_metrics(self):
+        """Folds proxy bytes/time fetched since the last sample into the EWMA."""
+        if self.metrics is None:
+            return
+        snap = self.metrics.snapshot()
+        last = self._last_snapshot
+        self._last_snapshot = snap
+        if last is None:
+            last = {"bytes_fetched": 0, "chunk_time": 0.0}
+
+        fetched = snap["bytes_fetched"] - last["bytes_fetched"]
+        chunk_time = snap["chunk_time"] - last["chunk_time"]
+        if fetched <= 0 or chunk_time <= 0:
+            return
+        sample = fetched / chunk_time
+        if self._throughput is None:
+            self._throughput = sample
+        else:
+            self._throughput = (
+                THROUGHPUT_ALPHA * sample + (1 - THROUGHPUT_ALPHA) * self._throughput
+            )
+
+    def _recent_stalls(self):
+        cutoff = time.monotonic() - STALL_WINDOW
+        while self._stalls and self._stalls[0] < cutoff:
+            self._stalls.popleft()
+        return len(self._stalls)
+
+    def _auto_tier(self):
+        tier = DEFAULT_TIER
+        if self._throughput is not None:
+            kbps = self._throughput * 8 / 1000
+            tier = next(
+                t for t in reversed(TIER_ORDER) if kbps >= TIER_MIN_KBPS[t]
+            )
+
+        # Each recent stall costs a tier
+        index = TIER_ORDER.index(tier) - self._recent_stalls()
+        return TIER_ORDER[max(0, index)]
+
+    def format_selector(self):
+        """The format selector to resolve the next track with."""
+        with self._lock:
+            self._sample_metrics()
+            if self.mode in TIERS:
+                tier = self.mode
+            else:
+                tier = self._auto_tier()
+            if tier != self.current_tier:
+                print(f"[QUALITY] Switching to {tier} ({self.describe()})")
+            self.current_tier = tier
+            return TIERS[tier]
+
+    def begin_load(self):
+        with self._lock:
+            self._load_started = time.monotonic()
+
+    def record_playing(self):
+        """Called when the pipeline reaches PLAYING; closes the start timer."""
+        with self._lock:
+            if self._load_started is None:
+                return
+            latency = time.monotonic() - self._load_started
+            self._load_started = None
+            self._start_times.append(latency)
+            if latency > SLOW_START_SECONDS:
+                self._stalls.append(time.monotonic())
+        print(f"[QUALITY] Started in {latency * 1000:.0f} ms")
+
+    def cancel_load(self):
+        with self._lock:
+            self._load_started = None
+
+    def record_rebuffer(self):
+        with self._lock:
+            self.rebuffers += 1
+            self._stalls.append(time.monotonic())
+        print("[QUALITY] Rebuffering")
+
+    def describe(self):
+        kbps = (
+            f"{self._throughput * 8 / 1000:.0f} kbit/s"
+            if self._throughput is not None
+            else "no throughput data"
+        )
+        return f"{kbps}, {len(self._stalls)} recent stalls"
+
+    def stats(self):
+        with self._lock:
+            starts = list(self._start_times)
+            return {
+                "mode": self.mode,
+                "tier": self.current_tier,
+                "throughput_kbps": (
+                    self._throughput * 8 / 1000 if self._throughput else None
+                ),
+                "rebuffers": self.rebuffers,
+                "recent_stalls": self._recent_stalls(),
+                "last_start_ms": starts[-1] * 1000 if starts else None,
+                "avg_start_ms": (
+                    sum(starts) / len(starts) * 1000 if starts else None
+                ),
+            }
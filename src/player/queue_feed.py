@@ -0,0 +1,62 @@
+import threading
+
+from gi.repository import GLib
+
+from api.scheduler import BACKGROUND, request_priority
+
+
+class QueueFeeder:
+    """
+    Streams the rest of a playlist into Player's queue after playback has
+    started from the tracks that were already loaded.
+
+    Pages come from a TrackPager as they arrive and go to extend_queue on the
+    main thread, so there is no ceiling on the playlist size and nothing
+    waits for the whole list. The first skip tracks (the ones set_queue got)
+    are dropped. The feed outlives the page that started it; replacing the
+    queue bumps Player.queue_generation, which is what stops it before its
+    next page. Pages are fetched at background priority.
+    """
+
+    def __init__(self, player, pager, skip=0):
+        self.player = player
+        self.pager = pager
+        self.skip = skip
+        self.generation = player.queue_generation
+        self.fed = 0
+
+    def start(self):
+        thread = threading.Thread(target=self._run, name="QueueFeeder")
+        thread.daemon = True
+        thread.start()
+
+    @property
+    def cancelled(self):
+        return self.player.queue_generation != self.generation
+
+    def _run(self):
+        with request_priority(BACKGROUND):
+            self._feed()
+
+    def _feed(self):
+        seen = 0
+        try:
+            for tracks in self.pager:
+                if self.cancelled:
+                    print(f"[QUEUE-FEED] Cancelled after {self.fed} tracks")
+                    return
+                fresh = tracks[max(0, self.skip - seen) :]
+                seen += len(tracks)
+                if fresh:
+                    GLib.idle_add(self._extend, fresh)
+        except Exception as e:
+            print(f"[QUEUE-FEED] Stopped after {self.fed} tracks: {e}")
+            return
+        print(f"[QUEUE-FEED] Done, {seen} tracks in {self.pager.pages} pages")
+
+    def _extend(self, tracks):
+        """Main thread. Drops the page if the queue was replaced meanwhile."""
+        if not self.cancelled:
+            self.fed += len(tracks)
+            self.player.extend_queue(tracks)
+        return False
@@ -0,0 +1,376 @@
+import os
+import sys
+import json
+import select
+import threading
+import time
+import subprocess
+from urllib.parse import urlparse, parse_qs
+
+from gi.repository import GLib
+
+from player.stream_cache import StreamCache
+from player.quality import format_bitrate_cap
+
+
+def pick_direct_audio_format(streaming_data, max_kbps=None):
+    """
+    Picks the best audio-only format from an InnerTube player response that
+    can be played as-is. Returns the format dict or None. With max_kbps, the
+    best format under the cap wins, or the smallest one if none is.
+
+    Formats behind signatureCipher need the player JS to decipher, and URLs
+    with an n parameter get throttled to a crawl unless n is transformed by
+    the same JS, so both are left to yt-dlp.
+    """
+    if not streaming_data:
+        return None
+
+    candidates = []
+    for fmt in streaming_data.get("adaptiveFormats", []):
+        if not str(fmt.get("mimeType", "")).startswith("audio/"):
+            continue
+        url = fmt.get("url")
+        if not url or "signatureCipher" in fmt or "cipher" in fmt:
+            continue
+        if "n" in parse_qs(urlparse(url).query):
+            continue
+
+        candidates.append(fmt)
+
+    if not candidates:
+        return None
+
+    bitrate = lambda f: f.get("averageBitrate") or f.get("bitrate") or 0
+    if max_kbps is not None:
+        capped = [f for f in candidates if bitrate(f) <= max_kbps * 1000]
+        if not capped:
+            return min(candidates, key=bitrate)
+        candidates = capped
+    return max(candidates, key=bitrate)
+
+
+def get_ytdlp_cache_dir():
+    """yt-dlp keeps deciphered player JS and signature functions here."""
+    return os.path.join(GLib.get_user_cache_dir(), "mixtapes", "yt-dlp")
+
+
+# A worker that doesn't answer within this is assumed wedged and restarted
+EXTRACT_TIMEOUT = 90
+
+
+class ExtractorProcess:
+    """
+    Handle to one extract_worker.py process. Requests are strictly
+    sequential; each resolver thread owns its own process.
+    """
+
+    def __init__(self):
+        self._proc = None
+        self._next_id = 0
+
+    def _ensure_running(self):
+        if self._proc is not None and self._proc.poll() is None:
+            return
+        script = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "extract_worker.py"
+        )
+        self._proc = subprocess.Popen(
+            [sys.executable, script],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+        print(f"[RESOLVER] Started extraction worker (pid {self._proc.pid})")
+
+    def request(self, payload, timeout=EXTRACT_TIMEOUT):
+        self._ensure_running()
+        self._next_id += 1
+        payload = dict(payload, id=self._next_id)
+
+        try:
+            self._proc.stdin.write(json.dumps(payload) + "\n")
+            self._proc.stdin.flush()
+
+            ready, _, _ = select.select([self._proc.stdout], [], [], timeout)
+            if not ready:
+                raise TimeoutError(f"extraction worker timed out after {timeout}s")
+            line = self._proc.stdout.readline()
+            if not line:
+                raise RuntimeError("extraction worker exited")
+            reply = json.loads(line)
+        except Exception:
+            # Start from a clean process next time
+            self.terminate()
+            raise
+
+        if reply.get("id") != payload["id"]:
+            self.terminate()
+            raise RuntimeError("extraction worker reply out of sync")
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error") or "extraction failed")
+        return reply
+
+    def terminate(self):
+        if self._proc is not None:
+            try:
+                self._proc.kill()
+                self._proc.wait(timeout=2)
+            except Exception:
+                pass
+            self._proc = None
+
+
+class StreamResolver:
+    """
+    Long-lived front end for yt-dlp.
+
+    Extraction runs in extract_worker.py processes, one per resolver thread,
+    launched at startup and reused. Each keeps one configured YoutubeDL per
+    (auth state, format) instead of building a new one per track, with yt-dlp's
+    cache pointed at the Mixtapes cache dir so the player JS / n-challenge
+    solutions survive restarts. Extractors are only rebuilt when MusicClient's
+    login headers change. Threads are bounded by ResolverPool, and so is the
+    process count. Only the final URL and a few metadata fields come back.
+    """
+
+    def __init__(self, client, base_opts, cache=None):
+        self.client = client
+        self.base_opts = dict(base_opts)
+        self.cache = cache if cache is not None else StreamCache()
+
+        self._lock = threading.Lock()
+        self._auth_key = None
+        self._processes = {}  # thread id -> ExtractorProcess
+
+        # Timing stats for startup vs steady-state comparison
+        self.stats = {
+            "builds": 0,
+            "extractions": 0,
+            "first_extract_ms": None,
+            "last_extract_ms": None,
+            "total_extract_ms": 0.0,
+            "direct_hits": 0,
+        }
+
+    def _build_opts(self, fmt):
+        opts = dict(self.base_opts)
+        opts["format"] = fmt
+        opts["cachedir"] = get_ytdlp_cache_dir()
+
+        # Inject headers/cookies if authenticated
+        if self.client.is_authenticated() and self.client.api:
+            headers = self.client.api.headers
+            cookie_file = self.client.cookie_jar.cookie_file()
+            if cookie_file:
+                opts["cookiefile"] = cookie_file
+
+            # Still pass User-Agent and Authorization if available
+            http_headers = {}
+            if "User-Agent" in headers:
+                http_headers["User-Agent"] = headers["User-Agent"]
+            if "Authorization" in headers:
+                http_headers["Authorization"] = headers["Authorization"]
+
+            if http_headers:
+                opts["http_headers"] = http_headers
+        return opts
+
+    def _prepare(self, fmt):
+        """
+        Returns (auth_key, opts, process) for the calling thread, dropping
+        cached URLs on login changes. The session cookie jar rewrites its file
+        on its own, and the worker process rebuilds its extractor whenever it
+        sees a new auth_key.
+        """
+        with self._lock:
+            auth_key = self.client.cookie_jar.fingerprint()
+            if auth_key != self._auth_key:
+                if self._auth_key is not None:
+                    print("[RESOLVER] Login state changed, rebuilding extractor")
+                    # Stream URLs are tied to the session that resolved them
+                    self.cache.clear()
+                self._auth_key = auth_key
+
+            opts = self._build_opts(fmt)
+            ident = threading.get_ident()
+            process = self._processes.get(ident)
+            if process is None:
+                process = ExtractorProcess()
+                self._processes[ident] = process
+        return auth_key, opts, process
+
+    def _note_build(self, fmt, build_ms):
+        if build_ms:
+            self.stats["builds"] += 1
+            print(f"[RESOLVER] Built extractor for {fmt!r} in {build_ms:.0f} ms")
+
+    def warm_up(self, fmt):
+        """Starts the calling thread's worker process and builds its extractor."""
+        try:
+            auth_key, opts, process = self._prepare(fmt)
+            reply = process.request({"op": "warm", "auth_key": auth_key, "opts": opts})
+            self._note_build(fmt, reply.get("build_ms"))
+        except Exception as e:
+            print(f"[RESOLVER] Warm-up failed: {e}")
+
+    def resolve(self, video_id, fmt, bypass_cache=False):
+        """
+        Returns a dict with url, format, title, artist and thumb for video_id,
+        plus itag, mime_type and bitrate_kbps when known.
+        Served from the stream cache when possible. "timings" holds the source
+        ("cache", "direct" or "ytdlp") and per-stage milliseconds of this call.
+        """
+        timings = {}
+        if not bypass_cache:
+            cached = self.cache.get(video_id, fmt)
+            if cached:
+                print(f"[RESOLVER] Stream cache hit for {video_id}")
+                cached["timings"] = {"source": "cache"}
+                return cached
+
+        # A forced re-resolve usually means the last URL was rejected; don't
+        # hand back another direct URL from the same source
+        song_meta = None
+        if not bypass_cache:
+            resolved, song_meta = self._resolve_direct(video_id, fmt, timings)
+            if resolved:
+                resolved["timings"] = dict(timings, source="direct")
+                return resolved
+
+        resolved = self._resolve_with_ytdlp(video_id, fmt, timings)
+        if song_meta:
+            # get_song already ran; carry its metadata so enrichment is skipped
+            resolved.update(song_meta)
+            self.cache.update(video_id, fmt, **song_meta)
+        resolved["timings"] = dict(timings, source="ytdlp")
+        return resolved
+
+    def _resolve_direct(self, video_id, fmt, timings):
+        """
+        Fast path: take an unciphered audio URL straight from the player
+        endpoint response MusicClient.get_song returns.
+
+        Returns (resolved or None, metadata or None). The metadata is returned
+        even when no usable format was found so the yt-dlp fallback can reuse it.
+        """
+        start = time.monotonic()
+        try:
+            song = self.client.get_song(video_id)
+        except Exception as e:
+            print(f"[RESOLVER] get_song failed for {video_id}: {e}")
+            return None, None
+        finally:
+            timings["get_song"] = (time.monotonic() - start) * 1000
+        if not song:
+            return None, None
+
+        v_details = song.get("videoDetails", {})
+        song_meta = None
+        if v_details:
+            song_meta = {"enriched": True}
+            if "title" in v_details:
+                song_meta["title"] = v_details["title"]
+            if "author" in v_details:
+                song_meta["artist"] = v_details["author"]
+            thumbs = v_details.get("thumbnail", {}).get("thumbnails")
+            if thumbs:
+                song_meta["thumb"] = thumbs[-1]["url"]
+
+        status = song.get("playabilityStatus", {}).get("status")
+        direct = None
+        if status == "OK":
+            direct = pick_direct_audio_format(
+                song.get("streamingData"), max_kbps=format_bitrate_cap(fmt)
+            )
+        if not direct:
+            return None, song_meta
+
+        elapsed_ms = (time.monotonic() - start) * 1000
+        self.stats["direct_hits"] += 1
+        print(
+            f"[RESOLVER] Direct URL for {video_id} (itag {direct.get('itag')}) in {elapsed_ms:.0f} ms"
+        )
+
+        resolved = {
+            "url": direct["url"],
+            "format": fmt,
+            "title": "Unknown",
+            "artist": "Unknown",
+            "thumb": None,
+            "itag": direct.get("itag"),
+            "mime_type": direct.get("mimeType"),
+            "bitrate_kbps": (
+                direct.get("averageBitrate") or direct.get("bitrate") or 0
+            )
+            / 1000,
+        }
+        resolved.update(song_meta or {})
+
+        metadata = {k: v for k, v in resolved.items() if k != "url"}
+        self.cache.put(video_id, fmt, resolved["url"], **metadata)
+        return resolved, song_meta
+
+    def _resolve_with_ytdlp(self, video_id, fmt, timings):
+        start = time.monotonic()
+        auth_key, opts, process = self._prepare(fmt)
+        timings["cookie"] = (time.monotonic() - start) * 1000
+
+        start = time.monotonic()
+        reply = process.request(
+            {
+                "op": "resolve",
+                "video_id": video_id,
+                "auth_key": auth_key,
+                "opts": opts,
+            }
+        )
+        roundtrip_ms = (time.monotonic() - start) * 1000
+        self._note_build(fmt, reply.get("build_ms"))
+        elapsed_ms = reply.get("elapsed_ms") or 0.0
+        build_ms = reply.get("build_ms") or 0.0
+        timings["extract"] = elapsed_ms
+        if build_ms:
+            timings["extractor_build"] = build_ms
+        # Pipe round trip, JSON and (re)spawning the worker
+        timings["worker_overhead"] = max(0.0, roundtrip_ms - elapsed_ms - build_ms)
+
+        stats = self.stats
+        stats["extractions"] += 1
+        stats["last_extract_ms"] = elapsed_ms
+        stats["total_extract_ms"] += elapsed_ms
+        if stats["first_extract_ms"] is None:
+            stats["first_extract_ms"] = elapsed_ms
+            print(f"[RESOLVER] First extraction ({video_id}) took {elapsed_ms:.0f} ms")
+        else:
+            avg = stats["total_extract_ms"] / stats["extractions"]
+            print(
+                f"[RESOLVER] Extracted {video_id} in {elapsed_ms:.0f} ms (avg {avg:.0f} ms over {stats['extractions']})"
+            )
+
+        resolved = {
+            "url": reply["url"],
+            "format": fmt,
+            "title": reply.get("title") or "Unknown",
+            "artist": reply.get("artist") or "Unknown",
+            "thumb": reply.get("thumb"),
+            "itag": reply.get("itag"),
+            "mime_type": (
+                f'audio/{reply["ext"]}; codecs="{reply.get("codec")}"'
+                if reply.get("ext")
+                else None
+            ),
+            "bitrate_kbps": reply.get("abr"),
+        }
+
+        metadata = {k: v for k, v in resolved.items() if k != "url"}
+        self.cache.put(video_id, fmt, resolved["url"], **metadata)
+        return resolved
+
+    def close(self):
+        with self._lock:
+            for process in self._processes.values():
+                process.terminate()
+            self._processes = {}
+            self._auth_key = None
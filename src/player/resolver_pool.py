@@ -0,0 +1,164 @@
+import heapq
+import itertools
+import threading
+
+from api.scheduler import INTERACTIVE, PREFETCH, request_priority
+
+PRIORITY_CURRENT = 0
+PRIORITY_PREFETCH = 1
+
+# Each worker may run one yt-dlp extraction (and its Node subprocess) at a time
+POOL_WORKERS = 2
+
+
+class ResolveJob:
+    def __init__(self, video_id, fmt, priority, bypass_cache):
+        self.video_id = video_id
+        self.fmt = fmt
+        self.priority = priority
+        self.bypass_cache = bypass_cache
+        self.state = "queued"  # queued, running, done
+        self.waiters = []  # (callback, is_stale)
+
+    @property
+    def key(self):
+        return (self.video_id, self.fmt, self.bypass_cache)
+
+    def prune_stale(self):
+        """Drops waiters whose request has been superseded. Returns True if any remain."""
+        live = []
+        for callback, is_stale in self.waiters:
+            try:
+                if is_stale is not None and is_stale():
+                    continue
+            except Exception:
+                pass
+            live.append((callback, is_stale))
+        self.waiters = live
+        return bool(live)
+
+
+class ResolverPool:
+    """
+    Small fixed pool of threads in front of StreamResolver.
+
+    - Priorities: the track the user asked for beats look-ahead work.
+      Among current-track requests the newest wins, since older ones belong
+      to superseded load generations.
+    - Coalescing: requests for the same (videoId, format) share one job.
+    - Cancellation: every request carries an is_stale() check that runs right
+      before extraction starts, so skipped tracks never reach yt-dlp.
+    """
+
+    def __init__(self, resolver, workers=POOL_WORKERS, warm_format=None):
+        self.resolver = resolver
+        self._heap = []
+        self._jobs = {}  # key -> job (queued or running)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+        for i in range(workers):
+            thread = threading.Thread(
+                target=self._run,
+                args=(warm_format,),
+                name=f"stream-resolver-{i}",
+                daemon=True,
+            )
+            thread.start()
+
+    def submit(
+        self,
+        video_id,
+        fmt,
+        priority,
+        callback,
+        is_stale=None,
+        bypass_cache=False,
+    ):
+        """
+        Queues a resolution. callback(resolved, error) runs on a worker thread,
+        unless is_stale() is true by the time the job completes.
+        """
+        with self._cond:
+            key = (video_id, fmt, bypass_cache)
+            job = self._jobs.get(key)
+            if job is None:
+                job = ResolveJob(video_id, fmt, priority, bypass_cache)
+                self._jobs[key] = job
+                self._push(job)
+            elif job.state == "queued" and priority < job.priority:
+                # Prefetch job became the current track: bump it
+                job.priority = priority
+                self._push(job)
+
+            job.waiters.append((callback, is_stale))
+            self._cond.notify()
+            return job
+
+    def cancel_prefetch(self):
+        """Forgets all queued look-ahead jobs."""
+        with self._cond:
+            for key, job in list(self._jobs.items()):
+                if job.state == "queued" and job.priority >= PRIORITY_PREFETCH:
+                    job.state = "done"
+                    del self._jobs[key]
+                    self.dropped += 1
+
+    def _push(self, job):
+        seq = next(self._seq)
+        order = -seq if job.priority == PRIORITY_CURRENT else seq
+        heapq.heappush(self._heap, (job.priority, order, job))
+
+    def _next_job(self):
+        """Pops the best runnable job. Caller holds the lock."""
+        while True:
+            while not self._heap:
+                self._cond.wait()
+
+            priority, _, job = heapq.heappop(self._heap)
+            if job.state != "queued" or priority != job.priority:
+                continue  # Cancelled or re-pushed with a better priority
+
+            if not job.prune_stale():
+                job.state = "done"
+                self._jobs.pop(job.key, None)
+                self.dropped += 1
+                print(f"[RESOLVER] Dropped superseded request for {job.video_id}")
+                continue
+
+            job.state = "running"
+            return job
+
+    def _run(self, warm_format):
+        if warm_format:
+            self.resolver.warm_up(warm_format)
+
+        while True:
+            with self._cond:
+                job = self._next_job()
+
+            resolved = None
+            error = None
+            # Look-ahead get_song calls yield the network to everything urgent
+            priority = INTERACTIVE if job.priority == PRIORITY_CURRENT else PREFETCH
+            try:
+                with request_priority(priority):
+                    resolved = self.resolver.resolve(
+                        job.video_id, job.fmt, bypass_cache=job.bypass_cache
+                    )
+            except Exception as e:
+                error = e
+
+            with self._cond:
+                job.state = "done"
+                if self._jobs.get(job.key) is job:
+                    del self._jobs[job.key]
+                job.prune_stale()
+                waiters = job.waiters
+
+            for callback, _ in waiters:
+                try:
+                    callback(resolved, error)
+                except Exception as e:
+                    print(f"[RESOLVER] Callback failed for {job.video_id}: {e}")
@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs
+
+# googlevideo URLs carry their own expiry; stop serving them a little before
+# that so a track started from cache doesn't die mid-way through.
+EXPIRY_MARGIN = 5 * 60
+# Fallback lifetime for URLs that don't advertise an expire= parameter.
+DEFAULT_TTL = 60 * 60
+MAX_ENTRIES = 200
+
+
+def parse_stream_expiry(url):
+    """Returns the unix timestamp baked into a googlevideo URL, or None.
+
+    The value is usually a query parameter (?expire=...), but some clients
+    embed it as a path segment (/expire/1700000000/...).
+    """
+    if not url:
+        return None
+    try:
+        parsed = urlparse(url)
+        values = parse_qs(parsed.query).get("expire")
+        if values:
+            return int(values[0])
+
+        parts = parsed.path.split("/")
+        if "expire" in parts:
+            idx = parts.index("expire")
+            if idx + 1 < len(parts):
+                return int(parts[idx + 1])
+    except (ValueError, TypeError):
+        pass
+    return None
+
+
+class StreamCache:
+    """
+    Thread-safe LRU cache of resolved stream URLs.
+    Keys are (video_id, format) pairs, values are dicts with at least "url"
+    plus whatever metadata the resolver extracted (title, artist, thumb).
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, margin=EXPIRY_MARGIN):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+        self.margin = margin
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, video_id, fmt):
+        key = (video_id, fmt)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry["expires_at"] - self.margin <= time.time():
+                # Too close to expiry to start a track with it
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry)
+
+    def put(self, video_id, fmt, url, **metadata):
+        if not video_id or not url:
+            return
+        expires_at = parse_stream_expiry(url) or int(time.time() + DEFAULT_TTL)
+        entry = dict(metadata)
+        entry["url"] = url
+        entry["expires_at"] = expires_at
+
+        key = (video_id, fmt)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def update(self, video_id, fmt, **metadata):
+        """Merges metadata into an existing entry without touching its expiry."""
+        with self._lock:
+            entry = self._entries.get((video_id, fmt))
+            if entry is not None:
+                entry.update(metadata)
+
+    def invalidate(self, video_id, fmt=None):
+        """Drops cached URLs for video_id (all formats if fmt is None)."""
+        with self._lock:
+            for key in list(self._entries.keys()):
+                if key[0] == video_id and (fmt is None or key[1] == fmt):
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,430 @@
+import re
+import queue
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# googlevideo throttles long single requests; short ranges are served at full speed
+CHUNK_SIZE = 1024 * 1024
+# Chunks fetched ahead of what GStreamer has consumed
+READ_AHEAD_CHUNKS = 2
+MAX_STREAMS = 32
+# Waiting longer than this for read-ahead counts as a stall
+STALL_THRESHOLD = 0.1
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
+
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)")
+_CONTENT_RANGE_RE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+
+class UpstreamError(Exception):
+    def __init__(self, status, message=""):
+        super().__init__(message or f"HTTP {status}")
+        self.status = status
+
+
+class ProxyMetrics:
+    """Counters shared by all streams going through the proxy."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.bytes_fetched = 0
+        self.bytes_served = 0
+        self.chunks = 0
+        self.chunk_time = 0.0
+        self.last_chunk_latency = 0.0
+        self.stalls = 0
+        self.stall_time = 0.0
+
+    def record_chunk(self, size, latency):
+        with self._lock:
+            self.bytes_fetched += size
+            self.chunks += 1
+            self.chunk_time += latency
+            self.last_chunk_latency = latency
+
+    def record_served(self, size):
+        with self._lock:
+            self.bytes_served += size
+
+    def record_stall(self, duration):
+        with self._lock:
+            self.stalls += 1
+            self.stall_time += duration
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "bytes_fetched": self.bytes_fetched,
+                "bytes_served": self.bytes_served,
+                "chunks": self.chunks,
+                "chunk_time": self.chunk_time,
+                "avg_chunk_latency": (
+                    self.chunk_time / self.chunks if self.chunks else 0.0
+                ),
+                "last_chunk_latency": self.last_chunk_latency,
+                # bytes/s while actually fetching
+                "throughput": (
+                    self.bytes_fetched / self.chunk_time if self.chunk_time else 0.0
+                ),
+                "stalls": self.stalls,
+                "stall_time": self.stall_time,
+            }
+
+
+class ChunkSource(ABC):
+    """
+    A stage that produces byte ranges of a registered stream.
+    fetch() returns (data, total_size, content_type); total_size may be None.
+    Stages can wrap each other (e.g. a cache in front of HttpChunkSource).
+    """
+
+    @abstractmethod
+    def fetch(self, stream, start, end):
+        """Bytes start..end (inclusive) of stream; fewer only at the end."""
+
+
+class _UpstreamBody:
+    """A whole-body response to a range request, read through sequentially."""
+
+    def __init__(self, resp):
+        self.resp = resp
+        self.offset = 0
+        self.exhausted = False
+
+    def read(self, size):
+        parts = []
+        while size > 0:
+            data = self.resp.raw.read(min(size, CHUNK_SIZE), decode_content=True)
+            if not data:
+                self.exhausted = True
+                break
+            parts.append(data)
+            size -= len(data)
+            self.offset += len(data)
+        return b"".join(parts)
+
+    def skip_to(self, offset):
+        while self.offset < offset and not self.exhausted:
+            self.read(min(offset - self.offset, CHUNK_SIZE))
+
+    def close(self):
+        self.resp.close()
+
+
+class HttpChunkSource(ChunkSource):
+    """
+    Fetches ranges from the real URL over a pooled keep-alive session.
+
+    A server that ignores Range answers 200 with the whole body. Slicing it
+    per chunk would download the track once per chunk, so the response is
+    kept open on the stream instead and later chunks are read from it in
+    order. Only a seek backwards needs a new request.
+    """
+
+    def __init__(self):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["User-Agent"] = USER_AGENT
+
+    def fetch(self, stream, start, end):
+        # Taken off the stream so a concurrent request opens its own
+        body = stream.take_body()
+        if body is not None and body.offset <= start:
+            return self._read_body(stream, body, start, end)
+        if body is not None:
+            body.close()
+
+        resp = self.session.get(
+            stream.url,
+            headers={"Range": f"bytes={start}-{end}"},
+            timeout=(5, 20),
+            stream=True,
+        )
+        if resp.status_code not in (200, 206):
+            resp.close()
+            raise UpstreamError(resp.status_code)
+
+        if resp.status_code == 200:
+            print("[PROXY] Upstream ignores Range, reading the body through")
+            length = resp.headers.get("Content-Length")
+            stream.total_size = int(length) if length and length.isdigit() else None
+            stream.content_type = resp.headers.get("Content-Type")
+            return self._read_body(stream, _UpstreamBody(resp), start, end)
+
+        total = None
+        match = _CONTENT_RANGE_RE.match(resp.headers.get("Content-Range", ""))
+        if match and match.group(3) != "*":
+            total = int(match.group(3))
+        return resp.content, total, resp.headers.get("Content-Type")
+
+    def _read_body(self, stream, body, start, end):
+        try:
+            body.skip_to(start)
+            data = body.read(end - start + 1)
+        except Exception:
+            body.close()
+            raise
+        if body.exhausted:
+            body.close()
+        else:
+            stream.keep_body(body)
+        return data, stream.total_size, stream.content_type
+
+
+class ProxyStream:
+    """A registered upstream stream. total_size/content_type are learnt lazily."""
+
+    def __init__(self, token, url, key=None):
+        self.token = token
+        self.url = url
+        self.key = key  # e.g. (videoId, format), for stages that care which track this is
+        self.total_size = None
+        self.content_type = None
+        self._body = None  # _UpstreamBody when the server ignores Range
+        self._lock = threading.Lock()
+
+    def take_body(self):
+        with self._lock:
+            body, self._body = self._body, None
+        return body
+
+    def keep_body(self, body):
+        with self._lock:
+            body, self._body = self._body, body
+        if body is not None:
+            body.close()
+
+    def close(self):
+        """Drops an upstream response still held open for this stream."""
+        body = self.take_body()
+        if body is not None:
+            body.close()
+
+
+class StreamProxy:
+    """
+    Loopback HTTP server that playbin reads from instead of googlevideo.
+
+    Each GET is served by fetching CHUNK_SIZE byte ranges from the source
+    stage, keeping READ_AHEAD_CHUNKS in flight ahead of the reader. Seeks
+    arrive as new requests with a Range header and simply start fetching
+    from that offset. Listeners get every chunk as it is served, which is
+    the hook for write-through caching.
+    """
+
+    def __init__(
+        self, source=None, chunk_size=CHUNK_SIZE, read_ahead=READ_AHEAD_CHUNKS
+    ):
+        self.source = source or HttpChunkSource()
+        self.chunk_size = chunk_size
+        self.read_ahead = read_ahead
+        self.metrics = ProxyMetrics()
+        # objects with on_chunk(stream, start, data) and on_stream_closed(stream)
+        self.listeners = []
+        self._streams = OrderedDict()
+        self._lock = threading.Lock()
+        self._server = None
+        self.port = None
+
+    def start(self):
+        if self._server is not None:
+            return
+        handler = type("StreamProxyHandler", (_ProxyHandler,), {"proxy": self})
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(
+            target=self._server.serve_forever, name="stream-proxy", daemon=True
+        ).start()
+        print(f"[PROXY] Listening on 127.0.0.1:{self.port}")
+
+    def register(self, url, key=None):
+        """Returns a loopback URL that proxies url."""
+        self.start()
+        token = secrets.token_urlsafe(12)
+        evicted = []
+        with self._lock:
+            self._streams[token] = ProxyStream(token, url, key)
+            while len(self._streams) > MAX_STREAMS:
+                evicted.append(self._streams.popitem(last=False)[1])
+        for stream in evicted:
+            stream.close()
+            self.notify_closed(stream)
+        return f"http://127.0.0.1:{self.port}/stream/{token}"
+
+    def get_stream(self, token):
+        with self._lock:
+            return self._streams.get(token)
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def fetch_chunk(self, stream, start, end):
+        started = time.monotonic()
+        data, total, content_type = self.source.fetch(stream, start, end)
+        self.metrics.record_chunk(len(data), time.monotonic() - started)
+        if total is not None:
+            stream.total_size = total
+        if content_type and not stream.content_type:
+            stream.content_type = content_type
+        return data
+
+    def notify_chunk(self, stream, start, data):
+        for listener in self.listeners:
+            try:
+                listener.on_chunk(stream, start, data)
+            except Exception as e:
+                print(f"[PROXY] Listener failed: {e}")
+
+    def notify_closed(self, stream):
+        """stream's token is gone; nothing more will be read through it."""
+        for listener in self.listeners:
+            try:
+                listener.on_stream_closed(stream)
+            except Exception as e:
+                print(f"[PROXY] Listener failed: {e}")
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    proxy = None  # set on the subclass created by StreamProxy.start
+
+    def log_message(self, format, *args):
+        pass
+
+    def _parse_range(self):
+        header = self.headers.get("Range")
+        if not header:
+            return 0, None, False
+        match = _RANGE_RE.match(header.strip())
+        if not match or not match.group(1):
+            return 0, None, False
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else None
+        return start, end, True
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _serve(self, send_body):
+        proxy = self.proxy
+        parts = self.path.split("/")
+        stream = proxy.get_stream(parts[-1]) if len(parts) == 3 else None
+        if stream is None or parts[1] != "stream":
+            self.send_error(404)
+            return
+
+        start, end, is_range = self._parse_range()
+        chunk_size = proxy.chunk_size
+
+        # First chunk tells us the total size; errors surface as real statuses
+        # so playbin reports 403/410 and the player can re-resolve
+        try:
+            first_end = start + chunk_size - 1
+            if end is not None:
+                first_end = min(first_end, end)
+            first = proxy.fetch_chunk(stream, start, first_end)
+        except UpstreamError as e:
+            self.send_error(e.status)
+            return
+        except Exception as e:
+            print(f"[PROXY] Upstream fetch failed: {e}")
+            self.send_error(502)
+            return
+
+        total = stream.total_size
+        if total is not None:
+            if start >= total:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{total}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            last = total - 1 if end is None else min(end, total - 1)
+        else:
+            last = start + len(first) - 1 if end is None else end
+
+        self.send_response(206 if is_range else 200)
+        self.send_header(
+            "Content-Type", stream.content_type or "application/octet-stream"
+        )
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(last - start + 1))
+        if is_range:
+            self.send_header("Content-Range", f"bytes {start}-{last}/{total or '*'}")
+        self.end_headers()
+        if not send_body:
+            return
+
+        stop = threading.Event()
+        chunks = queue.Queue(maxsize=max(1, proxy.read_ahead))
+
+        def producer():
+            offset = start + len(first)
+            while offset <= last and not stop.is_set():
+                chunk_end = min(offset + chunk_size - 1, last)
+                try:
+                    data = proxy.fetch_chunk(stream, offset, chunk_end)
+                except Exception as e:
+                    print(f"[PROXY] Chunk {offset}-{chunk_end} failed: {e}")
+                    data = None
+                while not stop.is_set():
+                    try:
+                        chunks.put((offset, data), timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+                if not data:
+                    return
+                offset += len(data)
+
+        if start + len(first) <= last:
+            threading.Thread(target=producer, daemon=True).start()
+
+        try:
+            offset = start
+            data = first[: last - start + 1]
+            while True:
+                self.wfile.write(data)
+                proxy.metrics.record_served(len(data))
+                proxy.notify_chunk(stream, offset, data)
+                offset += len(data)
+                if offset > last:
+                    break
+
+                waited = time.monotonic()
+                _, data = chunks.get()
+                waited = time.monotonic() - waited
+                if waited > STALL_THRESHOLD:
+                    proxy.metrics.record_stall(waited)
+                if not data:
+                    # Upstream died mid-stream: drop the connection so the
+                    # client reconnects with a Range request
+                    self.close_connection = True
+                    break
+        except (BrokenPipeError, ConnectionResetError):
+            # Client went away (seek, track change); stop reading ahead
+            pass
+        finally:
+            stop.set()
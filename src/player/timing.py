@@ -0,0 +1,166 @@
+import os
+import json
+import math
+import time
+import threading
+from collections import deque
+
+from gi.repository import GLib
+
+# Completed plays kept for percentiles
+HISTORY_SIZE = 200
+# Unfinished traces kept around (superseded loads never reach PLAYING)
+MAX_ACTIVE = 8
+# A request older than this is not attributed to the next load
+REQUEST_MAX_AGE = 10.0
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class PlayTrace:
+    """Stage timings (ms) for one load, identified by load_generation."""
+
+    def __init__(self, generation, video_id, started):
+        self.generation = generation
+        self.video_id = video_id
+        self.started = started
+        self.wall_time = time.time()
+        self.stages = {}
+        self.source = None
+        self.total_ms = None
+        self._last = started
+
+    def lap(self, stage):
+        """Records the time since the previous lap as stage."""
+        now = time.monotonic()
+        self.stages[stage] = (now - self._last) * 1000
+        self._last = now
+
+    def to_dict(self):
+        return {
+            "generation": self.generation,
+            "video_id": self.video_id,
+            "time": self.wall_time,
+            "source": self.source,
+            "total_ms": self.total_ms,
+            "stages": dict(self.stages),
+        }
+
+
+class PlayTimer:
+    """
+    Records where time goes between asking for a track and hearing it.
+
+    The play path calls request() when the user acts (e.g. set_queue),
+    begin() when _load_internal bumps the generation, lap() after each
+    sequential stage, add() for stages measured elsewhere (resolver
+    timings) and finish() when playbin reaches PLAYING. Finished traces go
+    into a rolling history that percentiles() and export() summarise.
+    """
+
+    def __init__(self, history_size=HISTORY_SIZE):
+        self._lock = threading.Lock()
+        self._active = {}
+        self._requested_at = None
+        self.history = deque(maxlen=history_size)
+
+    def request(self):
+        with self._lock:
+            self._requested_at = time.monotonic()
+
+    def begin(self, generation, video_id):
+        now = time.monotonic()
+        with self._lock:
+            requested = self._requested_at
+            self._requested_at = None
+            if requested is not None and now - requested <= REQUEST_MAX_AGE:
+                trace = PlayTrace(generation, video_id, requested)
+                trace.lap("request")
+            else:
+                trace = PlayTrace(generation, video_id, now)
+            self._active[generation] = trace
+            for old in sorted(self._active)[:-MAX_ACTIVE]:
+                del self._active[old]
+
+    def lap(self, generation, stage):
+        with self._lock:
+            trace = self._active.get(generation)
+            if trace:
+                trace.lap(stage)
+
+    def add(self, generation, stage, ms):
+        with self._lock:
+            trace = self._active.get(generation)
+            if trace and ms is not None:
+                trace.stages[stage] = ms
+
+    def set_source(self, generation, source):
+        with self._lock:
+            trace = self._active.get(generation)
+            if trace:
+                trace.source = source
+
+    def finish(self, generation, stage="playing"):
+        with self._lock:
+            trace = self._active.pop(generation, None)
+            if trace is None:
+                return None
+            trace.lap(stage)
+            trace.total_ms = (time.monotonic() - trace.started) * 1000
+            self.history.append(trace)
+
+        stages = ", ".join(f"{k} {v:.0f}" for k, v in trace.stages.items())
+        print(
+            f"[TIMING] {trace.video_id} ({trace.source or '?'}) audible after {trace.total_ms:.0f} ms: {stages}"
+        )
+        return trace
+
+    def percentiles(self, source=None):
+        """{stage: {"count", "p50", "p90", "p99"}} over the history, "total" included."""
+        with self._lock:
+            traces = [t for t in self.history if source is None or t.source == source]
+
+        samples = {}
+        for trace in traces:
+            samples.setdefault("total", []).append(trace.total_ms)
+            for stage, ms in trace.stages.items():
+                samples.setdefault(stage, []).append(ms)
+
+        return {
+            stage: dict(
+                {"count": len(values)},
+                **{f"p{p}": percentile(values, p) for p in PERCENTILES},
+            )
+            for stage, values in samples.items()
+        }
+
+    def summary(self):
+        with self._lock:
+            sources = sorted({t.source for t in self.history if t.source})
+        return {
+            "all": self.percentiles(),
+            "by_source": {s: self.percentiles(s) for s in sources},
+        }
+
+    def export(self, path=None):
+        """Writes history and percentiles as JSON; returns the path."""
+        if path is None:
+            export_dir = os.path.join(GLib.get_user_cache_dir(), "mixtapes")
+            os.makedirs(export_dir, exist_ok=True)
+            path = os.path.join(
+                export_dir, time.strftime("play-timings-%Y%m%d-%H%M%S.json")
+            )
+
+        with self._lock:
+            history = [t.to_dict() for t in self.history]
+        data = dict(self.summary(), history=history)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+        print(f"[TIMING] Exported {len(history)} plays to {path}")
+        return path
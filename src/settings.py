@@ -0,0 +1,64 @@
+import os
+import json
+from gi.repository import GLib
+
+# Playback and app preferences, stored next to debug_logs in config.json
+DEFAULTS = {
+    "gapless_playback": True,
+    "stream_proxy": False,
+    # 0 disables the on-disk audio cache; it is filled by, and so turns on,
+    # the stream proxy, which stays opt-in
+    "audio_cache_mb": 0,
+    "audio_quality": "auto",  # auto, high, medium, low
+    "crossfade_seconds": 0,  # 0 keeps hard cuts / gapless
+    "playback_engine": "playbin",  # playbin, playbin3
+}
+
+_config = None
+
+
+def _get_config_path():
+    data_dir = os.path.join(GLib.get_user_data_dir(), "muse")
+    return os.path.join(data_dir, "config.json")
+
+
+def _load():
+    global _config
+    if _config is None:
+        _config = {}
+        config_path = _get_config_path()
+        if os.path.exists(config_path):
+            try:
+                with open(config_path, "r") as f:
+                    _config = json.load(f)
+            except Exception:
+                pass
+    return _config
+
+
+def get_setting(key):
+    return _load().get(key, DEFAULTS.get(key))
+
+
+def set_setting(key, value):
+    config = _load()
+    config[key] = value
+
+    config_path = _get_config_path()
+
+    # Re-read to not overwrite keys written elsewhere (e.g. logger's debug_logs)
+    on_disk = {}
+    if os.path.exists(config_path):
+        try:
+            with open(config_path, "r") as f:
+                on_disk = json.load(f)
+        except Exception:
+            pass
+    on_disk[key] = value
+
+    os.makedirs(os.path.dirname(config_path), exist_ok=True)
+    try:
+        with open(config_path, "w") as f:
+            json.dump(on_disk, f)
+    except Exception as e:
+        print(f"Failed to save settings: {e}")
@@ -2,6 +2,7 @@ import gi
 from gi.repository import Gtk, Adw, GObject, GLib, Gdk, Pango
 from ui.utils import AsyncPicture, LikeButton, MarqueeLabel
 from ui.queue_panel import QueuePanel
+from ui.stats_panel import StatsPanel
 
 
 class ExpandedPlayer(Gtk.Box):
@@ -123,7 +124,16 @@ class ExpandedPlayer(Gtk.Box):
         self.scale = Gtk.Scale(orientation=Gtk.Orientation.HORIZONTAL)
         self.scale.set_range(0, 100)
         self.scale.connect("change-value", self.on_scale_change_value)
+
+        # A gesture here would be cancelled once the scale's own drag gesture
+        # claims the pointer; a legacy controller still sees the release
+        self._scale_held = False
+        pointer = Gtk.EventControllerLegacy()
+        pointer.set_propagation_phase(Gtk.PropagationPhase.CAPTURE)
+        pointer.connect("event", self.on_scale_pointer_event)
+        self.scale.add_controller(pointer)
         progress_box.append(self.scale)
+        self._tick_id = None
 
         timings_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
         self.pos_label = Gtk.Label(label="0:00")
@@ -207,11 +217,30 @@ class ExpandedPlayer(Gtk.Box):
             "clicked", lambda x: self.stack.set_visible_child_name("queue")
         )
 
+        self.stats_btn = Gtk.ToggleButton(icon_name="utilities-system-monitor-symbolic")
+        self.stats_btn.add_css_class("flat")
+        self.stats_btn.add_css_class("circular")
+        self.stats_btn.set_tooltip_text("Stats for Nerds")
+        self.stats_btn.connect("toggled", self._on_stats_toggled)
+
         bottom_box.append(self.vol_icon)
         bottom_box.append(self.volume_scale)
+        bottom_box.append(self.stats_btn)
         bottom_box.append(self.show_queue_btn)
         main_box.append(bottom_box)
 
+        # Playback diagnostics, hidden until toggled
+        self.stats_panel = StatsPanel(self.player)
+        self.stats_revealer = Gtk.Revealer()
+        self.stats_revealer.set_transition_type(
+            Gtk.RevealerTransitionType.SLIDE_DOWN
+        )
+        self.stats_revealer.set_child(self.stats_panel)
+        main_box.append(self.stats_revealer)
+        # Also stops refreshing while the expanded view is hidden or swapped out
+        self.stats_panel.connect("map", self._on_stats_mapped)
+        self.stats_panel.connect("unmap", self._on_stats_unmapped)
+
         self.player_scroll.set_child(main_box)
         self.stack.add_named(self.player_scroll, "player")
 
@@ -384,6 +413,24 @@ class ExpandedPlayer(Gtk.Box):
         self._ignore_page_change = False
         return False
 
+    def _set_frame_ticking(self, active):
+        """Moves the scale on the frame clock while playing; GTK skips ticks while hidden."""
+        if active and self._tick_id is None:
+            self._tick_id = self.scale.add_tick_callback(self._on_frame_tick)
+        elif not active and self._tick_id is not None:
+            self.scale.remove_tick_callback(self._tick_id)
+            self._tick_id = None
+
+    def _on_frame_tick(self, widget, frame_clock):
+        dur = self.player.duration
+        if dur > 0:
+            pos = min(self.player.get_position(), dur)
+            self.scale.set_value(pos)
+            label = self._format_time(pos)
+            if self.pos_label.get_label() != label:
+                self.pos_label.set_label(label)
+        return True
+
     def on_progression(self, player, pos, dur):
         self.scale.set_range(0, dur)
         self.scale.set_value(pos)
@@ -399,8 +446,24 @@ class ExpandedPlayer(Gtk.Box):
                 self.play_icon.set_from_icon_name("media-playback-pause-symbolic")
 
     def on_scale_change_value(self, scale, scroll, value):
+        # Drags fire this per pointer move; the player coalesces them
         if self.player.duration > 0:
-            self.player.seek(value)
+            self.player.scrub_to(value, held=self._scale_held)
+        return False
+
+    def on_scale_pointer_event(self, controller, event):
+        # Held drags seek accurately once, on release, not whenever they pause
+        kind = event.get_event_type()
+        if kind in (Gdk.EventType.BUTTON_PRESS, Gdk.EventType.TOUCH_BEGIN):
+            self._scale_held = True
+        elif kind in (
+            Gdk.EventType.BUTTON_RELEASE,
+            Gdk.EventType.TOUCH_END,
+            Gdk.EventType.TOUCH_CANCEL,
+        ):
+            if self._scale_held:
+                self._scale_held = False
+                self.player.end_scrub()
         return False
 
     def _format_time(self, seconds):
@@ -417,6 +480,9 @@ class ExpandedPlayer(Gtk.Box):
             self.player.play()
 
     def on_state_changed(self, player, state):
+        if state in ("playing", "paused", "stopped"):
+            self._set_frame_ticking(state == "playing")
+
         if state == "queue-updated":
             self._sync_carousel_queue()
             return
@@ -452,6 +518,17 @@ class ExpandedPlayer(Gtk.Box):
         )
         self.play_icon.set_from_icon_name(icon)
 
+    def _on_stats_toggled(self, btn):
+        active = btn.get_active()
+        self.stats_revealer.set_reveal_child(active)
+        self.stats_panel.set_active(active)
+
+    def _on_stats_mapped(self, panel):
+        self.stats_panel.set_active(self.stats_btn.get_active())
+
+    def _on_stats_unmapped(self, panel):
+        self.stats_panel.set_active(False)
+
     def on_volume_scale_changed(self, scale):
         self.player.set_volume(scale.get_value())
 
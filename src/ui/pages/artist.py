@@ -3,7 +3,14 @@ import threading
 import json
 import re
 from api.client import MusicClient
-from ui.utils import AsyncImage, AsyncPicture, LikeButton, parse_item_metadata
+from api.scheduler import VISIBLE, get_scheduler, request_priority
+from ui.utils import (
+    AsyncImage,
+    AsyncPicture,
+    LikeButton,
+    parse_item_metadata,
+    stale_while_revalidate,
+)
 
 
 class ArtistPage(Adw.Bin):
@@ -26,6 +33,7 @@ class ArtistPage(Adw.Bin):
             "Videos": 10,
         }
         self._section_widgets = {}  # Store section containers
+        self._section_snapshots = {}  # What each section was last built from
 
         # Main Layout
         self.main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
@@ -206,77 +214,100 @@ class ArtistPage(Adw.Bin):
             self.artist_name = initial_name
             self.name_label.set_label(initial_name)
 
-        self.stack.set_visible_child_name("loading")
-
+        self._is_ui_init = False  # Fresh load
         thread = threading.Thread(target=self._fetch_artist, args=(channel_id,))
         thread.daemon = True
         thread.start()
 
     def _fetch_artist(self, channel_id):
-        try:
-            self._artist_data = self.client.get_artist(channel_id)
+        # A newer load_artist may have replaced this one in the meantime
+        def apply(data):
+            if self.channel_id == channel_id:
+                self.update_ui(data)
 
-            # Deep fetch sections that are usually truncated (Albums, Singles, EPs)
-            # This ensures we get high-quality metadata (year, type, explicit) from the start.
-            detail_threads = []
+        def on_miss():
+            if self.channel_id == channel_id:
+                self.stack.set_visible_child_name("loading")
 
-            def detail_fetch(key, browse_id, params):
-                try:
-                    # Limit to 10 for the initial view as requested
-                    detailed_items = self.client.get_artist_albums(
-                        browse_id, params, limit=10
+        try:
+            # Render the cached page at once and refresh it in the background
+            stale_while_revalidate(
+                self.client,
+                lambda: self._fetch_artist_data(channel_id),
+                apply,
+                on_miss,
+            )
+        except Exception as e:
+            print(f"Error fetching artist: {e}")
+
+    def _fetch_artist_data(self, channel_id):
+        """get_artist plus the deep-fetched sections; runs on a worker thread."""
+        artist_data = self.client.get_artist(channel_id)
+        if not artist_data:
+            return None
+        # Deep fetches run on their own threads but share our cache policy,
+        # and never outrank visible work
+        cache_policy = self.client.get_cache_policy()
+        priority = max(get_scheduler().get_priority(), VISIBLE)
+
+        # Deep fetch sections that are usually truncated (Albums, Singles, EPs)
+        # This ensures we get high-quality metadata (year, type, explicit) from the start.
+        detail_threads = []
+
+        def detail_fetch(key, browse_id, params):
+            try:
+                # Limit to 10 for the initial view as requested
+                detailed_items = self.client.get_artist_albums(
+                    browse_id, params, limit=10
+                )
+                if detailed_items:
+                    # Merge into artist_data
+                    artist_data[key]["results"] = detailed_items
+            except Exception as e:
+                print(f"Error deep fetching {key}: {e}")
+
+        for key in ["songs", "albums", "singles"]:
+            if key in artist_data and isinstance(artist_data[key], dict):
+                section = artist_data[key]
+                b_id = section.get("browseId")
+                p_params = section.get("params")
+                if b_id:
+                    # For songs, we use get_playlist to get the full list
+                    fetch_target = (
+                        self.client.get_playlist if key == "songs" else detail_fetch
                     )
-                    if detailed_items:
-                        # Merge into _artist_data
-                        self._artist_data[key]["results"] = detailed_items
-                except Exception as e:
-                    print(f"Error deep fetching {key}: {e}")
-
-            for key in ["songs", "albums", "singles"]:
-                if key in self._artist_data and isinstance(
-                    self._artist_data[key], dict
-                ):
-                    section = self._artist_data[key]
-                    b_id = section.get("browseId")
-                    p_params = section.get("params")
-                    if b_id:
-                        # For songs, we use get_playlist to get the full list
-                        fetch_target = (
-                            self.client.get_playlist if key == "songs" else detail_fetch
-                        )
-                        target_args = (
-                            (b_id,) if key == "songs" else (key, b_id, p_params)
-                        )
-
-                        def wrap_fetch(k=key, ft=fetch_target, ta=target_args):
-                            try:
+                    target_args = (b_id,) if key == "songs" else (key, b_id, p_params)
+
+                    def wrap_fetch(k=key, ft=fetch_target, ta=target_args):
+                        try:
+                            with self.client.cache_policy(
+                                cache_policy
+                            ), request_priority(priority):
                                 if k == "songs":
                                     res = ft(ta[0])
                                     if res and res.get("tracks"):
-                                        self._artist_data[k]["results"] = res["tracks"]
+                                        artist_data[k]["results"] = res["tracks"]
                                 else:
                                     ft(*ta)
-                            except Exception as ex:
-                                print(f"Error deep fetching {k}: {ex}")
+                        except Exception as ex:
+                            print(f"Error deep fetching {k}: {ex}")
 
-                        t = threading.Thread(target=wrap_fetch)
-                        t.daemon = True
-                        t.start()
-                        detail_threads.append(t)
+                    t = threading.Thread(target=wrap_fetch)
+                    t.daemon = True
+                    t.start()
+                    detail_threads.append(t)
 
-            # Wait for all deep fetches to complete (timed out)
-            for t in detail_threads:
-                t.join(timeout=10.0)  # Generous timeout for multiple deep fetches
+        # Wait for all deep fetches to complete (timed out)
+        for t in detail_threads:
+            t.join(timeout=10.0)  # Generous timeout for multiple deep fetches
 
-            self._is_ui_init = False  # Fresh load
-            GLib.idle_add(self.update_ui, self._artist_data)
-        except Exception as e:
-            print(f"Error fetching artist: {e}")
+        return artist_data
 
     def update_ui(self, data):
         if not data:
             return
 
+        self._artist_data = data
         self.stack.set_visible_child_name("content")
 
         # Header
@@ -340,6 +371,7 @@ class ArtistPage(Adw.Bin):
         is_refresh = getattr(self, "_is_ui_init", False)
         if not is_refresh:
             self._section_widgets = {}
+            self._section_snapshots = {}
             child = self.sections_box.get_first_child()
             while child:
                 next_child = child.get_next_sibling()
@@ -363,9 +395,21 @@ class ArtistPage(Adw.Bin):
         if "videos" in data:
             self.add_grid_section("Videos", data["videos"])
 
+    def _section_unchanged(self, title, section_dict):
+        """True if title already shows exactly this data at its current limit."""
+        snapshot = (
+            json.dumps(section_dict, sort_keys=True, default=str),
+            self._section_limits.get(title),
+        )
+        if title in self._section_widgets:
+            if self._section_snapshots.get(title) == snapshot:
+                return True
+        self._section_snapshots[title] = snapshot
+        return False
+
     def add_songs_section(self, title, section_dict):
         items = section_dict.get("results", [])
-        if not items:
+        if not items or self._section_unchanged(title, section_dict):
             return
         self.current_songs = items  # Store for queue
         if title in self._section_widgets:
@@ -590,7 +634,7 @@ class ArtistPage(Adw.Bin):
 
     def add_grid_section(self, title, section_dict):
         items = section_dict.get("results", [])
-        if not items:
+        if not items or self._section_unchanged(title, section_dict):
             return
 
         if title in self._section_widgets:
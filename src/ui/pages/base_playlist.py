@@ -137,6 +137,7 @@ class BasePlaylistPage(Adw.Bin):
 
         self.more_menu_model = Gio.Menu()
         self.playlist_menu = Gio.Menu()
+        self._playlist_menu_generation = 0
         # The following will be populated by _refresh_more_menu()
         self.more_btn.set_menu_model(self.more_menu_model)
         actions_box.append(self.more_btn)
@@ -307,18 +308,36 @@ class BasePlaylistPage(Adw.Bin):
     def _refresh_more_menu(self):
         self.more_menu_model.remove_all()
         # 1. Add All to Playlist Submenu
+        self._load_playlist_menu()
+        self.more_menu_model.append_submenu("Add all to Playlist", self.playlist_menu)
+
+        # 2. Copy Link (Always shown)
+        self.more_menu_model.append("Copy Link", "page.copy_link")
+
+    def _load_playlist_menu(self):
+        """
+        Fills the Add all to Playlist submenu from a worker: the first call
+        fetches the library, which can wait out a rate-limit backoff.
+        """
+        self._playlist_menu_generation += 1
+        generation = self._playlist_menu_generation
+
+        def thread_func():
+            playlists = self.client.get_editable_playlists()
+            GLib.idle_add(self._fill_playlist_menu, generation, playlists)
+
+        threading.Thread(target=thread_func, daemon=True).start()
+
+    def _fill_playlist_menu(self, generation, playlists):
+        if generation != self._playlist_menu_generation:
+            return False
         self.playlist_menu.remove_all()
-        playlists = self.client.get_editable_playlists()
         for p in playlists:
             title = p.get("title", "Untitled")
             pid = p.get("playlistId")
             if pid:
                 self.playlist_menu.append(title, f"page.add_all_to_playlist('{pid}')")
-
-        self.more_menu_model.append_submenu("Add all to Playlist", self.playlist_menu)
-
-        # 2. Copy Link (Always shown)
-        self.more_menu_model.append("Copy Link", "page.copy_link")
+        return False
 
     def _on_add_all_to_playlist(self, action, param):
         playlist_id = param.get_string()
@@ -1,6 +1,7 @@
 from gi.repository import Gtk, Adw, GObject, GLib, Gdk, Gio, Pango
 import threading
 from api.client import MusicClient
+from ui.utils import stale_while_revalidate, sync_keyed_children
 
 
 class LibraryPage(Adw.Bin):
@@ -132,161 +133,156 @@ class LibraryPage(Adw.Bin):
         thread.start()
 
     def _fetch_library(self):
-        try:
-            # Only show loading UI if we have no data at all
-            if self.playlists_list.get_row_at_index(0) is None:
-                GLib.idle_add(self.stack.set_visible_child_name, "loading")
-
+        def fetch():
             playlists = self.client.get_library_playlists()
             artists = self.client.get_library_subscriptions()
+            # A cache-only pass may find one half; don't render the other as empty
+            if playlists is None or artists is None:
+                return None
+            return {"playlists": playlists or [], "artists": artists or []}
 
-            GObject.idle_add(self.update_playlists, playlists if playlists else [])
-            GObject.idle_add(self.update_artists, artists if artists else [])
-            GLib.idle_add(self.stack.set_visible_child_name, "root")
+        def on_miss():
+            # Only show loading UI if we have no data at all
+            if self.playlists_list.get_row_at_index(0) is None:
+                self.stack.set_visible_child_name("loading")
+
+        try:
+            # Last known library first, then whatever changed since
+            stale_while_revalidate(self.client, fetch, self._apply_library, on_miss)
+        except Exception as e:
+            print(f"Error fetching library: {e}")
         finally:
+            GLib.idle_add(self.stack.set_visible_child_name, "root")
             self._is_loading = False
 
+    def _apply_library(self, library):
+        self.update_playlists(library["playlists"])
+        self.update_artists(library["artists"])
+        self.stack.set_visible_child_name("root")
+
     def update_playlists(self, playlists):
         # Sort: 2-letter IDs first (Automatic Playlists like LM, SE, etc.)
         def sort_key(p):
             pid = p.get("playlistId", "")
             return 0 if len(pid) == 2 else 1
 
-        playlists.sort(key=sort_key)
-
-        # 1. Map existing rows by playlist_id
-        existing_rows = {}
-        row = self.playlists_list.get_row_at_index(0)
-        # ... (mapping logic remains same, but we can't easily skip lines in replacement without copying)
-        # Let's just copy the mapping part briefly or assume it exists if I don't change it?
-        # No, I must provide contiguous block.
-
-        while row:
-            if hasattr(row, "playlist_id"):
-                existing_rows[row.playlist_id] = row
-            row = row.get_next_sibling()
-
-        processed_ids = set()
-
-        for i, p in enumerate(playlists):
-            p_id = p.get("playlistId")
-            title = p.get("title", "Unknown")
-            count = p.get("count")
-            if not count:
-                count = p.get("itemCount", "")
-
-            thumbnails = p.get("thumbnails", [])
-            thumb_url = thumbnails[-1]["url"] if thumbnails else None
-
-            processed_ids.add(p_id)
-
-            # Subtitle Logic
-            subtitle = ""
-            if len(p_id) == 2:
-                subtitle = "Automatic Playlist"
-                if count:
-                    c_str = str(count)
-                    if "songs" not in c_str:
-                        c_str += " songs"
-                    subtitle += f" • {c_str}"
-            elif count:
-                subtitle = f"{count} songs" if "songs" not in str(count) else str(count)
-
-            row = existing_rows.get(p_id)
-
-            if row:
-                # Update existing
-                box = row.get_child()
-                if row.playlist_title != title:
-                    row.playlist_title = title
-                    box._title_label.set_label(title)
-
-                box._subtitle_label.set_label(subtitle)
-                row.playlist_count = count  # store raw count
-                row.is_owned = self.client.is_own_playlist(p, playlist_id=p_id)
-
-                # Image
-                if hasattr(row, "cover_img"):
-                    if row.cover_img.url != thumb_url:
-                        row.cover_img.load_url(thumb_url)
-
-                # Reordering
-                current_idx = row.get_index()
-                if current_idx != i:
-                    self.playlists_list.remove(row)
-                    self.playlists_list.insert(row, i)
-
-            else:
-                # Create New
-                row = Gtk.ListBoxRow()
-                box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
-                box.add_css_class("song-row")
-                row.set_child(box)
-
-                from ui.utils import AsyncPicture
-
-                img = AsyncPicture(
-                    url=thumb_url,
-                    target_size=44,
-                    crop_to_square=True,
-                    player=self.player,
-                )
-                img.add_css_class("song-img")
-                if not thumb_url:
-                    img.set_from_icon_name("media-playlist-audio-symbolic")
-
-                box.append(img)
-                row.cover_img = img
-
-                vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=2)
-                vbox.set_valign(Gtk.Align.CENTER)
-                vbox.set_hexpand(True)
-
-                title_label = Gtk.Label(label=title)
-                title_label.set_halign(Gtk.Align.START)
-                title_label.set_ellipsize(Pango.EllipsizeMode.END)
-                title_label.set_lines(1)
-                box._title_label = title_label
-
-                subtitle_label = Gtk.Label(label=subtitle)
-                subtitle_label.set_halign(Gtk.Align.START)
-                subtitle_label.set_ellipsize(Pango.EllipsizeMode.END)
-                subtitle_label.set_lines(1)
-                subtitle_label.add_css_class("dim-label")
-                subtitle_label.add_css_class("caption")
-                box._subtitle_label = subtitle_label
-
-                vbox.append(title_label)
-                vbox.append(subtitle_label)
-                box.append(vbox)
-
-                row.playlist_id = p_id
-                row.playlist_title = title
-                row.playlist_count = count
-                row.is_owned = self.client.is_own_playlist(p, playlist_id=p_id)
-                row.set_activatable(True)
-
-                # Context Menu
-                gesture = Gtk.GestureClick()
-                gesture.set_button(3)
-                gesture.connect("released", self.on_row_right_click, row)
-                row.add_controller(gesture)
-
-                # Long Press for touch
-                lp = Gtk.GestureLongPress()
-                lp.connect(
-                    "pressed",
-                    lambda g, x, y, r=row: self.on_row_right_click(g, 1, x, y, r),
-                )
-                row.add_controller(lp)
-
-                self.playlists_list.insert(row, i)
+        playlists = sorted(playlists, key=sort_key)
+        sync_keyed_children(
+            self.playlists_list,
+            playlists,
+            key=lambda p: p.get("playlistId"),
+            create=self._create_playlist_row,
+            update=self._update_playlist_row,
+        )
 
-        # Identify and remove stale rows (those in existing_rows but not in processed_ids).
-        # Moved widgets are kept safe by processed_ids check.
-        for p_id, row in existing_rows.items():
-            if p_id not in processed_ids:
-                self.playlists_list.remove(row)
+    def _playlist_row_fields(self, p):
+        """(title, subtitle, thumb_url, count) shown for a library playlist."""
+        p_id = p.get("playlistId")
+        title = p.get("title", "Unknown")
+        count = p.get("count")
+        if not count:
+            count = p.get("itemCount", "")
+
+        thumbnails = p.get("thumbnails", [])
+        thumb_url = thumbnails[-1]["url"] if thumbnails else None
+
+        # Subtitle Logic
+        subtitle = ""
+        if len(p_id) == 2:
+            subtitle = "Automatic Playlist"
+            if count:
+                c_str = str(count)
+                if "songs" not in c_str:
+                    c_str += " songs"
+                subtitle += f" • {c_str}"
+        elif count:
+            subtitle = f"{count} songs" if "songs" not in str(count) else str(count)
+        return title, subtitle, thumb_url, count
+
+    def _update_playlist_row(self, row, p):
+        p_id = p.get("playlistId")
+        title, subtitle, thumb_url, count = self._playlist_row_fields(p)
+
+        box = row.get_child()
+        if row.playlist_title != title:
+            row.playlist_title = title
+            box._title_label.set_label(title)
+
+        box._subtitle_label.set_label(subtitle)
+        row.playlist_count = count  # store raw count
+        row.is_owned = self.client.is_own_playlist(p, playlist_id=p_id)
+
+        # Image
+        if hasattr(row, "cover_img"):
+            if row.cover_img.url != thumb_url:
+                row.cover_img.load_url(thumb_url)
+
+    def _create_playlist_row(self, p):
+        p_id = p.get("playlistId")
+        title, subtitle, thumb_url, count = self._playlist_row_fields(p)
+
+        row = Gtk.ListBoxRow()
+        box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
+        box.add_css_class("song-row")
+        row.set_child(box)
+
+        from ui.utils import AsyncPicture
+
+        img = AsyncPicture(
+            url=thumb_url,
+            target_size=44,
+            crop_to_square=True,
+            player=self.player,
+        )
+        img.add_css_class("song-img")
+        if not thumb_url:
+            img.set_from_icon_name("media-playlist-audio-symbolic")
+
+        box.append(img)
+        row.cover_img = img
+
+        vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=2)
+        vbox.set_valign(Gtk.Align.CENTER)
+        vbox.set_hexpand(True)
+
+        title_label = Gtk.Label(label=title)
+        title_label.set_halign(Gtk.Align.START)
+        title_label.set_ellipsize(Pango.EllipsizeMode.END)
+        title_label.set_lines(1)
+        box._title_label = title_label
+
+        subtitle_label = Gtk.Label(label=subtitle)
+        subtitle_label.set_halign(Gtk.Align.START)
+        subtitle_label.set_ellipsize(Pango.EllipsizeMode.END)
+        subtitle_label.set_lines(1)
+        subtitle_label.add_css_class("dim-label")
+        subtitle_label.add_css_class("caption")
+        box._subtitle_label = subtitle_label
+
+        vbox.append(title_label)
+        vbox.append(subtitle_label)
+        box.append(vbox)
+
+        row.playlist_id = p_id
+        row.playlist_title = title
+        row.playlist_count = count
+        row.is_owned = self.client.is_own_playlist(p, playlist_id=p_id)
+        row.set_activatable(True)
+
+        # Context Menu
+        gesture = Gtk.GestureClick()
+        gesture.set_button(3)
+        gesture.connect("released", self.on_row_right_click, row)
+        row.add_controller(gesture)
+
+        # Long Press for touch
+        lp = Gtk.GestureLongPress()
+        lp.connect(
+            "pressed",
+            lambda g, x, y, r=row: self.on_row_right_click(g, 1, x, y, r),
+        )
+        row.add_controller(lp)
+        return row
 
     def on_row_right_click(self, gesture, n_press, x, y, row):
         if not hasattr(row, "playlist_id"):
@@ -451,104 +447,89 @@ class LibraryPage(Adw.Bin):
         threading.Thread(target=thread_func, daemon=True).start()
 
     def update_artists(self, artists):
-        # 1. Map existing rows by browse_id
-        existing_rows = {}
-        row = self.artists_list.get_row_at_index(0)
-        while row:
-            if hasattr(row, "artist_id"):
-                existing_rows[row.artist_id] = row
-            row = row.get_next_sibling()
-
-        processed_ids = set()
-
-        for i, a in enumerate(artists):
-            a_id = a.get("browseId")
-            name = a.get("artist", "Unknown")
-            subscribers = a.get("subscribers", "")
-            if subscribers and "subscribers" not in subscribers.lower():
-                subscribers = f"{subscribers} subscribers"
-
-            thumbnails = a.get("thumbnails", [])
-            thumb_url = thumbnails[-1]["url"] if thumbnails else None
-
-            processed_ids.add(a_id)
-
-            row = existing_rows.get(a_id)
-
-            if row:
-                # Update existing
-                box = row.get_child()
-                if row.artist_name != name:
-                    row.artist_name = name
-                    box._title_label.set_label(name)
-
-                box._subtitle_label.set_label(subscribers)
-
-                # Image
-                if hasattr(row, "cover_img"):
-                    if row.cover_img.url != thumb_url:
-                        row.cover_img.load_url(thumb_url)
-
-                # Reordering
-                current_idx = row.get_index()
-                if current_idx != i:
-                    self.artists_list.remove(row)
-                    self.artists_list.insert(row, i)
+        sync_keyed_children(
+            self.artists_list,
+            artists,
+            key=lambda a: a.get("browseId"),
+            create=self._create_artist_row,
+            update=self._update_artist_row,
+        )
 
-            else:
-                # Create New
-                row = Gtk.ListBoxRow()
-                box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
-                box.add_css_class("song-row")
-                row.set_child(box)
-
-                from ui.utils import AsyncPicture
-
-                img = AsyncPicture(
-                    url=thumb_url,
-                    target_size=44,
-                    crop_to_square=True,
-                    player=self.player,
-                )
-                img.add_css_class("song-img")
-                if not thumb_url:
-                    img.set_from_icon_name("avatar-default-symbolic")
-
-                box.append(img)
-                row.cover_img = img
-
-                vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=2)
-                vbox.set_valign(Gtk.Align.CENTER)
-                vbox.set_hexpand(True)
-
-                title_label = Gtk.Label(label=name)
-                title_label.set_halign(Gtk.Align.START)
-                title_label.set_ellipsize(Pango.EllipsizeMode.END)
-                title_label.set_lines(1)
-                box._title_label = title_label
-
-                subtitle_label = Gtk.Label(label=subscribers)
-                subtitle_label.set_halign(Gtk.Align.START)
-                subtitle_label.set_ellipsize(Pango.EllipsizeMode.END)
-                subtitle_label.set_lines(1)
-                subtitle_label.add_css_class("dim-label")
-                subtitle_label.add_css_class("caption")
-                box._subtitle_label = subtitle_label
-
-                vbox.append(title_label)
-                vbox.append(subtitle_label)
-                box.append(vbox)
-
-                row.artist_id = a_id
-                row.artist_name = name
-                row.set_activatable(True)
-
-                self.artists_list.insert(row, i)
-
-        # Remove stale
-        for a_id, row in existing_rows.items():
-            if a_id not in processed_ids:
-                self.artists_list.remove(row)
+    def _artist_row_fields(self, a):
+        """(name, subtitle, thumb_url) shown for a subscribed artist."""
+        name = a.get("artist", "Unknown")
+        subscribers = a.get("subscribers", "")
+        if subscribers and "subscribers" not in subscribers.lower():
+            subscribers = f"{subscribers} subscribers"
+
+        thumbnails = a.get("thumbnails", [])
+        thumb_url = thumbnails[-1]["url"] if thumbnails else None
+        return name, subscribers, thumb_url
+
+    def _update_artist_row(self, row, a):
+        name, subscribers, thumb_url = self._artist_row_fields(a)
+
+        box = row.get_child()
+        if row.artist_name != name:
+            row.artist_name = name
+            box._title_label.set_label(name)
+
+        box._subtitle_label.set_label(subscribers)
+
+        # Image
+        if hasattr(row, "cover_img"):
+            if row.cover_img.url != thumb_url:
+                row.cover_img.load_url(thumb_url)
+
+    def _create_artist_row(self, a):
+        name, subscribers, thumb_url = self._artist_row_fields(a)
+
+        row = Gtk.ListBoxRow()
+        box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
+        box.add_css_class("song-row")
+        row.set_child(box)
+
+        from ui.utils import AsyncPicture
+
+        img = AsyncPicture(
+            url=thumb_url,
+            target_size=44,
+            crop_to_square=True,
+            player=self.player,
+        )
+        img.add_css_class("song-img")
+        if not thumb_url:
+            img.set_from_icon_name("avatar-default-symbolic")
+
+        box.append(img)
+        row.cover_img = img
+
+        vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=2)
+        vbox.set_valign(Gtk.Align.CENTER)
+        vbox.set_hexpand(True)
+
+        title_label = Gtk.Label(label=name)
+        title_label.set_halign(Gtk.Align.START)
+        title_label.set_ellipsize(Pango.EllipsizeMode.END)
+        title_label.set_lines(1)
+        box._title_label = title_label
+
+        subtitle_label = Gtk.Label(label=subscribers)
+        subtitle_label.set_halign(Gtk.Align.START)
+        subtitle_label.set_ellipsize(Pango.EllipsizeMode.END)
+        subtitle_label.set_lines(1)
+        subtitle_label.add_css_class("dim-label")
+        subtitle_label.add_css_class("caption")
+        box._subtitle_label = subtitle_label
+
+        vbox.append(title_label)
+        vbox.append(subtitle_label)
+        box.append(vbox)
+
+        row.artist_id = a.get("browseId")
+        row.artist_name = name
+        row.set_activatable(True)
+        return row
 
     def on_artist_activated(self, box, row):
         if hasattr(row, "artist_id"):
@@ -3,6 +3,8 @@ import os
 import tempfile
 from gi.repository import Gtk, Adw, GObject, GLib, Pango, Gdk, Gio, GdkPixbuf
 from api.client import MusicClient
+from api.scheduler import BACKGROUND, request_priority
+from player.queue_feed import QueueFeeder
 from ui.utils import AsyncImage, LikeButton, get_yt_music_link
 from ui.crop_dialog import ImageCropDialog
 
@@ -155,6 +157,7 @@ class PlaylistPage(Adw.Bin):
 
         self.more_menu_model = Gio.Menu()
         self.playlist_menu = Gio.Menu()
+        self._playlist_menu_generation = 0
         self.more_btn.set_menu_model(self.more_menu_model)
         actions_box.append(self.more_btn)
 
@@ -289,7 +292,8 @@ class PlaylistPage(Adw.Bin):
         self.set_child(self.stack)
 
         self.current_tracks = []
-        self.current_limit = 50
+        self._track_pager = None  # Continuation cursor of the shown playlist
+        self._total_tracks = None
         self.is_loading_more = False
         self.current_filter_text = ""
 
@@ -616,17 +620,53 @@ class PlaylistPage(Adw.Bin):
         if getattr(self, "is_fully_loaded", False):
             return
 
+        pager = self._track_pager
+        if pager is None or pager.exhausted:
+            self.is_fully_loaded = True
+            return
+
         self.is_loading_more = True
         self.load_more_spinner.set_visible(True)
-        self.current_limit = len(self.current_tracks) + 50
-        print(f"Loading more... Limit now {self.current_limit}")
+        print(f"Loading page {pager.pages + 1} ({len(self.current_tracks)} shown)")
 
-        thread = threading.Thread(
-            target=self._fetch_playlist_details, args=(self.playlist_id, True)
-        )
+        thread = threading.Thread(target=self._fetch_next_page, args=(pager,))
         thread.daemon = True
         thread.start()
 
+    def _fetch_next_page(self, pager):
+        try:
+            tracks = pager.next_page()
+        except Exception as e:
+            print(f"Error loading next page: {e}")
+            tracks = None
+        GObject.idle_add(self._append_page, pager, tracks)
+
+    def _append_page(self, pager, tracks):
+        self.load_more_spinner.set_visible(False)
+        self.is_loading_more = False
+        if pager is not self._track_pager or tracks is None:
+            # Another playlist is shown now, or the page failed (retried on scroll)
+            return
+
+        if pager.exhausted:
+            print(f"Playlist fully loaded ({pager.count} tracks)")
+            self.is_fully_loaded = True
+        if not tracks:
+            return
+
+        print(f"Appending {len(tracks)} new tracks (Total: {pager.count})")
+        originals = getattr(self, "original_tracks", None)
+        # original_tracks may already hold the background full fetch
+        if originals is not None and len(originals) == len(self.current_tracks):
+            originals.extend(tracks)
+        self.current_tracks.extend(tracks)
+
+        if self.sort_dropdown.get_selected() != 0:
+            self.reorder_playlist(self.sort_dropdown.get_selected())
+        else:
+            for t in tracks:
+                self._add_track_row(t)
+
     def _on_map(self, widget):
         if hasattr(self, "vadjust"):
             if self.vadjust.get_value() > 50:
@@ -639,14 +679,7 @@ class PlaylistPage(Adw.Bin):
         self.more_menu_model.remove_all()
 
         # 1. Add All to Playlist Submenu
-        self.playlist_menu.remove_all()
-        playlists = self.client.get_editable_playlists()
-        for p in playlists:
-            title = p.get("title", "Untitled")
-            pid = p.get("playlistId")
-            if pid:
-                self.playlist_menu.append(title, f"page.add_all_to_playlist('{pid}')")
-
+        self._load_playlist_menu()
         self.more_menu_model.append_submenu("Add all to Playlist", self.playlist_menu)
 
         # 2. Copy Link (Always shown)
@@ -657,6 +690,31 @@ class PlaylistPage(Adw.Bin):
             self.more_menu_model.append("Edit Playlist", "page.edit")
             self.more_menu_model.append("Delete Playlist", "page.delete")
 
+    def _load_playlist_menu(self):
+        """
+        Fills the Add all to Playlist submenu from a worker: the first call
+        fetches the library, which can wait out a rate-limit backoff.
+        """
+        self._playlist_menu_generation += 1
+        generation = self._playlist_menu_generation
+
+        def thread_func():
+            playlists = self.client.get_editable_playlists()
+            GLib.idle_add(self._fill_playlist_menu, generation, playlists)
+
+        threading.Thread(target=thread_func, daemon=True).start()
+
+    def _fill_playlist_menu(self, generation, playlists):
+        if generation != self._playlist_menu_generation:
+            return False
+        self.playlist_menu.remove_all()
+        for p in playlists:
+            title = p.get("title", "Untitled")
+            pid = p.get("playlistId")
+            if pid:
+                self.playlist_menu.append(title, f"page.add_all_to_playlist('{pid}')")
+        return False
+
     def _on_add_all_to_playlist(self, action, param):
         playlist_id = param.get_string()
         video_ids = [t.get("videoId") for t in self.current_tracks if t.get("videoId")]
@@ -689,7 +747,8 @@ class PlaylistPage(Adw.Bin):
         if self.playlist_id != playlist_id:
             self.playlist_id = playlist_id
             self.playlist_title_text = ""
-            self.current_limit = 50
+            self._track_pager = None
+            self._total_tracks = None
             self.emit("header-title-changed", "")
             self.current_tracks = []
             self._is_previewing_cover = False
@@ -752,7 +811,7 @@ class PlaylistPage(Adw.Bin):
 
     # ── Fetch ─────────────────────────────────────────────────────────────────
 
-    def _fetch_playlist_details(self, playlist_id, is_incremental=False):
+    def _fetch_playlist_details(self, playlist_id):
         try:
             if playlist_id.startswith("OLAK"):
                 try:
@@ -765,9 +824,12 @@ class PlaylistPage(Adw.Bin):
 
             count_str = None
             album_type = None
+            pager = None
 
             if playlist_id == "LM":
-                data = self.client.get_liked_songs(limit=self.current_limit)
+                pager = self.client.get_track_pager(playlist_id)
+                pager.next_page()
+                data = pager.playlist
                 title = "Your Likes"
                 description = "Your liked songs from YouTube Music."
                 tracks = data.get("tracks", []) if isinstance(data, dict) else data
@@ -848,17 +910,15 @@ class PlaylistPage(Adw.Bin):
                     return
             else:
                 try:
-                    print(
-                        f"Fetching playlist: {playlist_id} (Limit: {self.current_limit})"
-                    )
+                    print(f"Fetching playlist: {playlist_id} (first page)")
 
                     # retry for brand new playlists (eventual consistency)
                     data = None
                     for attempt in range(3):
                         try:
-                            data = self.client.get_playlist(
-                                playlist_id, limit=self.current_limit
-                            )
+                            pager = self.client.get_track_pager(playlist_id)
+                            pager.next_page()
+                            data = pager.playlist
                             if data and data.get("title"):
                                 break
                         except Exception as e:
@@ -939,6 +999,7 @@ class PlaylistPage(Adw.Bin):
                 except Exception as e:
                     print(f"Error processing playlists: {e}")
                     data = {}
+                    pager = None
                     title = "Error Loading Playlist"
                     description = str(e)
                     tracks = []
@@ -1004,16 +1065,12 @@ class PlaylistPage(Adw.Bin):
                 meta2,
                 thumbnails,
                 tracks,
-                is_incremental,
                 track_count,
                 is_owned,
+                pager,
             )
 
-            if (
-                not is_incremental
-                and track_count is not None
-                and len(tracks) < track_count
-            ):
+            if track_count is not None and len(tracks) < track_count:
                 if not self.playlist_id.startswith(
                     "MPRE"
                 ) and not self.playlist_id.startswith("OLAK"):
@@ -1034,9 +1091,9 @@ class PlaylistPage(Adw.Bin):
         meta2,
         thumbnails,
         tracks,
-        append=False,
         total_tracks=None,
         is_owned=False,
+        pager=None,
     ):
         self.stack.set_visible_child_name("content")
         self.content_spinner.set_visible(False)
@@ -1070,7 +1127,7 @@ class PlaylistPage(Adw.Bin):
         # Dynamically rebuild the menu to show/hide Edit/Delete
         self._refresh_more_menu(is_owned=is_editable)
 
-        if thumbnails and not append:
+        if thumbnails:
             url = thumbnails[-1]["url"]
             if self.cover_img.url != url:
                 self._is_previewing_cover = False
@@ -1080,54 +1137,22 @@ class PlaylistPage(Adw.Bin):
                 self.cover_img.set_from_icon_name("media-playlist-audio-symbolic")
                 self.cover_img.url = None
 
-        if append:
-            start_index = len(self.current_tracks)
-            new_tracks = tracks[start_index:]
-
-            if not new_tracks:
-                print("No new tracks found. Playlist fully loaded.")
-                self.is_fully_loaded = True
-                self.load_more_spinner.set_visible(False)
-                self.is_loading_more = False
-                return
-
-            print(f"Appending {len(new_tracks)} new tracks (Total: {len(tracks)})")
-            self.current_tracks.extend(new_tracks)
-            if hasattr(self, "original_tracks"):
-                self.original_tracks.extend(new_tracks)
-
-            if self.sort_dropdown.get_selected() != 0:
-                self.reorder_playlist(self.sort_dropdown.get_selected())
-            else:
-                for t in new_tracks:
-                    self._add_track_row(t)
-
-            self.load_more_spinner.set_visible(False)
-            self.is_loading_more = False
-
-            if len(tracks) < self.current_limit:
-                print(
-                    f"Playlist fully loaded ({len(tracks)} < limit {self.current_limit})"
-                )
-                self.is_fully_loaded = True
-            elif total_tracks is not None and len(tracks) >= total_tracks:
-                print(f"Playlist fully loaded ({len(tracks)} >= total {total_tracks})")
-                self.is_fully_loaded = True
-        else:
-            self.is_fully_loaded = False
-            if total_tracks is not None and len(tracks) >= total_tracks:
-                self.is_fully_loaded = True
-                self.is_fully_fetched = True
-                self.client.set_cached_playlist_tracks(self.playlist_id, tracks)
+        self._track_pager = pager
+        self._total_tracks = total_tracks
+        self.is_fully_loaded = pager is not None and pager.exhausted
+        if total_tracks is not None and len(tracks) >= total_tracks:
+            self.is_fully_loaded = True
+            self.is_fully_fetched = True
+            self.client.set_cached_playlist_tracks(self.playlist_id, tracks)
 
-            self.current_tracks = list(tracks)
-            if not hasattr(self, "original_tracks") or not self.original_tracks:
-                self.original_tracks = list(tracks)
-            self.sort_dropdown.set_selected(0)
+        self.current_tracks = list(tracks)
+        if not hasattr(self, "original_tracks") or not self.original_tracks:
+            self.original_tracks = list(tracks)
+        self.sort_dropdown.set_selected(0)
 
-            self._clear_track_store()
-            for t in tracks:
-                self._add_track_row(t)
+        self._clear_track_store()
+        for t in tracks:
+            self._add_track_row(t)
 
         if len(self.current_tracks) > 0 and len(self.current_tracks) == len(
             getattr(self, "original_tracks", [])
@@ -1139,42 +1164,42 @@ class PlaylistPage(Adw.Bin):
     def _start_background_full_fetch(self):
         if getattr(self, "is_fully_fetched", False):
             return
-        print(f"Starting background fetch for full playlist: {self.playlist_id}")
+        playlist_id = self.playlist_id
+        print(f"Starting background fetch for full playlist: {playlist_id}")
 
         def fetch_job():
+            tracks = []
             try:
-                data = self.client.get_playlist(self.playlist_id, limit=5000)
-                tracks = data.get("tracks", [])
-                if tracks:
-                    print(f"Background fetch complete. Fetched {len(tracks)} tracks.")
-                    self.original_tracks = tracks
-                    self.client.set_cached_playlist_tracks(self.playlist_id, tracks)
-                    GObject.idle_add(self._on_background_fetch_complete)
+                with request_priority(BACKGROUND):
+                    for page in self.client.get_track_pager(playlist_id):
+                        if self.playlist_id != playlist_id:
+                            print(f"Background fetch cancelled for {playlist_id}")
+                            return
+                        tracks.extend(page)
             except Exception as e:
                 print(f"Error in background fetch: {e}")
+                return
+            if tracks:
+                print(f"Background fetch complete. Fetched {len(tracks)} tracks.")
+                self.client.set_cached_playlist_tracks(playlist_id, tracks)
+                GObject.idle_add(
+                    self._on_background_fetch_complete, playlist_id, tracks
+                )
 
-        self._is_background_fetching = True
-        self._pending_queue_append = False
         thread = threading.Thread(target=fetch_job)
         thread.daemon = True
         thread.start()
 
-    def _on_background_fetch_complete(self):
+    def _on_background_fetch_complete(self, playlist_id, tracks):
+        if self.playlist_id != playlist_id:
+            return
+        self.original_tracks = tracks
         self.is_fully_fetched = True
-        self._is_background_fetching = False
 
         if self.sort_dropdown.get_selected() != 0:
             self.current_tracks = list(self.original_tracks)
             self.reorder_playlist(self.sort_dropdown.get_selected())
 
-        if getattr(self, "_pending_queue_append", False):
-            print("Background fetch complete, extending player queue.")
-            start_index = len(self.current_tracks)
-            new_tracks = self.original_tracks[start_index:]
-            if new_tracks:
-                self.player.extend_queue(new_tracks)
-            self._pending_queue_append = False
-
     # ── Song activation ───────────────────────────────────────────────────────
 
     def on_copy_link_clicked(self, btn):
@@ -1215,8 +1240,7 @@ class PlaylistPage(Adw.Bin):
             source_id=self.playlist_id,
             is_infinite=self._is_inf(),
         )
-        if getattr(self, "_is_background_fetching", False):
-            self._pending_queue_append = True
+        self._fetch_remaining_for_queue(tracks_to_queue)
 
     # ── Sort ──────────────────────────────────────────────────────────────────
 
@@ -1400,15 +1424,15 @@ class PlaylistPage(Adw.Bin):
         print(
             f"\033[94m[DEBUG-PLAYLIST] on_play_clicked. playlist_id={self.playlist_id}\033[0m"
         )
+        tracks = self._best_queue()
         self.player.set_queue(
-            self._best_queue(),
+            tracks,
             0,
             shuffle=False,
             source_id=self.playlist_id,
             is_infinite=self._is_inf(),
         )
-        if getattr(self, "_is_background_fetching", False):
-            self._pending_queue_append = True
+        self._fetch_remaining_for_queue(tracks)
 
     def on_shuffle_clicked(self, btn):
         if not self.current_tracks:
@@ -1416,15 +1440,15 @@ class PlaylistPage(Adw.Bin):
         print(
             f"\033[94m[DEBUG-PLAYLIST] on_shuffle_clicked. playlist_id={self.playlist_id}\033[0m"
         )
+        tracks = self._best_queue()
         self.player.set_queue(
-            self._best_queue(),
+            tracks,
             -1,
             shuffle=True,
             source_id=self.playlist_id,
             is_infinite=self._is_inf(),
         )
-        if getattr(self, "_is_background_fetching", False):
-            self._pending_queue_append = True
+        self._fetch_remaining_for_queue(tracks)
 
     def _best_queue(self):
         if (
@@ -1730,43 +1754,17 @@ class PlaylistPage(Adw.Bin):
         save_btn.connect("clicked", on_save_clicked)
         dialog.present(self.get_native())
 
-    def _fetch_remaining_for_queue(self):
-        if getattr(self, "is_fully_fetched", False):
+    def _fetch_remaining_for_queue(self, queued):
+        """
+        Streams the tracks after the queued ones into the player queue, one
+        page at a time, until the end of the playlist or a new queue.
+        """
+        total = self._total_tracks
+        if not self.playlist_id or total is None or len(queued) >= total:
             return
-        print("Fetching remaining tracks for queue...")
-
-        def fetch_job():
-            try:
-                existing_count = len(self.current_tracks)
-                data = self.client.get_playlist(self.playlist_id, limit=5000)
-                tracks = data.get("tracks", [])
-                if len(tracks) > existing_count:
-                    new_raw = tracks[existing_count:]
-                    normalized = []
-                    for t in new_raw:
-                        artist = ", ".join(
-                            a.get("name", "") for a in t.get("artists", [])
-                        )
-                        normalized.append(
-                            {
-                                "videoId": t.get("videoId"),
-                                "title": t.get("title"),
-                                "artist": artist,
-                                "thumb": t.get("thumbnails", [])[-1]["url"]
-                                if t.get("thumbnails")
-                                else None,
-                            }
-                        )
-                    if normalized:
-                        GObject.idle_add(self.player.extend_queue, normalized)
-                else:
-                    print("DEBUG: No new tracks found.")
-            except Exception as e:
-                print(f"Error fetching remaining tracks: {e}")
-
-        thread = threading.Thread(target=fetch_job)
-        thread.daemon = True
-        thread.start()
+        print(f"Streaming remaining {total - len(queued)} tracks into the queue...")
+        pager = self.client.get_track_pager(self.playlist_id)
+        QueueFeeder(self.player, pager, skip=len(queued)).start()
 
     # ── Compact mode ──────────────────────────────────────────────────────────
 
@@ -1,7 +1,13 @@
 from gi.repository import Gtk, Adw, GObject, GLib, Pango, Gio, Gdk
 import threading
 from api.client import MusicClient
-from ui.utils import AsyncPicture, LikeButton, parse_item_metadata
+from ui.utils import (
+    AsyncPicture,
+    LikeButton,
+    parse_item_metadata,
+    stale_while_revalidate,
+    sync_keyed_children,
+)
 
 
 class SearchPage(Adw.Bin):
@@ -112,12 +118,18 @@ class SearchPage(Adw.Bin):
         self.load_explore_data()
 
     def _fetch_explore(self):
-        try:
+        def fetch():
             explore = self.client.get_explore()
+            if explore is None:
+                return None
             categories = self.client.get_mood_categories()
             if categories:
                 explore["separated_categories"] = categories
-            GObject.idle_add(self.update_explore_ui, explore)
+            return explore
+
+        try:
+            # Cached explore renders at once; fresh data only touches changed sections
+            stale_while_revalidate(self.client, fetch, self.update_explore_ui)
         except Exception as e:
             print(f"Error fetching explore data: {e}")
 
@@ -125,12 +137,8 @@ class SearchPage(Adw.Bin):
         if not data:
             return
 
-        # Clear existing explore content
-        child = self.explore_box.get_first_child()
-        while child:
-            next_child = child.get_next_sibling()
-            self.explore_box.remove(child)
-            child = next_child
+        # (title, items, is_category, is_list) per section, in display order
+        sections = []
 
         # Separated categories (Moods and Genres)
         if "separated_categories" in data:
@@ -139,45 +147,49 @@ class SearchPage(Adw.Bin):
             genres = cats.get("Genres", [])
             
             if moods:
-                self.add_horizontal_section(
-                    self.explore_box, "Moods & Moments", moods, is_category=True
-                )
+                sections.append(("Moods & Moments", moods, True, False))
             
             if genres:
                 for g in genres:
                     g["is_genre"] = True
-                self.add_horizontal_section(
-                    self.explore_box, "Genres", genres, is_category=True
-                )
+                sections.append(("Genres", genres, True, False))
         elif "moods_and_genres" in data and isinstance(data["moods_and_genres"], list):
-            self.add_horizontal_section(
-                self.explore_box, "Moods & Genres", data["moods_and_genres"], is_category=True
-            )
+            sections.append(("Moods & Genres", data["moods_and_genres"], True, False))
 
         # New Releases (Albums/Singles)
         if "new_releases" in data and isinstance(data["new_releases"], list):
-            self.add_section(
-                self.explore_box, "New Albums & Singles", data["new_releases"][:10]
+            sections.append(
+                ("New Albums & Singles", data["new_releases"][:10], False, True)
             )
 
         # New Music Videos
         if "new_videos" in data and isinstance(data["new_videos"], list):
-            self.add_section(
-                self.explore_box, "New Music Videos", data["new_videos"][:5]
-            )
+            sections.append(("New Music Videos", data["new_videos"][:5], False, True))
 
         # Trending
         if "trending" in data and data["trending"] and "items" in data["trending"]:
-            self.add_section(
-                self.explore_box, "Trending", data["trending"]["items"][:5]
+            sections.append(("Trending", data["trending"]["items"][:5], False, True))
+
+        def build(section):
+            title, items, is_category, is_list = section
+            if is_list:
+                return self.add_section(None, title, items)
+            return self.add_horizontal_section(
+                None, title, items, is_category=is_category
             )
 
+        # Sections whose items didn't change keep their widgets
+        sync_keyed_children(
+            self.explore_box, sections, key=lambda section: section[0], create=build
+        )
+
     def add_horizontal_section(self, parent_box, title, items, is_category=False):
         if not items:
             return
 
         section_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
-        parent_box.append(section_box)
+        if parent_box is not None:
+            parent_box.append(section_box)
 
         label = Gtk.Label(label=title)
         label.add_css_class("heading")
@@ -215,6 +227,7 @@ class SearchPage(Adw.Bin):
 
         scroll_box.set_content(h_box)
         section_box.append(scroll_box)
+        return section_box
 
     def on_view_all_clicked(self, items, title):
         root = self.get_root()
@@ -237,7 +250,8 @@ class SearchPage(Adw.Bin):
 
         # Wrap label and listbox in a box to control spacing
         section_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
-        parent_box.append(section_box)
+        if parent_box is not None:
+            parent_box.append(section_box)
 
         label = Gtk.Label(label=title)
         label.add_css_class("heading")
@@ -362,6 +376,7 @@ class SearchPage(Adw.Bin):
             list_box.append(row)
 
         section_box.append(list_box)
+        return section_box
 
     def on_external_search(self, text):
         if self.search_timer:
@@ -26,7 +26,16 @@ class PlayerBar(Gtk.Box):
         self.scale.set_range(0, 100)
         self.scale.add_css_class("player-scale")
         self.scale.connect("change-value", self.on_scale_change_value)
+
+        # A gesture here would be cancelled once the scale's own drag gesture
+        # claims the pointer; a legacy controller still sees the release
+        self._scale_held = False
+        pointer = Gtk.EventControllerLegacy()
+        pointer.set_propagation_phase(Gtk.PropagationPhase.CAPTURE)
+        pointer.connect("event", self.on_scale_pointer_event)
+        self.scale.add_controller(pointer)
         self.append(self.scale)
+        self._tick_id = None
 
         # Scrolling to seek
         scroll_controller = Gtk.EventControllerScroll.new(
@@ -267,8 +276,24 @@ class PlayerBar(Gtk.Box):
             self.on_album_click()
 
     def on_scale_change_value(self, scale, scroll, value):
+        # Drags fire this per pointer move; the player coalesces them
         if self.player.duration > 0:
-            self.player.seek(value)
+            self.player.scrub_to(value, held=self._scale_held)
+        return False
+
+    def on_scale_pointer_event(self, controller, event):
+        # Held drags seek accurately once, on release, not whenever they pause
+        kind = event.get_event_type()
+        if kind in (Gdk.EventType.BUTTON_PRESS, Gdk.EventType.TOUCH_BEGIN):
+            self._scale_held = True
+        elif kind in (
+            Gdk.EventType.BUTTON_RELEASE,
+            Gdk.EventType.TOUCH_END,
+            Gdk.EventType.TOUCH_CANCEL,
+        ):
+            if self._scale_held:
+                self._scale_held = False
+                self.player.end_scrub()
         return False
 
     def on_scale_scroll(self, controller, dx, dy):
@@ -383,6 +408,9 @@ class PlayerBar(Gtk.Box):
             self.player.play()
 
     def on_state_changed(self, player, state):
+        if state in ("playing", "paused", "stopped"):
+            self._set_frame_ticking(state == "playing")
+
         if state == "loading":
             self.scale.set_value(0)
             self.scale.set_sensitive(False)
@@ -422,6 +450,24 @@ class PlayerBar(Gtk.Box):
         s = int(seconds % 60)
         return f"{m}:{s:02d}"
 
+    def _set_frame_ticking(self, active):
+        """Moves the scale on the frame clock while playing; GTK skips ticks while hidden."""
+        if active and self._tick_id is None:
+            self._tick_id = self.scale.add_tick_callback(self._on_frame_tick)
+        elif not active and self._tick_id is not None:
+            self.scale.remove_tick_callback(self._tick_id)
+            self._tick_id = None
+
+    def _on_frame_tick(self, widget, frame_clock):
+        dur = self.player.duration
+        if dur > 0 and not getattr(self, "_scroll_seek_id", None):
+            pos = min(self.player.get_position(), dur)
+            self.scale.set_value(pos)
+            t = f"{self._format_time(pos)} / {self._format_time(dur)}"
+            if self.timings_label.get_label() != t:
+                self.timings_label.set_label(t)
+        return True
+
     def on_progression(self, player, pos, dur):
         # Don't update the scale if we're actively scrolling to avoid jitter
         if getattr(self, "_scroll_seek_id", None):
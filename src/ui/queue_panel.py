@@ -214,6 +214,7 @@ class QueuePanel(Gtk.Box):
 
         self.more_menu_model = Gio.Menu()
         self.playlist_menu = Gio.Menu()
+        self._playlist_menu_generation = 0
         self.more_menu_model.append_submenu("Add all to Playlist", self.playlist_menu)
         self.more_btn.set_menu_model(self.more_menu_model)
 
@@ -251,14 +252,28 @@ class QueuePanel(Gtk.Box):
         self._update_repeat_state()
 
     def _refresh_playlists_menu(self):
+        # From a worker: the first call fetches the library, which can wait
+        # out a rate-limit backoff
+        self._playlist_menu_generation += 1
+        generation = self._playlist_menu_generation
+
+        def thread_func():
+            playlists = self.player.client.get_editable_playlists()
+            GLib.idle_add(self._fill_playlists_menu, generation, playlists)
+
+        threading.Thread(target=thread_func, daemon=True).start()
+
+    def _fill_playlists_menu(self, generation, playlists):
+        if generation != self._playlist_menu_generation:
+            return False
         self.playlist_menu.remove_all()
-        playlists = self.player.client.get_editable_playlists()
         for p in playlists:
             title = p.get("title", "Untitled")
             pid = p.get("playlistId")
             if pid:
                 # Use a specific action name that includes the playlist ID
                 self.playlist_menu.append(title, f"queue.add_all_to_playlist('{pid}')")
+        return False
 
     def _on_add_all_to_playlist(self, action, param):
         playlist_id = param.get_string()
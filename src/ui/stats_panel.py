@@ -0,0 +1,179 @@
+import gi
+
+gi.require_version("Gtk", "4.0")
+from gi.repository import Gtk, GLib, Pango
+
+REFRESH_MS = 1000
+
+
+def _kbps(value):
+    return f"{value:.0f} kbps" if value else "–"
+
+
+def _duration(seconds):
+    if seconds is None:
+        return "–"
+    if seconds < 0:
+        return "expired"
+    m, s = divmod(int(seconds), 60)
+    h, m = divmod(m, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
+def _format_line(report):
+    parts = []
+    if report.get("itag"):
+        parts.append(f"itag {report['itag']}")
+    if report.get("mime_type"):
+        parts.append(report["mime_type"])
+    return " · ".join(parts) or report.get("format") or "–"
+
+
+def _codec_line(report):
+    tags = report.get("tags") or {}
+    parts = [tags.get(k) for k in ("codec", "container") if tags.get(k)]
+    bitrate = tags.get("bitrate") or tags.get("nominal_bitrate")
+    if bitrate:
+        parts.append(_kbps(bitrate / 1000))
+    elif report.get("bitrate_kbps"):
+        parts.append(_kbps(report["bitrate_kbps"]))
+    return " · ".join(parts) or "–"
+
+
+def _quality_line(report):
+    quality = report.get("quality") or {}
+    return f"{quality.get('tier') or '–'} ({quality.get('mode') or '–'})"
+
+
+def _buffer_line(report):
+    buffering = report.get("buffer") or {}
+    percent = report.get("buffer_percent")
+    if percent is None:
+        return "–"
+    line = f"{percent}%"
+    if buffering.get("left_ms", -1) > 0:
+        line += f" ({buffering['left_ms'] / 1000:.1f}s to fill)"
+    return line
+
+
+def _rebuffer_line(report):
+    events = report.get("rebuffers") or []
+    quality = report.get("quality") or {}
+    line = f"{len(events)} this track, {quality.get('rebuffers', 0)} this session"
+    last = events[-1] if events else None
+    if last:
+        stalled = f"{last['ms']:.0f} ms" if last.get("ms") is not None else "ongoing"
+        line += f"\nlast at {_duration(last['position'])}, {stalled}"
+    return line
+
+
+def _timing_line(report):
+    trace = report.get("timings")
+    if not trace or trace.get("total_ms") is None:
+        return "–"
+    stages = sorted(trace["stages"].items(), key=lambda kv: kv[1], reverse=True)
+    slowest = ", ".join(f"{k} {v:.0f}" for k, v in stages[:3])
+    return f"{trace['total_ms']:.0f} ms ({trace.get('source') or '?'})\n{slowest}"
+
+
+# (label, formatter) in display order
+ROWS = (
+    ("Video ID", lambda r: r.get("video_id") or "–"),
+    ("Format", _format_line),
+    ("Selector", lambda r: r.get("format") or "–"),
+    ("Codec", _codec_line),
+    ("Source", lambda r: r.get("source") or "–"),
+    ("CDN host", lambda r: r.get("host") or "–"),
+    ("Engine", lambda r: r.get("engine") or "–"),
+    ("Download", lambda r: _kbps(r.get("download_kbps"))),
+    ("Quality", _quality_line),
+    ("Buffer", _buffer_line),
+    ("Rebuffers", _rebuffer_line),
+    ("URL expires", lambda r: _duration(r.get("url_expires_in"))),
+    ("Time to audio", _timing_line),
+)
+
+
+class StatsPanel(Gtk.Box):
+    """
+    Stats for nerds: Player.get_diagnostics() as a key/value grid with a
+    JSON export. Refreshes once a second, but only while it is shown.
+    """
+
+    def __init__(self, player):
+        super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=8)
+        self.player = player
+        self._refresh_id = None
+        self.add_css_class("card")
+        self.set_margin_top(12)
+
+        grid = Gtk.Grid(column_spacing=12, row_spacing=4)
+        grid.set_margin_top(12)
+        grid.set_margin_start(12)
+        grid.set_margin_end(12)
+        self._values = []
+        for row, (title, formatter) in enumerate(ROWS):
+            key = Gtk.Label(label=title, xalign=0, yalign=0)
+            key.add_css_class("caption-heading")
+            key.add_css_class("dim-label")
+
+            value = Gtk.Label(label="–", xalign=0)
+            value.add_css_class("caption")
+            value.add_css_class("numeric")
+            value.set_hexpand(True)
+            value.set_selectable(True)
+            value.set_wrap(True)
+            value.set_wrap_mode(Pango.WrapMode.WORD_CHAR)
+
+            grid.attach(key, 0, row, 1, 1)
+            grid.attach(value, 1, row, 1, 1)
+            self._values.append((value, formatter))
+        self.append(grid)
+
+        footer = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
+        footer.set_margin_start(12)
+        footer.set_margin_end(12)
+        footer.set_margin_bottom(12)
+
+        self.status_label = Gtk.Label(xalign=0)
+        self.status_label.add_css_class("caption")
+        self.status_label.add_css_class("dim-label")
+        self.status_label.set_hexpand(True)
+        self.status_label.set_ellipsize(Pango.EllipsizeMode.START)
+
+        export_btn = Gtk.Button(label="Export JSON")
+        export_btn.add_css_class("flat")
+        export_btn.connect("clicked", self._on_export_clicked)
+
+        footer.append(self.status_label)
+        footer.append(export_btn)
+        self.append(footer)
+
+    def set_active(self, active):
+        """Starts or stops the refresh loop as the panel is revealed or hidden."""
+        if active and self._refresh_id is None:
+            self.refresh()
+            self._refresh_id = GLib.timeout_add(REFRESH_MS, self.refresh)
+        elif not active and self._refresh_id is not None:
+            GLib.source_remove(self._refresh_id)
+            self._refresh_id = None
+
+    def refresh(self):
+        try:
+            report = self.player.get_diagnostics()
+        except Exception as e:
+            print(f"[DIAGNOSTICS] Refresh failed: {e}")
+            return True
+        for label, formatter in self._values:
+            text = formatter(report)
+            if label.get_label() != text:
+                label.set_label(text)
+        return True
+
+    def _on_export_clicked(self, btn):
+        try:
+            path = self.player.export_diagnostics()
+            self.status_label.set_label(f"Saved to {path}")
+            self.status_label.set_tooltip_text(path)
+        except OSError as e:
+            self.status_label.set_label(f"Export failed: {e}")
@@ -1,8 +1,10 @@
+import json
 import threading
-import urllib.request
 from collections import OrderedDict
 import re
 from gi.repository import Gtk, Gdk, GdkPixbuf, GLib
+from api.http import fetch_bytes, get_session
+from api.scheduler import INTERACTIVE, VISIBLE, request_priority
 
 # Bounded LRU Cache to prevent memory leaks (max 100 images)
 IMG_CACHE = OrderedDict()
@@ -32,6 +34,108 @@ def cache_pixbuf(url, pixbuf):
         IMG_CACHE.popitem(last=False)
 
 
+def _insert_child_after(container, child, sibling):
+    """Places child right after sibling (first if None) in a ListBox or Box."""
+    if isinstance(container, Gtk.ListBox):
+        if child.get_parent() is not None:
+            container.remove(child)
+        container.insert(child, sibling.get_index() + 1 if sibling else 0)
+    elif child.get_parent() is None:
+        container.insert_child_after(child, sibling)
+    else:
+        container.reorder_child_after(child, sibling)
+
+
+def sync_keyed_children(container, items, key, create, update=None):
+    """
+    Makes a Gtk.ListBox or Gtk.Box show items while touching as few widgets
+    as possible. Children are matched to items by key(item): unchanged ones
+    are left alone, changed ones go through update(child, item) (or are
+    rebuilt without update), missing ones come from create(item) and the
+    rest are removed. Children that were not created here are ignored.
+    Returns the number of children built or updated.
+    """
+    wanted = {key(item) for item in items}
+    existing = {}
+    child = container.get_first_child()
+    while child:
+        next_child = child.get_next_sibling()
+        sync_key = getattr(child, "sync_key", None)
+        if sync_key is not None:
+            if sync_key in wanted:
+                existing[sync_key] = child
+            else:
+                container.remove(child)
+        child = next_child
+
+    changed = 0
+    previous = None
+    seen = set()
+    for item in items:
+        item_key = key(item)
+        if item_key is None or item_key in seen:
+            continue
+        seen.add(item_key)
+
+        child = existing.get(item_key)
+        if child is not None and child.sync_item != item:
+            if update is not None:
+                update(child, item)
+                child.sync_item = item
+                changed += 1
+            else:
+                container.remove(child)
+                child = None
+
+        if child is None:
+            child = create(item)
+            if child is None:
+                continue
+            child.sync_key = item_key
+            child.sync_item = item
+            changed += 1
+            _insert_child_after(container, child, previous)
+        elif child.get_prev_sibling() is not previous:
+            _insert_child_after(container, child, previous)
+        previous = child
+    return changed
+
+
+def stale_while_revalidate(client, fetch, apply, on_miss=None):
+    """
+    Loads a page's data in two passes; call from a worker thread.
+
+    fetch() first runs against the response cache only, and whatever it
+    finds, however old, is applied right away. It then runs again bypassing
+    the cache, so the network result replaces the cached entry, and it is
+    applied only if it differs from what is shown. apply and on_miss (no
+    cached data, e.g. to show a spinner) run on the main loop.
+    """
+    from api.client import CACHE_REFRESH, CACHE_STALE
+
+    try:
+        with client.cache_policy(CACHE_STALE):
+            stale = fetch()
+    except Exception as e:
+        print(f"[SWR] Cached read failed: {e}")
+        stale = None
+
+    # apply() may modify the data, so compare against a snapshot
+    stale_snapshot = json.dumps(stale, sort_keys=True, default=str) if stale else None
+    if stale:
+        GLib.idle_add(apply, stale)
+    elif on_miss:
+        GLib.idle_add(on_miss)
+
+    # With something on screen already, the refresh is no longer urgent
+    with request_priority(VISIBLE if stale else INTERACTIVE):
+        with client.cache_policy(CACHE_REFRESH):
+            fresh = fetch()
+    if fresh and json.dumps(fresh, sort_keys=True, default=str) != stale_snapshot:
+        GLib.idle_add(apply, fresh)
+    return fresh or stale
+
+
 def get_high_res_url(url, target_size=None):
     """Rewrites Google Image URLs to request a high resolution (800x800).
     Also strips sqp and rs parameters which constrain resolution.
@@ -265,8 +369,8 @@ class AsyncImage(Gtk.Image):
             pixbuf = cached_pixbuf
             if not pixbuf:
                 # Download image data
-                with urllib.request.urlopen(url) as response:
-                    data = response.read()
+                with request_priority(VISIBLE):
+                    data = fetch_bytes(url)
 
                 loader = GdkPixbuf.PixbufLoader()
                 loader.write(data)
@@ -466,11 +570,8 @@ class AsyncPicture(Gtk.Picture):
 
     def _fetch_image(self, url, target_size=None, crop=False, fallbacks=None):
         try:
-            # We use MusicClient's session if possible or just requests
-            import requests
-
-            # Reuse connection if possible
-            resp = requests.get(url, timeout=10)
+            with request_priority(VISIBLE):
+                resp = get_session().get(url, timeout=10)
             if resp.status_code != 200:
                 raise Exception(f"HTTP {resp.status_code}")
 
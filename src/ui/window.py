@@ -387,6 +387,151 @@ class MainWindow(Adw.ApplicationWindow):
         )
         app_group.add(debug_row)
 
+        timing_row = Adw.ActionRow()
+        timing_row.set_title("Export Play Timings")
+        total = self.player.timing.percentiles().get("total")
+        if total:
+            timing_row.set_subtitle(
+                f"Time to audio over {total['count']} plays: p50 {total['p50']:.0f} ms, p90 {total['p90']:.0f} ms, p99 {total['p99']:.0f} ms"
+            )
+        else:
+            timing_row.set_subtitle("No plays recorded yet")
+
+        timing_btn = Gtk.Button(label="Export")
+        timing_btn.set_valign(Gtk.Align.CENTER)
+
+        def on_export_timings(btn):
+            try:
+                path = self.player.timing.export()
+                timing_row.set_subtitle(f"Saved to {path}")
+            except OSError as e:
+                timing_row.set_subtitle(f"Export failed: {e}")
+
+        timing_btn.connect("clicked", on_export_timings)
+        timing_row.add_suffix(timing_btn)
+        app_group.add(timing_row)
+
+        import settings
+
+        playback_group = Adw.PreferencesGroup()
+        playback_group.set_title("Playback")
+        page.add(playback_group)
+
+        gapless_row = Adw.SwitchRow()
+        gapless_row.set_title("Gapless Playback")
+        gapless_row.set_subtitle(
+            "Switch to the next track without a pause when it is ready in time"
+        )
+        gapless_row.set_active(settings.get_setting("gapless_playback"))
+        gapless_row.connect(
+            "notify::active",
+            lambda switch, param: settings.set_setting(
+                "gapless_playback", switch.get_active()
+            ),
+        )
+        playback_group.add(gapless_row)
+
+        from player.crossfade import MAX_CROSSFADE_SECONDS
+
+        crossfade_row = Adw.SpinRow.new_with_range(0, MAX_CROSSFADE_SECONDS, 1)
+        crossfade_row.set_title("Crossfade (seconds)")
+        crossfade_row.set_subtitle("Blend into the next track. 0 turns it off")
+        crossfade_row.set_value(settings.get_setting("crossfade_seconds"))
+        crossfade_row.connect(
+            "notify::value",
+            lambda row, param: settings.set_setting(
+                "crossfade_seconds", int(row.get_value())
+            ),
+        )
+        playback_group.add(crossfade_row)
+
+        proxy_row = Adw.SwitchRow()
+        proxy_row.set_title("Chunked Streaming")
+        proxy_row.set_subtitle(
+            "Fetch audio in small ranges through a local proxy to avoid throttling"
+        )
+        proxy_row.set_active(settings.get_setting("stream_proxy"))
+        proxy_row.connect(
+            "notify::active",
+            lambda switch, param: settings.set_setting(
+                "stream_proxy", switch.get_active()
+            ),
+        )
+        playback_group.add(proxy_row)
+
+        quality_modes = ["auto", "high", "medium", "low"]
+        quality_row = Adw.ComboRow()
+        quality_row.set_title("Audio Quality")
+        quality_row.set_subtitle(
+            "Automatic adapts the bitrate to your connection and stalls"
+        )
+        quality_row.set_model(
+            Gtk.StringList.new(["Automatic", "High", "Medium", "Low"])
+        )
+        current_quality = settings.get_setting("audio_quality")
+        if current_quality in quality_modes:
+            quality_row.set_selected(quality_modes.index(current_quality))
+
+        def on_quality_changed(row, param):
+            mode = quality_modes[row.get_selected()]
+            settings.set_setting("audio_quality", mode)
+            self.player.quality.set_mode(mode)
+
+        quality_row.connect("notify::selected", on_quality_changed)
+        playback_group.add(quality_row)
+
+        from player.backends import ENGINES
+
+        engine_names = list(ENGINES)
+        engine_row = Adw.ComboRow()
+        engine_row.set_title("Playback Engine")
+        engine_row.set_subtitle(
+            "playbin3 switches streams faster. Applies after restart"
+        )
+        engine_row.set_model(Gtk.StringList.new(engine_names))
+        current_engine = settings.get_setting("playback_engine")
+        if current_engine in engine_names:
+            engine_row.set_selected(engine_names.index(current_engine))
+        engine_row.connect(
+            "notify::selected",
+            lambda row, param: settings.set_setting(
+                "playback_engine", engine_names[row.get_selected()]
+            ),
+        )
+        playback_group.add(engine_row)
+
+        cache_row = Adw.SpinRow.new_with_range(0, 20480, 256)
+        cache_row.set_title("Audio Cache Size (MB)")
+        cache_row.set_subtitle(
+            "Keep played tracks on disk so replays start instantly. "
+            "Streams through the local proxy. 0 disables it"
+        )
+        cache_row.set_value(settings.get_setting("audio_cache_mb"))
+
+        def on_cache_size_changed(row, param):
+            size_mb = int(row.get_value())
+            settings.set_setting("audio_cache_mb", size_mb)
+            self.player.audio_cache.set_budget(size_mb * 1024 * 1024)
+
+        cache_row.connect("notify::value", on_cache_size_changed)
+        playback_group.add(cache_row)
+
+        clear_cache_row = Adw.ActionRow()
+        clear_cache_row.set_title("Clear Audio Cache")
+        used_mb = self.player.audio_cache.total_size() / (1024 * 1024)
+        clear_cache_row.set_subtitle(f"{used_mb:.0f} MB used")
+
+        clear_cache_btn = Gtk.Button(label="Clear")
+        clear_cache_btn.set_valign(Gtk.Align.CENTER)
+
+        def on_clear_cache(btn):
+            self.player.audio_cache.clear()
+            clear_cache_row.set_subtitle("0 MB used")
+
+        clear_cache_btn.connect("clicked", on_clear_cache)
+        clear_cache_row.add_suffix(clear_cache_btn)
+        playback_group.add(clear_cache_row)
+
         group = Adw.PreferencesGroup()
         group.set_title("Account")
         page.add(group)
@@ -0,0 +1,136 @@
+"""
+Compares track-switch, cold-start and seek latency of the playback backends
+on local test streams. Switches follow the Player's own sequence
+(prepare_switch, load, play). Run from the repo root:
+
+    python test/bench_backends.py [rounds]
+
+Needs GStreamer with audiotestsrc, opusenc/oggmux and vorbisenc; no network
+or audio device (output goes to a synced fakesink).
+"""
+
+import os
+import sys
+import time
+import tempfile
+import statistics
+
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+import gi
+
+gi.require_version("Gst", "1.0")
+from gi.repository import Gst
+
+from player.backends import ENGINES
+
+TRACK_SECONDS = 30
+STREAMS = {
+    "opus.ogg": "opusenc ! oggmux",
+    "vorbis.ogg": "vorbisenc ! oggmux",
+}
+
+
+def make_test_streams(directory):
+    """Encodes TRACK_SECONDS of sine into each container; returns file:// URIs."""
+    uris = []
+    buffers = TRACK_SECONDS * 44100 // 1024
+    for name, encoder in STREAMS.items():
+        path = os.path.join(directory, name)
+        if not os.path.exists(path):
+            pipeline = Gst.parse_launch(
+                f"audiotestsrc num-buffers={buffers} samplesperbuffer=1024 ! "
+                f"audio/x-raw,rate=44100 ! audioconvert ! audioresample ! "
+                f"{encoder} ! filesink location={path}"
+            )
+            pipeline.set_state(Gst.State.PLAYING)
+            pipeline.get_bus().timed_pop_filtered(
+                Gst.CLOCK_TIME_NONE, Gst.MessageType.EOS | Gst.MessageType.ERROR
+            )
+            pipeline.set_state(Gst.State.NULL)
+        uris.append(Gst.filename_to_uri(path))
+    return uris
+
+
+def wait_for(backend, types, timeout=10):
+    bus = backend.get_bus()
+    msg = bus.timed_pop_filtered(timeout * Gst.SECOND, types | Gst.MessageType.ERROR)
+    if msg is None:
+        raise TimeoutError("no message from pipeline")
+    if msg.type == Gst.MessageType.ERROR:
+        raise RuntimeError(msg.parse_error()[0].message)
+    return msg
+
+
+def wait_playing(backend, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        msg = wait_for(backend, Gst.MessageType.STATE_CHANGED, timeout)
+        if msg.src == backend.element:
+            if msg.parse_state_changed()[1] == Gst.State.PLAYING:
+                return
+    raise TimeoutError("pipeline never reached PLAYING")
+
+
+def bench_engine(engine_cls, uris, rounds):
+    backend = engine_cls()
+    sink = Gst.ElementFactory.make("fakesink", None)
+    sink.set_property("sync", True)
+    backend.element.set_property("audio-sink", sink)
+
+    switches = []
+    colds = []
+    seeks = []
+    for i in range(rounds):
+        uri = uris[i % len(uris)]
+
+        # Track switch as Player does it: Player.stop(switching=True) /
+        # _load_internal quiet the old stream, then _start_playback loads
+        start = time.monotonic()
+        backend.prepare_switch()
+        backend.load(uri)
+        backend.play()
+        wait_playing(backend)
+        switches.append((time.monotonic() - start) * 1000)
+
+        for target in (TRACK_SECONDS * 0.25, TRACK_SECONDS * 0.75):
+            start = time.monotonic()
+            backend.seek(target, accurate=True)
+            wait_for(backend, Gst.MessageType.ASYNC_DONE)
+            seeks.append((time.monotonic() - start) * 1000)
+
+        # Cold start from NULL, as after Player.stop() or a pipeline error
+        backend.stop()
+        start = time.monotonic()
+        backend.load(uri)
+        backend.play()
+        wait_playing(backend)
+        colds.append((time.monotonic() - start) * 1000)
+
+    backend.stop()
+    return switches, colds, seeks
+
+
+def describe(samples):
+    return f"median {statistics.median(samples):7.1f} ms  max {max(samples):7.1f} ms"
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    Gst.init(None)
+    directory = os.path.join(tempfile.gettempdir(), "mixtapes-bench")
+    os.makedirs(directory, exist_ok=True)
+    uris = make_test_streams(directory)
+
+    for name, engine_cls in ENGINES.items():
+        if Gst.ElementFactory.find(engine_cls.factory) is None:
+            print(f"{name:10} not available")
+            continue
+        switches, colds, seeks = bench_engine(engine_cls, uris, rounds)
+        print(f"{name:10} switch: {describe(switches)}")
+        print(f"{'':10} cold:   {describe(colds)}")
+        print(f"{'':10} seek:   {describe(seeks)}")
+
+
+if __name__ == "__main__":
+    main()